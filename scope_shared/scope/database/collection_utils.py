@@ -1,10 +1,13 @@
 import base64
+import bson.objectid
 import copy
 from dataclasses import dataclass
+import datetime
 import hashlib
 import pymongo.collection
 import pymongo.errors
-from typing import Dict, List, Optional, Union
+import pymongo.results
+from typing import Callable, Dict, Iterator, List, NoReturn, Optional, Union
 import uuid
 
 import scope.database.document_utils as document_utils
@@ -16,6 +19,42 @@ PRIMARY_COLLECTION_INDEX = [
 ]
 PRIMARY_COLLECTION_INDEX_NAME = "_primary"
 
+CURRENT_REVISION_FIELD = "_current"
+CURRENT_REVISION_INDEX = [
+    ("_type", pymongo.ASCENDING),
+    (CURRENT_REVISION_FIELD, pymongo.ASCENDING),
+    ("_set_id", pymongo.ASCENDING),
+]
+CURRENT_REVISION_INDEX_NAME = "_current"
+
+# Revisions inserted concurrently by different processes are not inserted in "_id" order.
+# A change query therefore also considers revisions generated this many seconds
+# before its bound, so a revision inserted late is not missed.
+CHANGES_OVERLAP_SECONDS = 10
+
+# Number of documents in each batch returned by a cursor in iter_set.
+ITER_SET_BATCH_SIZE = 100
+
+# Fields that any projection must retain, as they identify a document.
+PROJECTION_REQUIRED_FIELDS = ["_id", "_type", "_set_id", "_rev"]
+
+# Number of marker corrections in each bulk write of ensure_current_revision.
+ENSURE_CURRENT_REVISION_BATCH_SIZE = 1000
+
+# Whether writes maintain the "_current" marker.
+# Every process writing to a collection must maintain the marker
+# before ensure_current_revision is applied and reads via the marker are enabled.
+_current_revision_maintain: bool = False
+
+# Whether reads obtain head revisions via the "_current" marker.
+_current_revision_reads: bool = False
+
+# Listeners notified after documents are written to a collection.
+# Called with the collection and the written documents,
+# or with None if documents were destructively removed.
+WriteListener = Callable[[pymongo.collection.Collection, Optional[List[dict]]], None]
+_write_listeners: List[WriteListener] = []
+
 
 class DocumentModifiedException(Exception):
     """
@@ -41,48 +80,648 @@ class DocumentNotFoundException(Exception):
     pass
 
 
-@dataclass(frozen=True)
-class PutResult:
-    inserted_count: int
-    inserted_id: str
-    document: dict
+class SetElementsWriteException(Exception):
+    """
+    Raised if a write of multiple set elements fails.
+
+    Writes are ordered, so elements preceding the failure have been written
+    and elements following the failure have not been attempted.
+    """
+
+    results: List[Union["SetPostResult", "SetPutResult"]]
+    """
+    Results of elements that were written, preceding the failure.
+    """
+
+    failed_index: int
+    """
+    Index of the element that failed.
+    """
+
+    duplicate_key: bool
+    """
+    Whether the failure was a duplicate key, implying a "_rev" conflict.
+    """
+
+    def __init__(
+        self,
+        *,
+        results: List[Union["SetPostResult", "SetPutResult"]],
+        failed_index: int,
+        duplicate_key: bool,
+    ):
+        self.results = results
+        self.failed_index = failed_index
+        self.duplicate_key = duplicate_key
+        super().__init__()
+
+
+@dataclass(frozen=True)
+class PutResult:
+    inserted_count: int
+    inserted_id: str
+    document: dict
+
+
+@dataclass(frozen=True)
+class SetPostResult:
+    inserted_count: int
+    inserted_id: str
+    inserted_set_id: str
+    document: dict
+
+
+@dataclass(frozen=True)
+class SetPutResult:
+    inserted_count: int
+    inserted_id: str
+    inserted_set_id: str
+    document: dict
+
+
+@dataclass(frozen=True)
+class ChangesResult:
+    documents: List[dict]
+    change_token: Optional[str]
+
+
+@dataclass(frozen=True)
+class SecondaryIndex:
+    """
+    Declaration of an index on documents of a "_type", in addition to the primary index.
+
+    - keys are the index keys, following the "_type" key.
+    - partial_filter optionally restricts the index to matching documents.
+      The filter applies to each revision, so queries must confirm the head revision.
+    """
+
+    name: str
+    document_type: str
+    keys: List[tuple]
+    partial_filter: Optional[dict] = None
+
+    @property
+    def index_keys(self) -> List[tuple]:
+        return [("_type", pymongo.ASCENDING)] + list(self.keys)
+
+    @property
+    def index_partial_filter(self) -> Optional[dict]:
+        if self.partial_filter is None:
+            return None
+
+        return {"_type": self.document_type} | self.partial_filter
+
+
+def generate_set_id() -> str:
+    """
+    Generates an id that:
+    - Is guaranteed to be URL safe.
+    - Is guaranteed to be compatible with MongoDB collection naming.
+    - Is expected to be unique.
+    """
+
+    # Obtain uniqueness
+    generated_uuid = uuid.uuid4()
+    # Manage length so these don't seem obscenely long
+    generated_digest = hashlib.blake2b(generated_uuid.bytes, digest_size=8).digest()
+    # Obtain URL safety and MongoDB collection name compatibility.
+    generated_base64 = base64.b32encode(generated_digest).decode("ascii").casefold()
+
+    # Remove terminating "=="
+    clean_generated_base64 = generated_base64.rstrip("=")
+
+    return clean_generated_base64
+
+
+def configure_current_revision(*, maintain: bool, reads: bool) -> None:
+    """
+    Configure whether writes maintain the "_current" marker and whether reads use it.
+
+    When maintained, each write marks the new revision and unmarks previous revisions,
+    at the cost of an additional round trip for any revision after the first.
+    When reads are enabled, reads begin from the documents marked "_current" instead of every revision.
+    Reads require that the marker is maintained by every process writing to a collection,
+    and that ensure_current_revision has since been applied to that collection.
+    """
+
+    if reads and not maintain:
+        raise ValueError("current revision reads require the marker is maintained")
+
+    global _current_revision_maintain
+    global _current_revision_reads
+    _current_revision_maintain = maintain
+    _current_revision_reads = reads
+
+
+def add_write_listener(listener: WriteListener) -> None:
+    """
+    Add a listener to be notified after documents are written.
+
+    Listeners are called synchronously within the write and must not raise.
+    """
+
+    _write_listeners.append(listener)
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    """
+    Remove a listener previously added by add_write_listener.
+    """
+
+    _write_listeners.remove(listener)
+
+
+def _notify_write(
+    *,
+    collection: pymongo.collection.Collection,
+    documents: Optional[List[dict]],
+) -> None:
+    for listener_current in list(_write_listeners):
+        listener_current(collection, documents)
+
+
+def _head_pipeline(
+    *,
+    match: dict,
+    group_id: Union[None, str, dict],
+    filter_deleted: bool,
+) -> List[dict]:
+    """
+    Obtain the pipeline stages that select the head revision of each document matching "match".
+    """
+
+    query_match = dict(match)
+    if _current_revision_reads:
+        # Only head revisions carry the marker,
+        # but a concurrent write may briefly leave two revisions marked.
+        # Those are resolved by the same "$group" used when reading every revision.
+        query_match[CURRENT_REVISION_FIELD] = True
+
+    pipeline = [
+        # Obtain all documents matching the query
+        {"$match": query_match},
+        # Sort by "_rev",
+        # store the most recent "_rev" in "result",
+        # move forward with that version
+        {"$sort": {"_rev": pymongo.DESCENDING}},
+        {
+            "$group": {
+                "_id": group_id,
+                "result": {"$first": "$$ROOT"},
+            }
+        },
+        {"$replaceRoot": {"newRoot": "$result"}},
+    ]
+
+    if filter_deleted:
+        # Filter any document with "_deleted"
+        pipeline.append({"$match": {"_deleted": {"$exists": False}}})
+
+    return pipeline
+
+
+def _projection_pipeline(
+    *,
+    projection: Optional[Dict[str, bool]],
+) -> List[dict]:
+    """
+    Obtain the pipeline stages that apply a projection to head revisions.
+
+    A projection either includes or excludes fields, it cannot do both.
+    An inclusion projection will always also include PROJECTION_REQUIRED_FIELDS.
+    An exclusion projection cannot exclude PROJECTION_REQUIRED_FIELDS.
+    """
+
+    if not projection:
+        return []
+
+    inclusions = set(bool(value_current) for value_current in projection.values())
+    if len(inclusions) != 1:
+        raise ValueError("projection must either include or exclude fields")
+
+    if inclusions == {True}:
+        query_projection = {key_current: 1 for key_current in projection.keys()}
+        for key_current in PROJECTION_REQUIRED_FIELDS:
+            query_projection[key_current] = 1
+    else:
+        for key_current in PROJECTION_REQUIRED_FIELDS:
+            if key_current in projection:
+                raise ValueError('projection must not exclude "{}"'.format(key_current))
+        query_projection = {key_current: 0 for key_current in projection.keys()}
+
+    return [{"$project": query_projection}]
+
+
+def _type_projection_pipeline(
+    *,
+    type_projections: Optional[Dict[str, Dict[str, bool]]],
+) -> List[dict]:
+    """
+    Obtain the pipeline stages that apply a different projection to each document type.
+
+    Each projection must include fields, and will always also include PROJECTION_REQUIRED_FIELDS.
+    A document whose type has no projection is not modified.
+    """
+
+    if not type_projections:
+        return []
+
+    branches = []
+    for document_type_current, projection_current in type_projections.items():
+        if not all(projection_current.values()):
+            raise ValueError("type projections must include fields")
+
+        fields = list(PROJECTION_REQUIRED_FIELDS)
+        fields.extend(
+            key_current
+            for key_current in projection_current.keys()
+            if key_current not in fields
+        )
+
+        branches.append(
+            {
+                "case": {"$eq": ["$_type", document_type_current]},
+                # A field that does not exist is omitted
+                "then": {
+                    key_current: "${}".format(key_current) for key_current in fields
+                },
+            }
+        )
+
+    return [
+        {
+            "$replaceRoot": {
+                "newRoot": {
+                    "$switch": {
+                        "branches": branches,
+                        "default": "$$ROOT",
+                    }
+                }
+            }
+        }
+    ]
+
+
+def _previous_current_filter(*, document: dict) -> dict:
+    """
+    Obtain a filter matching previous revisions of a document that remain marked "_current".
+    """
+
+    previous_filter = {
+        "_type": document["_type"],
+        "_rev": {"$lt": document["_rev"]},
+        CURRENT_REVISION_FIELD: True,
+    }
+    if "_set_id" in document:
+        previous_filter["_set_id"] = document["_set_id"]
+
+    return previous_filter
+
+
+def _insert_revision(
+    *,
+    collection: pymongo.collection.Collection,
+    document: dict,
+) -> pymongo.results.InsertOneResult:
+    """
+    Insert a new revision of a document, maintaining the "_current" marker if configured.
+
+    The inserted revision is marked "_current",
+    then the marker is removed from any previous revisions.
+    Like insert_one, the provided document is modified to include an "_id".
+    """
+
+    if not _current_revision_maintain:
+        result = collection.insert_one(document=document)
+        _notify_write(collection=collection, documents=[document])
+
+        return result
+
+    result = collection.insert_one(
+        document=dict(document, **{CURRENT_REVISION_FIELD: True})
+    )
+    document["_id"] = result.inserted_id
+
+    # A first revision has no previous revisions
+    if document["_rev"] != 1:
+        collection.update_many(
+            filter=_previous_current_filter(document=document),
+            update={"$unset": {CURRENT_REVISION_FIELD: ""}},
+        )
+
+    _notify_write(collection=collection, documents=[document])
+
+    return result
+
+
+def _insert_revisions(
+    *,
+    collection: pymongo.collection.Collection,
+    documents: List[dict],
+) -> int:
+    """
+    Insert new revisions of multiple documents, maintaining the "_current" marker if configured.
+
+    Inserts are ordered and performed in a single round trip,
+    then any markers are removed from previous revisions in a single round trip.
+    Like insert_many, each inserted document is modified to include an "_id".
+
+    If an insert fails, markers are still maintained for preceding inserts
+    before the pymongo.errors.BulkWriteError is raised.
+    """
+
+    if not documents:
+        return 0
+
+    # insert_many will modify these to insert an "_id"
+    if _current_revision_maintain:
+        insert_documents = [
+            dict(document_current, **{CURRENT_REVISION_FIELD: True})
+            for document_current in documents
+        ]
+    else:
+        insert_documents = [dict(document_current) for document_current in documents]
+
+    insert_error = None
+    try:
+        collection.insert_many(documents=insert_documents, ordered=True)
+        inserted_count = len(insert_documents)
+    except pymongo.errors.BulkWriteError as e:
+        insert_error = e
+        inserted_count = e.details["nInserted"]
+
+    update_requests = []
+    for document_current, insert_document_current in zip(
+        documents[:inserted_count],
+        insert_documents[:inserted_count],
+    ):
+        document_current["_id"] = insert_document_current["_id"]
+
+        # A first revision has no previous revisions
+        if not _current_revision_maintain or document_current["_rev"] == 1:
+            continue
+
+        update_requests.append(
+            pymongo.UpdateMany(
+                filter=_previous_current_filter(document=document_current),
+                update={"$unset": {CURRENT_REVISION_FIELD: ""}},
+            )
+        )
+    if update_requests:
+        collection.bulk_write(update_requests, ordered=False)
+
+    if inserted_count:
+        _notify_write(collection=collection, documents=documents[:inserted_count])
+
+    if insert_error:
+        raise insert_error
+
+    return inserted_count
+
+
+def _insert_set_elements(
+    *,
+    collection: pymongo.collection.Collection,
+    documents: List[dict],
+    result_type: type,
+) -> List[Union["SetPostResult", "SetPutResult"]]:
+    """
+    Insert prepared set element documents, obtaining a result for each.
+
+    Raises SetElementsWriteException if an insert fails.
+    """
+
+    def _results(inserted_documents: List[dict]) -> list:
+        results = []
+        for document_current in inserted_documents:
+            document_current = document_utils.normalize_document(
+                document=document_current
+            )
+            results.append(
+                result_type(
+                    inserted_count=1,
+                    inserted_id=document_current["_id"],
+                    inserted_set_id=document_current["_set_id"],
+                    document=document_current,
+                )
+            )
+
+        return results
+
+    try:
+        inserted_count = _insert_revisions(collection=collection, documents=documents)
+    except pymongo.errors.BulkWriteError as e:
+        failed_index = e.details["nInserted"]
+        duplicate_key = any(
+            write_error_current.get("code") == 11000
+            for write_error_current in e.details.get("writeErrors", [])
+        )
+
+        raise SetElementsWriteException(
+            results=_results(documents[:failed_index]),
+            failed_index=failed_index,
+            duplicate_key=duplicate_key,
+        ) from e
+
+    return _results(documents[:inserted_count])
+
+
+def _prepare_post_set_element(
+    *,
+    document_type: str,
+    semantic_set_id: Optional[str],
+    document: dict,
+) -> dict:
+    """
+    Validate a document to be post, assigning its "_set_id" and "_rev".
+
+    Modifies the provided document, returning it normalized.
+    """
+
+    # Document must not include an "_id",
+    # as this indicates it was retrieved from the database.
+    if "_id" in document:
+        raise ValueError('Document must not have existing "_id"')
+
+    # If a document includes a "_type", it must match document_type.
+    if "_type" in document:
+        if document["_type"] != document_type:
+            raise ValueError('document["_type"] must match document_type')
+    else:
+        document["_type"] = document_type
+
+    # Document must not include an "_set_id",
+    # as post expects to assign this.
+    if "_set_id" in document:
+        raise ValueError('Document must not have existing "_set_id"')
+
+    # Document must not include an "_rev",
+    # as this indicates it was retrieved from the database.
+    if "_rev" in document:
+        raise ValueError('Document must not have existing "_rev"')
+
+    # Generate a "_set_id" and a "_rev"
+    generated_set_id = generate_set_id()
+    document["_set_id"] = generated_set_id
+    document["_rev"] = 1
+
+    # If a semantic_set_id is specified
+    if semantic_set_id:
+        # Document must not include a semantic set id,
+        # as post expects to assign this.
+        if semantic_set_id in document:
+            raise ValueError(
+                'Document must not have existing "{}"'.format(semantic_set_id)
+            )
+
+        document[semantic_set_id] = generated_set_id
+
+    return document_utils.normalize_document(document=document)
+
+
+def _prepare_put_set_element(
+    *,
+    document_type: str,
+    semantic_set_id: Optional[str],
+    set_id: str,
+    document: dict,
+) -> dict:
+    """
+    Validate a document to be put, assigning its "_set_id" and incrementing its "_rev".
+
+    Modifies the provided document, returning it normalized.
+    """
+
+    # Document must not include an "_id",
+    # as this indicates it was retrieved from the database.
+    if "_id" in document:
+        raise ValueError('Document must not have existing "_id"')
+
+    # If a document includes a "_type", it must match document_type.
+    if "_type" in document:
+        if document["_type"] != document_type:
+            raise ValueError('document["_type"] must match document_type')
+    else:
+        document["_type"] = document_type
+
+    # If a document includes a "_set_id", it must match set_id.
+    if "_set_id" in document:
+        if document["_set_id"] != set_id:
+            raise ValueError('document["_set_id"] must match set_id')
+    else:
+        # Set the "_set_id"
+        document["_set_id"] = set_id
+
+    # Increment the "_rev"
+    if "_rev" in document:
+        if not isinstance(document["_rev"], int):
+            raise ValueError('document["_rev"] must be int')
+
+        # TODO: We could check to ensure the previous _rev actually exists.
+        #       This is only relevant if the client has skipped ahead to some false future _rev.
+        #       An ordered bulk operation could findUpdate the previous _rev to update an ignored field,
+        #       then insert the new _rev (i.e., findUpdate would fail if the previous _rev did not exist,
+        #       insert would fail if somebody else has already created the new _rev).
+        #       If that field were to have actual meaning, this would need to be done in a transaction.
+
+        document["_rev"] += 1
+    else:
+        document["_rev"] = 1
+
+    # If a semantic_set_id is specified
+    if semantic_set_id:
+        # If a document includes a "semantic_set_id", it must match set_id.
+        if semantic_set_id in document:
+            if document[semantic_set_id] != set_id:
+                raise ValueError(
+                    'document["{}"] must match set_id'.format(semantic_set_id)
+                )
+        else:
+            # Set the "semantic_set_id"
+            document[semantic_set_id] = set_id
+
+    return document_utils.normalize_document(document=document)
+
+
+def _raise_set_element_conflict(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    set_id: str,
+) -> NoReturn:
+    """
+    Read the existing head of a set element after a conflict, raise accordingly.
+    """
+
+    document_existing = get_set_element(
+        collection=collection,
+        document_type=document_type,
+        set_id=set_id,
+    )
+    if document_existing is None:
+        raise DocumentNotFoundException()
+
+    raise DocumentModifiedException(document_existing=document_existing)
 
 
-@dataclass(frozen=True)
-class SetPostResult:
-    inserted_count: int
-    inserted_id: str
-    inserted_set_id: str
-    document: dict
+def compare_and_swap_set_element(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    semantic_set_id: Optional[str],
+    set_id: str,
+    document: dict,
+) -> SetPutResult:
+    """
+    Put a set element document whose "_rev" is the expected current revision.
 
+    - The put is a single insert, which the primary index rejects on conflict.
+    - Only on conflict is the existing head read,
+      raising DocumentModifiedException or DocumentNotFoundException.
+    """
 
-@dataclass(frozen=True)
-class SetPutResult:
-    inserted_count: int
-    inserted_id: str
-    inserted_set_id: str
-    document: dict
+    try:
+        return put_set_element(
+            collection=collection,
+            document_type=document_type,
+            semantic_set_id=semantic_set_id,
+            set_id=set_id,
+            document=document,
+        )
+    except pymongo.errors.DuplicateKeyError:
+        _raise_set_element_conflict(
+            collection=collection,
+            document_type=document_type,
+            set_id=set_id,
+        )
 
 
-def generate_set_id() -> str:
-    """
-    Generates an id that:
-    - Is guaranteed to be URL safe.
-    - Is guaranteed to be compatible with MongoDB collection naming.
-    - Is expected to be unique.
+def compare_and_swap_singleton(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    document: dict,
+) -> PutResult:
     """
+    Put a singleton document whose "_rev" is the expected current revision.
 
-    # Obtain uniqueness
-    generated_uuid = uuid.uuid4()
-    # Manage length so these don't seem obscenely long
-    generated_digest = hashlib.blake2b(generated_uuid.bytes, digest_size=8).digest()
-    # Obtain URL safety and MongoDB collection name compatibility.
-    generated_base64 = base64.b32encode(generated_digest).decode("ascii").casefold()
+    - The put is a single insert, which the primary index rejects on conflict.
+    - Only on conflict is the existing document read, raising DocumentModifiedException.
+    """
 
-    # Remove terminating "=="
-    clean_generated_base64 = generated_base64.rstrip("=")
+    try:
+        return put_singleton(
+            collection=collection,
+            document_type=document_type,
+            document=document,
+        )
+    except pymongo.errors.DuplicateKeyError:
+        document_existing = get_singleton(
+            collection=collection,
+            document_type=document_type,
+        )
 
-    return clean_generated_base64
+        raise DocumentModifiedException(document_existing=document_existing)
 
 
 def delete_set_element(
@@ -97,19 +736,28 @@ def delete_set_element(
 
     Implemented by putting a tombstone document with "_deleted".
     The put operation will increment the "_rev", ensuring no race conflict.
+
+    - The "_rev" being deleted is verified to exist by a point lookup on the primary index.
+      The put is then a single insert, which the primary index rejects
+      if that "_rev" has since been superseded, including by a previous delete.
+    - Only if either fails is the existing head read,
+      raising DocumentModifiedException or DocumentNotFoundException.
     """
 
-    # TODO: An improved put operation would verify this document and _rev exist.
-    #       Pending such an operation, we'll hack it via extra operations.
-    document_existing = get_set_element(
-        collection=collection,
-        document_type=document_type,
-        set_id=set_id,
+    document_rev = collection.find_one(
+        filter={
+            "_type": document_type,
+            "_set_id": set_id,
+            "_rev": rev,
+        },
+        projection={"_deleted": True},
     )
-    if document_existing is None:
-        raise DocumentNotFoundException()
-    if document_existing["_rev"] != rev:
-        raise DocumentModifiedException(document_existing)
+    if document_rev is None or document_rev.get("_deleted", False):
+        _raise_set_element_conflict(
+            collection=collection,
+            document_type=document_type,
+            set_id=set_id,
+        )
 
     tombstone_document = {
         "_type": document_type,
@@ -118,34 +766,91 @@ def delete_set_element(
         "_deleted": True,
     }
 
+    return compare_and_swap_set_element(
+        collection=collection,
+        document_type=document_type,
+        semantic_set_id=None,
+        set_id=set_id,
+        document=tombstone_document,
+    )
+
+
+def delete_set_elements(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    set_id_revs: Dict[str, int],
+) -> List[SetPutResult]:
+    """
+    Delete multiple set elements.
+
+    Equivalent to delete_set_element for each element,
+    but existence and "_rev" of every element are verified in a single query
+    before all tombstones are put in a single round trip.
+    """
+
+    if not set_id_revs:
+        return []
+
+    documents_existing = get_set_elements(
+        collection=collection,
+        document_type=document_type,
+        set_ids=list(set_id_revs.keys()),
+    )
+    for set_id_current, rev_current in set_id_revs.items():
+        document_existing = documents_existing.get(set_id_current, None)
+        if document_existing is None:
+            raise DocumentNotFoundException()
+        if document_existing["_rev"] != rev_current:
+            raise DocumentModifiedException(document_existing)
+
+    tombstone_documents = {
+        set_id_current: {
+            "_type": document_type,
+            "_set_id": set_id_current,
+            "_rev": rev_current,
+            "_deleted": True,
+        }
+        for set_id_current, rev_current in set_id_revs.items()
+    }
+
     try:
-        set_put_result = put_set_element(
+        set_put_results = put_set_elements(
             collection=collection,
             document_type=document_type,
             semantic_set_id=None,
-            set_id=set_id,
-            document=tombstone_document,
+            documents=tombstone_documents,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except SetElementsWriteException as e:
+        if not e.duplicate_key:
+            raise
+
         document_existing = get_set_element(
             collection=collection,
             document_type=document_type,
-            set_id=set_id,
+            set_id=list(tombstone_documents.keys())[e.failed_index],
         )
 
         raise DocumentModifiedException(document_existing=document_existing)
 
-    return set_put_result
+    return set_put_results
 
 
 def ensure_index(
     *,
     collection: pymongo.collection.Collection,
+    secondary_indexes: Optional[List[SecondaryIndex]] = None,
 ):
     """
     Ensure the expected index is present on this collection.
+
+    Any provided secondary_indexes are also ensured,
+    any other index is removed.
     """
 
+    if secondary_indexes is None:
+        secondary_indexes = []
+
     # Examine existing indices
     index_information = collection.index_information()
 
@@ -153,6 +858,10 @@ def ensure_index(
     indices_unexpected = set(index_information.keys()) - {
         "_id_",
         PRIMARY_COLLECTION_INDEX_NAME,
+        CURRENT_REVISION_INDEX_NAME,
+    }
+    indices_unexpected -= {
+        secondary_index_current.name for secondary_index_current in secondary_indexes
     }
     for index_unexpected in indices_unexpected:
         del index_information[index_unexpected]
@@ -182,13 +891,270 @@ def ensure_index(
             name=PRIMARY_COLLECTION_INDEX_NAME,
         )
 
+    # Determine if an existing current revision index needs replaced
+    if CURRENT_REVISION_INDEX_NAME in index_information:
+        existing_index = index_information[CURRENT_REVISION_INDEX_NAME]
+
+        replace_index = False
+        if not replace_index:
+            replace_index = existing_index["key"] != CURRENT_REVISION_INDEX
+        if not replace_index:
+            replace_index = existing_index.get("unique", False) is not False
+
+        if replace_index:
+            del index_information[CURRENT_REVISION_INDEX_NAME]
+            collection.drop_index(CURRENT_REVISION_INDEX_NAME)
+
+    # Create the current revision index
+    if CURRENT_REVISION_INDEX_NAME not in index_information:
+        collection.create_index(
+            CURRENT_REVISION_INDEX,
+            name=CURRENT_REVISION_INDEX_NAME,
+        )
+
+    for secondary_index_current in secondary_indexes:
+        # Determine if an existing secondary index needs replaced
+        if secondary_index_current.name in index_information:
+            existing_index = index_information[secondary_index_current.name]
+
+            replace_index = False
+            if not replace_index:
+                replace_index = (
+                    existing_index["key"] != secondary_index_current.index_keys
+                )
+            if not replace_index:
+                existing_partial_filter = existing_index.get(
+                    "partialFilterExpression", None
+                )
+                if existing_partial_filter is not None:
+                    existing_partial_filter = dict(existing_partial_filter)
+                replace_index = (
+                    existing_partial_filter
+                    != secondary_index_current.index_partial_filter
+                )
+
+            if replace_index:
+                del index_information[secondary_index_current.name]
+                collection.drop_index(secondary_index_current.name)
+
+        # Create the secondary index
+        if secondary_index_current.name not in index_information:
+            create_index_kwargs = {}
+            if secondary_index_current.index_partial_filter is not None:
+                create_index_kwargs[
+                    "partialFilterExpression"
+                ] = secondary_index_current.index_partial_filter
+
+            collection.create_index(
+                secondary_index_current.index_keys,
+                name=secondary_index_current.name,
+                **create_index_kwargs,
+            )
+
+
+def ensure_current_revision(
+    *,
+    collection: pymongo.collection.Collection,
+):
+    """
+    Ensure the "_current" marker is present on exactly the head revision of each document.
+
+    Writes maintain the marker if configured, so this is needed only for documents written without it
+    (e.g., before the marker was maintained, or restored from an archive).
+    Corrections are applied in bulk writes of at most ENSURE_CURRENT_REVISION_BATCH_SIZE,
+    so the size of any command is bounded regardless of the size of the collection.
+    This function should be idempotent, it may be called many times on a collection.
+    """
+
+    # Obtain only documents whose head revision is unmarked or with another revision marked,
+    # including tombstones
+    pipeline = [
+        {"$sort": {"_rev": pymongo.DESCENDING}},
+        {
+            "$group": {
+                "_id": {"_type": "$_type", "_set_id": "$_set_id"},
+                "head_id": {"$first": "$_id"},
+                "head_current": {"$first": "${}".format(CURRENT_REVISION_FIELD)},
+                "current_count": {
+                    "$sum": {
+                        "$cond": [
+                            {"$eq": ["${}".format(CURRENT_REVISION_FIELD), True]},
+                            1,
+                            0,
+                        ]
+                    }
+                },
+            }
+        },
+        {
+            "$match": {
+                "$or": [
+                    {"head_current": {"$ne": True}},
+                    {"current_count": {"$gt": 1}},
+                ]
+            }
+        },
+    ]
+
+    update_requests = []
+    with collection.aggregate(pipeline) as pipeline_result:
+        for result_current in pipeline_result:
+            head_current = result_current["head_current"] is True
+
+            # Mark the head revision
+            if not head_current:
+                update_requests.append(
+                    pymongo.UpdateOne(
+                        filter={"_id": result_current["head_id"]},
+                        update={"$set": {CURRENT_REVISION_FIELD: True}},
+                    )
+                )
+
+            # Remove the marker from any other revision
+            if result_current["current_count"] > (1 if head_current else 0):
+                previous_filter = {
+                    "_type": result_current["_id"]["_type"],
+                    "_id": {"$ne": result_current["head_id"]},
+                    CURRENT_REVISION_FIELD: True,
+                }
+                if "_set_id" in result_current["_id"]:
+                    previous_filter["_set_id"] = result_current["_id"]["_set_id"]
+
+                update_requests.append(
+                    pymongo.UpdateMany(
+                        filter=previous_filter,
+                        update={"$unset": {CURRENT_REVISION_FIELD: ""}},
+                    )
+                )
+
+            if len(update_requests) >= ENSURE_CURRENT_REVISION_BATCH_SIZE:
+                collection.bulk_write(update_requests, ordered=False)
+                update_requests = []
+
+    if update_requests:
+        collection.bulk_write(update_requests, ordered=False)
+
+
+def get_changes(
+    *,
+    collection: pymongo.collection.Collection,
+    change_token: Optional[str],
+) -> ChangesResult:
+    """
+    Retrieve the head revision of every document changed since change_token.
+
+    - A change token is the greatest "_id" in the collection when changes were retrieved.
+    - If change_token is None, every document is considered changed.
+    - Deleted documents are included, so their deletion can be applied.
+    - A document may also be included in the following result,
+      so applying a result must be idempotent (e.g., by "_rev").
+    """
+
+    query_match = {}
+    if change_token is not None:
+        if not bson.objectid.ObjectId.is_valid(change_token):
+            raise ValueError('Invalid change token "{}"'.format(change_token))
+
+        # Bound by the generation time of the token, less the overlap
+        generation_time = bson.objectid.ObjectId(change_token).generation_time
+        query_match["_id"] = {
+            "$gt": bson.objectid.ObjectId.from_datetime(
+                generation_time=generation_time
+                - datetime.timedelta(seconds=CHANGES_OVERLAP_SECONDS)
+            )
+        }
+
+    # Obtain the next token before the query, so no change can be missed
+    document_latest = collection.find_one(
+        filter={},
+        projection={"_id": True},
+        sort=[("_id", pymongo.DESCENDING)],
+    )
+    if document_latest is not None:
+        change_token_next = str(document_latest["_id"])
+    else:
+        change_token_next = change_token
+
+    # Query pipeline
+    pipeline = _head_pipeline(
+        match=query_match,
+        group_id={"_type": "$_type", "_set_id": "$_set_id"},
+        filter_deleted=False,
+    )
+    pipeline.append({"$sort": {"_id": pymongo.ASCENDING}})
+
+    # Execute pipeline, obtain each normalized document
+    with collection.aggregate(pipeline) as pipeline_result:
+        documents = [
+            document_utils.normalize_document(document=document_current)
+            for document_current in pipeline_result
+        ]
+
+    return ChangesResult(
+        documents=documents,
+        change_token=change_token_next,
+    )
+
+
+def get_head_ids(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    set_id: Optional[str] = None,
+    filter_deleted: bool = True,
+) -> List[str]:
+    """
+    Retrieve the "_id" of the head revision of each document with "_type" of document_type.
+
+    - Every revision has a distinct "_id", so the result changes whenever any document changes.
+    - Document bodies are not retrieved, so this is suited to checking for changes.
+    - If set_id is provided, only the element with that "_set_id" is considered.
+    - A singleton should provide filter_deleted=False, as get_singleton does.
+    - Result is sorted, matching the order of normalized documents.
+    """
+
+    # Parameters in query pipeline
+    query_match = {"_type": document_type}
+    if set_id is not None:
+        query_match["_set_id"] = set_id
+
+    # Query pipeline
+    pipeline = _head_pipeline(
+        match=query_match,
+        group_id="$_set_id",
+        filter_deleted=filter_deleted,
+    )
+    # Carry only the fields needed to select head revisions through the pipeline
+    pipeline.insert(
+        1,
+        {"$project": {"_id": 1, "_set_id": 1, "_rev": 1, "_deleted": 1}},
+    )
+    pipeline.append({"$project": {"_id": 1}})
+
+    # Execute pipeline, obtain each "_id"
+    with collection.aggregate(pipeline) as pipeline_result:
+        head_ids = [
+            str(document_current["_id"]) for document_current in pipeline_result
+        ]
+
+    return sorted(head_ids)
+
 
 def get_multiple_types(
     *,
     collection: pymongo.collection.Collection,
     singleton_types: List[str],
     set_types: List[str],
+    projection: Optional[Dict[str, bool]] = None,
+    type_projections: Optional[Dict[str, Dict[str, bool]]] = None,
 ) -> Dict[str, Union[List[dict], Optional[dict]]]:
+    """
+    Retrieve all documents of multiple singleton and set types in a single query.
+
+    A projection may include or exclude fields of every type.
+    Type projections may include fields of specific types, keyed by "_type".
+    """
+
     # Combine the document types
     combined_document_types = singleton_types + set_types
 
@@ -196,93 +1162,188 @@ def get_multiple_types(
     query_document_types = combined_document_types
 
     # Query pipeline
-    pipeline = [
+    pipeline = _head_pipeline(
         # Obtain all documents of the desired "_type"
-        {"$match": {"_type": {"$in": query_document_types}}},
-        # Sort by "_rev",
-        # store the most recent "_rev" in "result",
-        # move forward with that version
-        {"$sort": {"_rev": pymongo.DESCENDING}},
-        {
-            "$group": {
-                "_id": {"_type": "$_type", "_set_id": "$_set_id"},
-                "result": {"$first": "$$ROOT"},
-            }
-        },
-        {"$replaceRoot": {"newRoot": "$result"}},
-        # Filter any document with "_deleted"
-        {"$match": {"_deleted": {"$exists": False}}},
-    ]
+        match={"_type": {"$in": query_document_types}},
+        group_id={"_type": "$_type", "_set_id": "$_set_id"},
+        filter_deleted=True,
+    )
+    pipeline.extend(_projection_pipeline(projection=projection))
+    pipeline.extend(_type_projection_pipeline(type_projections=type_projections))
+    # Order results by "_type" and then by "_id".
+    # Results therefore arrive grouped by type and in normalized order.
+    # This is preferred to a "$group" by type, which could exceed the maximum document size.
+    pipeline.append({"$sort": {"_type": pymongo.ASCENDING, "_id": pymongo.ASCENDING}})
 
-    # Execute pipeline, obtain list of results
+    # Create a result dictionary with a key for each type
+    documents_by_type = {}
+    for type_current in combined_document_types:
+        documents_by_type[type_current] = []
+
+    # Execute pipeline, put each document with its type
     with collection.aggregate(pipeline) as pipeline_result:
         # Confirm a result was found
-        documents = []
         if pipeline_result.alive:
-            documents = list(pipeline_result)
+            for document_current in pipeline_result:
+                documents_by_type[document_current["_type"]].append(
+                    document_utils.normalize_document(document=document_current)
+                )
+
+    # Each type's list of documents is already normalized and in "_id" order
+
+    # Restore singleton types to a single item instead of a list
+    if singleton_types:
+        for type_singleton_current in singleton_types:
+            result_documents_current = documents_by_type[type_singleton_current]
+            if len(result_documents_current) == 0:
+                documents_by_type[type_singleton_current] = None
+            elif len(result_documents_current) == 1:
+                documents_by_type[type_singleton_current] = result_documents_current[0]
+            else:
+                assert False
+
+    return documents_by_type
+
+
+def get_set(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    projection: Optional[Dict[str, bool]] = None,
+) -> Optional[List[dict]]:
+    """
+    Retrieve all elements of set with "_type" of document_type.
+
+    If none exist, return None.
+
+    A projection may include or exclude fields, applied within the query.
+    """
+
+    # Obtain each normalized document
+    documents = list(
+        iter_set(
+            collection=collection,
+            document_type=document_type,
+            projection=projection,
+        )
+    )
+
+    # Complete normalization of the list of documents
+    documents = document_utils.sort_normalized_documents(documents=documents)
+
+    return documents
+
+
+def get_set_matching(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    match: dict,
+    projection: Optional[Dict[str, bool]] = None,
+) -> List[dict]:
+    """
+    Retrieve elements of set with "_type" document_type whose head matches a filter.
 
-    # Create a result dictionary with a key for each type
-    documents_by_type = {}
-    for type_current in combined_document_types:
-        documents_by_type[type_current] = []
+    The filter is first applied to all revisions, which a SecondaryIndex can serve.
+    Head revisions are then obtained for only those elements, confirming the filter.
 
-    # Put each document with its type
-    # TODO this could probably be accomplished in the above query
-    for document_current in documents:
-        documents_by_type[document_current["_type"]].append(document_current)
+    A projection may include or exclude fields, applied within the query.
+    """
 
-    # Normalize each type's list of documents
-    for type_current in combined_document_types:
-        documents_by_type[type_current] = document_utils.normalize_documents(
-            documents=documents_by_type[type_current]
+    # Parameters in query pipeline
+    query_document_type = document_type
+    query_match = {"_type": query_document_type} | match
+
+    if _current_revision_reads:
+        # Only head revisions are marked, so the filter can be applied directly
+        pipeline = _head_pipeline(
+            match=query_match,
+            group_id="$_set_id",
+            filter_deleted=True,
         )
+    else:
+        # Obtain "_set_id" of elements with any matching revision
+        candidate_pipeline = [
+            {"$match": query_match},
+            {"$group": {"_id": "$_set_id"}},
+        ]
+        with collection.aggregate(candidate_pipeline) as pipeline_result:
+            query_set_ids = [
+                pipeline_result_current["_id"]
+                for pipeline_result_current in pipeline_result
+            ]
+        if not query_set_ids:
+            return []
 
-    # Restore singleton types to a single item instead of a list
-    if singleton_types:
-        for type_singleton_current in singleton_types:
-            result_documents_current = documents_by_type[type_singleton_current]
-            if len(result_documents_current) == 0:
-                documents_by_type[type_singleton_current] = None
-            elif len(result_documents_current) == 1:
-                documents_by_type[type_singleton_current] = result_documents_current[0]
-            else:
-                assert False
+        # Obtain head revisions of those elements, confirm they still match
+        pipeline = _head_pipeline(
+            match={
+                "_type": query_document_type,
+                "_set_id": {"$in": query_set_ids},
+            },
+            group_id="$_set_id",
+            filter_deleted=True,
+        )
+        pipeline.append({"$match": match})
+    pipeline.extend(_projection_pipeline(projection=projection))
 
-    return documents_by_type
+    # Execute pipeline, obtain list of results
+    with collection.aggregate(pipeline) as pipeline_result:
+        # Confirm a result was found
+        if not pipeline_result.alive:
+            return []
+
+        documents = list(pipeline_result)
 
+    return document_utils.normalize_documents(documents=documents)
 
-def get_set(
+
+def get_set_range(
     *,
     collection: pymongo.collection.Collection,
     document_type: str,
-) -> Optional[List[dict]]:
+    range_field: str,
+    range_start: Optional[str] = None,
+    range_end: Optional[str] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+    projection: Optional[Dict[str, bool]] = None,
+) -> List[dict]:
     """
-    Retrieve all elements of set with "_type" of document_type.
+    Retrieve elements of set with "_type" document_type within a range of range_field.
 
-    If none exist, return None.
+    - range_start is inclusive, range_end is exclusive, either may be None.
+    - Values are compared as stored, so range_field must have a sortable format.
+    - Results are ordered by range_field (ascending unless descending),
+      and at most limit results are returned.
+
+    A projection may include or exclude fields, applied within the query.
     """
 
     # Parameters in query pipeline
     query_document_type = document_type
+    query_range = {}
+    if range_start is not None:
+        query_range["$gte"] = range_start
+    if range_end is not None:
+        query_range["$lt"] = range_end
+    query_order = pymongo.DESCENDING if descending else pymongo.ASCENDING
 
     # Query pipeline
-    pipeline = [
+    pipeline = _head_pipeline(
         # Obtain all documents of the desired "_type"
-        {"$match": {"_type": query_document_type}},
-        # Sort by "_rev",
-        # store the most recent "_rev" in "result",
-        # move forward with that version
-        {"$sort": {"_rev": pymongo.DESCENDING}},
-        {
-            "$group": {
-                "_id": "$_set_id",
-                "result": {"$first": "$$ROOT"},
-            }
-        },
-        {"$replaceRoot": {"newRoot": "$result"}},
-        # Filter any document with "_deleted"
-        {"$match": {"_deleted": {"$exists": False}}},
-    ]
+        match={"_type": query_document_type},
+        group_id="$_set_id",
+        filter_deleted=True,
+    )
+    # Range is applied to head revisions,
+    # as an earlier revision may have had a different value
+    if query_range:
+        pipeline.append({"$match": {range_field: query_range}})
+    pipeline.append({"$sort": {range_field: query_order, "_id": query_order}})
+    if limit is not None:
+        pipeline.append({"$limit": limit})
+    pipeline.extend(_projection_pipeline(projection=projection))
 
     # Execute pipeline, obtain list of results
     with collection.aggregate(pipeline) as pipeline_result:
@@ -292,8 +1353,11 @@ def get_set(
 
         documents = list(pipeline_result)
 
-    # Normalize the list of documents
-    documents = document_utils.normalize_documents(documents=documents)
+    # Normalize each document, retaining the range order
+    documents = [
+        document_utils.normalize_document(document=document_current)
+        for document_current in documents
+    ]
 
     return documents
 
@@ -303,11 +1367,14 @@ def get_set_element(
     collection: pymongo.collection.Collection,
     document_type: str,
     set_id: str,
+    projection: Optional[Dict[str, bool]] = None,
 ) -> Optional[dict]:
     """
     Retrieve all elements of set with "_type" document_type.
 
     If none exist, return None.
+
+    A projection may include or exclude fields, applied within the query.
     """
 
     # Parameters in query pipeline
@@ -315,28 +1382,16 @@ def get_set_element(
     query_set_id = set_id
 
     # Query pipeline
-    pipeline = [
+    pipeline = _head_pipeline(
         # Obtain all documents of the desired "_type"
-        {
-            "$match": {
-                "_type": query_document_type,
-                "_set_id": query_set_id,
-            }
-        },
-        # Sort by "_rev",
-        # store the most recent "_rev" in "result",
-        # move forward with that version
-        {"$sort": {"_rev": pymongo.DESCENDING}},
-        {
-            "$group": {
-                "_id": None,
-                "result": {"$first": "$$ROOT"},
-            }
+        match={
+            "_type": query_document_type,
+            "_set_id": query_set_id,
         },
-        {"$replaceRoot": {"newRoot": "$result"}},
-        # Filter any document with "_deleted"
-        {"$match": {"_deleted": {"$exists": False}}},
-    ]
+        group_id=None,
+        filter_deleted=True,
+    )
+    pipeline.extend(_projection_pipeline(projection=projection))
 
     # Execute pipeline, obtain single result
     with collection.aggregate(pipeline) as pipeline_result:
@@ -352,6 +1407,58 @@ def get_set_element(
     return document
 
 
+def get_set_elements(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    set_ids: List[str],
+    projection: Optional[Dict[str, bool]] = None,
+) -> Dict[str, dict]:
+    """
+    Retrieve multiple elements of set with "_type" document_type.
+
+    Obtains all elements in a single query, returning a dictionary keyed by "_set_id".
+    Any element that does not exist is omitted from the result.
+
+    A projection may include or exclude fields, applied within the query.
+    """
+
+    if not set_ids:
+        return {}
+
+    # Parameters in query pipeline
+    query_document_type = document_type
+    query_set_ids = list(set_ids)
+
+    # Query pipeline
+    pipeline = _head_pipeline(
+        # Obtain all documents of the desired "_type" and "_set_id"
+        match={
+            "_type": query_document_type,
+            "_set_id": {"$in": query_set_ids},
+        },
+        group_id="$_set_id",
+        filter_deleted=True,
+    )
+    pipeline.extend(_projection_pipeline(projection=projection))
+
+    # Execute pipeline, obtain list of results
+    with collection.aggregate(pipeline) as pipeline_result:
+        # Confirm a result was found
+        if not pipeline_result.alive:
+            return {}
+
+        documents = list(pipeline_result)
+
+    # Normalize each document, key by "_set_id"
+    documents_by_set_id = {}
+    for document_current in documents:
+        document_current = document_utils.normalize_document(document=document_current)
+        documents_by_set_id[document_current["_set_id"]] = document_current
+
+    return documents_by_set_id
+
+
 def get_singleton(
     *,
     collection: pymongo.collection.Collection,
@@ -367,17 +1474,11 @@ def get_singleton(
     query_document_type = document_type
 
     # Query pipeline
-    pipeline = [
-        {"$match": {"_type": query_document_type}},
-        {"$sort": {"_rev": pymongo.DESCENDING}},
-        {
-            "$group": {
-                "_id": None,
-                "result": {"$first": "$$ROOT"},
-            }
-        },
-        {"$replaceRoot": {"newRoot": "$result"}},
-    ]
+    pipeline = _head_pipeline(
+        match={"_type": query_document_type},
+        group_id=None,
+        filter_deleted=False,
+    )
 
     # Execute pipeline, obtain single result
     with collection.aggregate(pipeline) as pipeline_result:
@@ -393,6 +1494,40 @@ def get_singleton(
     return document
 
 
+def iter_set(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    projection: Optional[Dict[str, bool]] = None,
+    batch_size: int = ITER_SET_BATCH_SIZE,
+) -> Iterator[dict]:
+    """
+    Iterate over all elements of set with "_type" of document_type.
+
+    Each document is normalized and yielded in the order the cursor returns it,
+    so at most one batch of batch_size documents is held in memory.
+    Unlike get_set, the resulting order is therefore not normalized.
+    A projection may include or exclude fields, applied within the query.
+    """
+
+    # Parameters in query pipeline
+    query_document_type = document_type
+
+    # Query pipeline
+    pipeline = _head_pipeline(
+        # Obtain all documents of the desired "_type"
+        match={"_type": query_document_type},
+        group_id="$_set_id",
+        filter_deleted=True,
+    )
+    pipeline.extend(_projection_pipeline(projection=projection))
+
+    # Execute pipeline, yield each result
+    with collection.aggregate(pipeline, batchSize=batch_size) as pipeline_result:
+        for document_current in pipeline_result:
+            yield document_utils.normalize_document(document=document_current)
+
+
 def post_set_element(
     *,
     collection: pymongo.collection.Collection,
@@ -414,47 +1549,15 @@ def post_set_element(
     # Work with a copy
     document = copy.deepcopy(document)
 
-    # Document must not include an "_id",
-    # as this indicates it was retrieved from the database.
-    if "_id" in document:
-        raise ValueError('Document must not have existing "_id"')
-
-    # If a document includes a "_type", it must match document_type.
-    if "_type" in document:
-        if document["_type"] != document_type:
-            raise ValueError('document["_type"] must match document_type')
-    else:
-        document["_type"] = document_type
-
-    # Document must not include an "_set_id",
-    # as post expects to assign this.
-    if "_set_id" in document:
-        raise ValueError('Document must not have existing "_set_id"')
-
-    # Document must not include an "_rev",
-    # as this indicates it was retrieved from the database.
-    if "_rev" in document:
-        raise ValueError('Document must not have existing "_rev"')
-
-    # Generate a "_set_id" and a "_rev"
-    generated_set_id = generate_set_id()
-    document["_set_id"] = generated_set_id
-    document["_rev"] = 1
-
-    # If a semantic_set_id is specified
-    if semantic_set_id:
-        # Document must not include a semantic set id,
-        # as post expects to assign this.
-        if semantic_set_id in document:
-            raise ValueError(
-                'Document must not have existing "{}"'.format(semantic_set_id)
-            )
-
-        document[semantic_set_id] = generated_set_id
+    document = _prepare_post_set_element(
+        document_type=document_type,
+        semantic_set_id=semantic_set_id,
+        document=document,
+    )
+    generated_set_id = document["_set_id"]
 
-    # insert_one will modify the document to insert an "_id"
-    document = document_utils.normalize_document(document=document)
-    result = collection.insert_one(document=document)
+    # _insert_revision will modify the document to insert an "_id"
+    result = _insert_revision(collection=collection, document=document)
     document = document_utils.normalize_document(document=document)
 
     return SetPostResult(
@@ -465,6 +1568,42 @@ def post_set_element(
     )
 
 
+def post_set_elements(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    semantic_set_id: Optional[str],
+    documents: List[dict],
+) -> List[SetPostResult]:
+    """
+    Post multiple set element documents.
+
+    Equivalent to post_set_element for each document,
+    but all documents are validated before any is inserted
+    and inserts are performed in a single ordered round trip.
+
+    If an insert fails, raises SetElementsWriteException.
+    """
+
+    # Work with a copy
+    documents = copy.deepcopy(documents)
+
+    documents = [
+        _prepare_post_set_element(
+            document_type=document_type,
+            semantic_set_id=semantic_set_id,
+            document=document_current,
+        )
+        for document_current in documents
+    ]
+
+    return _insert_set_elements(
+        collection=collection,
+        documents=documents,
+        result_type=SetPostResult,
+    )
+
+
 def put_set_element(
     *,
     collection: pymongo.collection.Collection,
@@ -488,57 +1627,15 @@ def put_set_element(
     # Work with a copy
     document = copy.deepcopy(document)
 
-    # Document must not include an "_id",
-    # as this indicates it was retrieved from the database.
-    if "_id" in document:
-        raise ValueError('Document must not have existing "_id"')
-
-    # If a document includes a "_type", it must match document_type.
-    if "_type" in document:
-        if document["_type"] != document_type:
-            raise ValueError('document["_type"] must match document_type')
-    else:
-        document["_type"] = document_type
-
-    # If a document includes a "_set_id", it must match set_id.
-    if "_set_id" in document:
-        if document["_set_id"] != set_id:
-            raise ValueError('document["_set_id"] must match set_id')
-    else:
-        # Set the "_set_id"
-        document["_set_id"] = set_id
-
-    # Increment the "_rev"
-    if "_rev" in document:
-        if not isinstance(document["_rev"], int):
-            raise ValueError('document["_rev"] must be int')
-
-        # TODO: We could check to ensure the previous _rev actually exists.
-        #       This is only relevant if the client has skipped ahead to some false future _rev.
-        #       An ordered bulk operation could findUpdate the previous _rev to update an ignored field,
-        #       then insert the new _rev (i.e., findUpdate would fail if the previous _rev did not exist,
-        #       insert would fail if somebody else has already created the new _rev).
-        #       If that field were to have actual meaning, this would need to be done in a transaction.
-
-        document["_rev"] += 1
-    else:
-        document["_rev"] = 1
-
-    # If a semantic_set_id is specified
-    if semantic_set_id:
-        # If a document includes a "semantic_set_id", it must match set_id.
-        if semantic_set_id in document:
-            if document[semantic_set_id] != set_id:
-                raise ValueError(
-                    'document["{}"] must match set_id'.format(semantic_set_id)
-                )
-        else:
-            # Set the "semantic_set_id"
-            document[semantic_set_id] = set_id
+    document = _prepare_put_set_element(
+        document_type=document_type,
+        semantic_set_id=semantic_set_id,
+        set_id=set_id,
+        document=document,
+    )
 
-    # insert_one will modify the document to insert an "_id"
-    document = document_utils.normalize_document(document=document)
-    result = collection.insert_one(document=document)
+    # _insert_revision will modify the document to insert an "_id"
+    result = _insert_revision(collection=collection, document=document)
     document = document_utils.normalize_document(document=document)
 
     return SetPutResult(
@@ -549,6 +1646,44 @@ def put_set_element(
     )
 
 
+def put_set_elements(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    semantic_set_id: Optional[str],
+    documents: Dict[str, dict],
+) -> List[SetPutResult]:
+    """
+    Put multiple set element documents, keyed by their set_id.
+
+    Equivalent to put_set_element for each document,
+    but all documents are validated before any is inserted
+    and inserts are performed in a single ordered round trip.
+
+    If an insert fails, raises SetElementsWriteException.
+    A "_rev" conflict is indicated by its duplicate_key.
+    """
+
+    # Work with a copy
+    documents = copy.deepcopy(documents)
+
+    documents = [
+        _prepare_put_set_element(
+            document_type=document_type,
+            semantic_set_id=semantic_set_id,
+            set_id=set_id_current,
+            document=document_current,
+        )
+        for set_id_current, document_current in documents.items()
+    ]
+
+    return _insert_set_elements(
+        collection=collection,
+        documents=documents,
+        result_type=SetPutResult,
+    )
+
+
 def put_singleton(
     *,
     collection: pymongo.collection.Collection,
@@ -586,9 +1721,9 @@ def put_singleton(
     else:
         document["_rev"] = 1
 
-    # insert_one will modify the document to insert an "_id"
+    # _insert_revision will modify the document to insert an "_id"
     document = document_utils.normalize_document(document=document)
-    result = collection.insert_one(document=document)
+    result = _insert_revision(collection=collection, document=document)
     document = document_utils.normalize_document(document=document)
 
     return PutResult(
@@ -617,4 +1752,7 @@ def unsafe_delete_set_element_destructive(
         }
     )
 
+    if result.deleted_count:
+        _notify_write(collection=collection, documents=None)
+
     return result.deleted_count > 0
@@ -5,6 +5,12 @@ from typing import Union
 DATETIME_FORMAT_COMPLETE = "%Y-%m-%dT%H:%M:%S.%fZ"
 DATETIME_FORMAT_NO_MICROSECONDS = "%Y-%m-%dT%H:%M:%SZ"
 
+# A stored datetime may or may not include microseconds,
+# (e.g., "...:00Z" or "...:00.000Z"), so values are not comparable as strings
+# within a second. Both forms sort after this format for the same second,
+# so query bounds are formatted with it and apply at the granularity of a second.
+DATETIME_FORMAT_QUERY_BOUND = "%Y-%m-%dT%H:%M:%S"
+
 
 def parse_date(date: str) -> _datetime.date:
     """
@@ -86,6 +92,16 @@ def format_datetime(datetime: _datetime.datetime) -> str:
     return datetime.strftime(DATETIME_FORMAT_NO_MICROSECONDS)
 
 
+def format_datetime_query_bound(datetime: _datetime.datetime) -> str:
+    """
+    Format a datetime for comparison against stored datetimes within a query.
+    """
+
+    raise_on_not_datetime_utc_aware(datetime=datetime)
+
+    return datetime.strftime(DATETIME_FORMAT_QUERY_BOUND)
+
+
 def raise_on_not_date(date: _datetime.date) -> None:
     """
     Raise if a provided date is not a date.
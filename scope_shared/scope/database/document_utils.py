@@ -13,11 +13,16 @@ def normalize_document(
     - Goal of normalization is to support equality comparison.
     - Any modification (e.g., deleting a field) may require re-normalization for equality comparison.
     - Normalization is shallow, requiring any descendents are already normalized.
+    - Storage markers (e.g., "_current") are removed, as they are not part of the document.
     """
 
     normalized_document = {}
     keys_remaining = list(document.keys())
 
+    # The "_current" marker is maintained by collection_utils for efficient reads
+    if "_current" in keys_remaining:
+        keys_remaining.remove("_current")
+
     # Dictionaries preserve order, so ensure these are first
     keys_prefix = ["_id", "_type", "_set_id", "_rev"]
     for key_current in keys_prefix:
@@ -40,6 +45,15 @@ def normalize_document(
     return normalized_document
 
 
+def _normalize_documents_id_key(document: dict) -> str:
+    """
+    Sort key for documents which are known to all contain an "_id" field.
+
+    A normalized "_id" is a string, so this matches the order of _normalize_documents_key.
+    """
+    return document["_id"]
+
+
 def _normalize_documents_key(document) -> str:
     """
     Provide a consistent sort of documents, sufficient to enable list comparison.
@@ -75,6 +89,24 @@ def normalize_documents(
     for document_current in documents:
         normalized_documents.append(normalize_document(document=document_current))
 
-    normalized_documents = sorted(normalized_documents, key=_normalize_documents_key)
+    return sort_normalized_documents(documents=normalized_documents)
+
+
+def sort_normalized_documents(
+    *,
+    documents: List[dict],
+) -> List[dict]:
+    """
+    Sort a list of documents that are already normalized.
+    - Completes normalization of a list whose elements were each normalized by normalize_document.
+    - The list is sorted in place and returned.
+    """
+
+    if all("_id" in document_current for document_current in documents):
+        # Fast path for documents retrieved from the database.
+        # Equivalent to _normalize_documents_key, but without string formatting.
+        documents.sort(key=_normalize_documents_id_key)
+    else:
+        documents.sort(key=_normalize_documents_key)
 
-    return normalized_documents
+    return documents
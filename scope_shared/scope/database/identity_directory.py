@@ -0,0 +1,301 @@
+import copy
+from dataclasses import dataclass
+import pymongo
+import pymongo.collection
+import pymongo.database
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import scope.database.patients
+import scope.database.providers
+
+# Within this many seconds, the directory is used without consulting the database
+IDENTITY_DIRECTORY_TTL_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class _IdentityDirectorySnapshot:
+    version: Tuple
+    patient_identities_by_cognito_id: Dict[str, dict]
+    patient_identities_by_patient_id: Dict[str, dict]
+    provider_identities_by_cognito_id: Dict[str, dict]
+
+
+def _cognito_id(identity: dict) -> Optional[str]:
+    return identity.get("cognitoAccount", {}).get("cognitoId", None)
+
+
+def _collection_version(collection: pymongo.collection.Collection) -> Tuple:
+    """
+    Version of a collection that changes with any insert or removal.
+
+    Documents are only ever inserted or destructively removed,
+    so the greatest "_id" and the count of documents are sufficient.
+    """
+
+    document_latest = collection.find_one(
+        filter={},
+        projection={"_id": True},
+        sort=[("_id", pymongo.DESCENDING)],
+    )
+
+    return (
+        document_latest["_id"] if document_latest else None,
+        collection.estimated_document_count(),
+    )
+
+
+class IdentityDirectory:
+    """
+    In-process directory of patient and provider identities.
+
+    - Identities are obtained by cognitoId or patientId without scanning.
+    - The directory is reloaded when invalidated,
+      or when the identity collections have changed after the TTL.
+    - Within the TTL, a lookup that finds nothing is a result like any other.
+      Only a lookup by patientId that finds nothing checks whether the collections have changed,
+      so a patient just created by another process is found.
+    - The database is consulted outside the lock, by one thread per database at a time.
+      While that thread checks an expired snapshot, other threads continue to use that snapshot.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = IDENTITY_DIRECTORY_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+
+        # Snapshots, when they were checked, and any check in progress, keyed by database name
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, _IdentityDirectorySnapshot] = {}
+        self._checked: Dict[str, float] = {}
+        self._checking: Dict[str, threading.Event] = {}
+
+        # Incremented by invalidate, so a check that overlaps it is not retained
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshots = {}
+            self._checked = {}
+            self._generation += 1
+
+    @staticmethod
+    def _version(*, database: pymongo.database.Database) -> Tuple:
+        return (
+            _collection_version(
+                database.get_collection(
+                    scope.database.patients.PATIENT_IDENTITY_COLLECTION
+                )
+            ),
+            _collection_version(
+                database.get_collection(
+                    scope.database.providers.PROVIDER_IDENTITY_COLLECTION
+                )
+            ),
+        )
+
+    @staticmethod
+    def _load(
+        *,
+        database: pymongo.database.Database,
+        version: Tuple,
+    ) -> _IdentityDirectorySnapshot:
+        patient_identities = (
+            scope.database.patients.get_patient_identities(database=database) or []
+        )
+        provider_identities = (
+            scope.database.providers.get_provider_identities(database=database) or []
+        )
+
+        return _IdentityDirectorySnapshot(
+            version=version,
+            patient_identities_by_cognito_id={
+                _cognito_id(identity_current): identity_current
+                for identity_current in patient_identities
+                if _cognito_id(identity_current)
+            },
+            patient_identities_by_patient_id={
+                identity_current[
+                    scope.database.patients.PATIENT_IDENTITY_SEMANTIC_SET_ID
+                ]: identity_current
+                for identity_current in patient_identities
+            },
+            provider_identities_by_cognito_id={
+                _cognito_id(identity_current): identity_current
+                for identity_current in provider_identities
+                if _cognito_id(identity_current)
+            },
+        )
+
+    def _current_snapshot(
+        self,
+        *,
+        database: pymongo.database.Database,
+        check: bool,
+    ) -> _IdentityDirectorySnapshot:
+        """
+        Obtain a snapshot, checking the version if the TTL has passed or if requested.
+        """
+
+        while True:
+            with self._lock:
+                snapshot = self._snapshots.get(database.name, None)
+                checking = self._checking.get(database.name, None)
+
+                if snapshot is not None and not check:
+                    if self._clock() - self._checked[database.name] < self._ttl_seconds:
+                        return snapshot
+                    if checking is not None:
+                        return snapshot
+
+                if checking is None:
+                    checking = threading.Event()
+                    self._checking[database.name] = checking
+                    generation = self._generation
+                    break
+
+            # Wait for the check in progress, then use its result
+            checking.wait()
+            check = False
+
+        try:
+            version = IdentityDirectory._version(database=database)
+            if snapshot is None or snapshot.version != version:
+                snapshot = IdentityDirectory._load(
+                    database=database,
+                    version=version,
+                )
+
+            with self._lock:
+                if self._generation == generation:
+                    self._snapshots[database.name] = snapshot
+                    self._checked[database.name] = self._clock()
+        finally:
+            with self._lock:
+                del self._checking[database.name]
+            checking.set()
+
+        return snapshot
+
+    def _lookup(
+        self,
+        *,
+        database: pymongo.database.Database,
+        lookup: Callable[[_IdentityDirectorySnapshot], Optional[dict]],
+        check_not_found: bool,
+    ) -> Optional[dict]:
+        result = lookup(self._current_snapshot(database=database, check=False))
+        if result is None and check_not_found:
+            # Confirm against the database before reporting nothing found
+            result = lookup(self._current_snapshot(database=database, check=True))
+
+        return copy.deepcopy(result)
+
+    def patient_identity_by_cognito_id(
+        self,
+        *,
+        database: pymongo.database.Database,
+        cognito_id: str,
+    ) -> Optional[dict]:
+        return self._lookup(
+            database=database,
+            lookup=lambda snapshot: snapshot.patient_identities_by_cognito_id.get(
+                cognito_id, None
+            ),
+            check_not_found=False,
+        )
+
+    def patient_identity_by_patient_id(
+        self,
+        *,
+        database: pymongo.database.Database,
+        patient_id: str,
+    ) -> Optional[dict]:
+        return self._lookup(
+            database=database,
+            lookup=lambda snapshot: snapshot.patient_identities_by_patient_id.get(
+                patient_id, None
+            ),
+            # A patient may have just been created by another process
+            check_not_found=True,
+        )
+
+    def provider_identity_by_cognito_id(
+        self,
+        *,
+        database: pymongo.database.Database,
+        cognito_id: str,
+    ) -> Optional[dict]:
+        return self._lookup(
+            database=database,
+            lookup=lambda snapshot: snapshot.provider_identities_by_cognito_id.get(
+                cognito_id, None
+            ),
+            check_not_found=False,
+        )
+
+
+# Process-wide directory
+_identity_directory = IdentityDirectory()
+
+
+def get_patient_collection_name(
+    *,
+    database: pymongo.database.Database,
+    patient_id: str,
+) -> Optional[str]:
+    """
+    Obtain the name of the collection of a patient.
+    """
+
+    patient_identity = _identity_directory.patient_identity_by_patient_id(
+        database=database,
+        patient_id=patient_id,
+    )
+    if patient_identity is None:
+        return None
+
+    return patient_identity["collection"]
+
+
+def get_patient_identity_by_cognito_id(
+    *,
+    database: pymongo.database.Database,
+    cognito_id: str,
+) -> Optional[dict]:
+    """
+    Obtain the patient identity with a cognitoId.
+    """
+
+    return _identity_directory.patient_identity_by_cognito_id(
+        database=database,
+        cognito_id=cognito_id,
+    )
+
+
+def get_provider_identity_by_cognito_id(
+    *,
+    database: pymongo.database.Database,
+    cognito_id: str,
+) -> Optional[dict]:
+    """
+    Obtain the provider identity with a cognitoId.
+    """
+
+    return _identity_directory.provider_identity_by_cognito_id(
+        database=database,
+        cognito_id=cognito_id,
+    )
+
+
+def invalidate() -> None:
+    """
+    Invalidate the directory, called after any write to an identity.
+    """
+
+    _identity_directory.invalidate()
@@ -1,6 +1,7 @@
 import pymongo.database
 import scope.config
 import scope.database.collection_utils as collection_utils
+import scope.database.patient.patient_profile
 import scope.database.patients
 import scope.database.providers
 
@@ -62,6 +63,41 @@ def ensure_database_initialized(
 
     _initialize_patient_identity_collection(database=database)
     _initialize_provider_identity_collection(database=database)
+    _initialize_patient_collections(database=database)
+
+
+def _initialize_patient_collections(*, database: pymongo.database.Database):
+    """
+    Initialize every existing patient collection.
+
+    Initialization should be idempotent.
+    """
+
+    patient_identities = scope.database.patients.get_patient_identities(
+        database=database,
+    )
+    for patient_identity_current in patient_identities:
+        patient_collection = database.get_collection(
+            patient_identity_current["collection"]
+        )
+
+        # Ensure the expected index
+        collection_utils.ensure_index(
+            collection=patient_collection,
+            secondary_indexes=scope.database.patients.patient_collection_secondary_indexes(),
+        )
+
+        # Ensure head revisions are marked for current revision reads
+        collection_utils.ensure_current_revision(collection=patient_collection)
+
+        # Ensure the identity mirrors the configured fields of the profile
+        scope.database.patient.patient_profile.ensure_patient_identity_profile(
+            database=database,
+            collection=patient_collection,
+            patient_id=patient_identity_current[
+                scope.database.patients.PATIENT_IDENTITY_SEMANTIC_SET_ID
+            ],
+        )
 
 
 def _initialize_patient_identity_collection(*, database: pymongo.database.Database):
@@ -79,6 +115,9 @@ def _initialize_patient_identity_collection(*, database: pymongo.database.Databa
     # Ensure the expected index
     collection_utils.ensure_index(collection=patient_identity_collection)
 
+    # Ensure head revisions are marked for current revision reads
+    collection_utils.ensure_current_revision(collection=patient_identity_collection)
+
     # Ensure a sentinel document in that collection
     result = collection_utils.get_singleton(
         collection=patient_identity_collection,
@@ -107,6 +146,9 @@ def _initialize_provider_identity_collection(*, database: pymongo.database.Datab
     # Ensure the expected index
     collection_utils.ensure_index(collection=provider_identity_collection)
 
+    # Ensure head revisions are marked for current revision reads
+    collection_utils.ensure_current_revision(collection=provider_identity_collection)
+
     # Ensure a sentinel document in that collection
     result = collection_utils.get_singleton(
         collection=provider_identity_collection,
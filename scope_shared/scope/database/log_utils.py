@@ -0,0 +1,42 @@
+import datetime as _datetime
+import pymongo.collection
+from typing import List, Optional
+
+import scope.database.collection_utils
+import scope.database.date_utils as date_utils
+
+RECORDED_DATETIME_PROPERTY = "recordedDateTime"
+
+
+def _format_range_bound(datetime: Optional[_datetime.datetime]) -> Optional[str]:
+    if datetime is None:
+        return None
+
+    return date_utils.format_datetime_query_bound(datetime=datetime)
+
+
+def get_logs_recorded(
+    *,
+    collection: pymongo.collection.Collection,
+    document_type: str,
+    recorded_since: Optional[_datetime.datetime] = None,
+    recorded_until: Optional[_datetime.datetime] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> List[dict]:
+    """
+    Get list of log documents by their recordedDateTime.
+
+    - recorded_since is inclusive, recorded_until is exclusive, either may be None.
+    - Results are ordered by recordedDateTime, at most limit results are returned.
+    """
+
+    return scope.database.collection_utils.get_set_range(
+        collection=collection,
+        document_type=document_type,
+        range_field=RECORDED_DATETIME_PROPERTY,
+        range_start=_format_range_bound(recorded_since),
+        range_end=_format_range_bound(recorded_until),
+        limit=limit,
+        descending=descending,
+    )
@@ -1,7 +1,7 @@
 import datetime
 import pymongo.collection
 import pytz
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import scope.database.collection_utils
 import scope.database.patient.activity_schedules
@@ -40,15 +40,14 @@ def delete_activity(
                 collection=collection
             )
         )
-        for activity_schedule in existing_activity_schedules:
-            if activity_schedule.get(SEMANTIC_SET_ID) == set_id:
-                scope.database.patient.activity_schedules.delete_activity_schedule(
-                    collection=collection,
-                    set_id=activity_schedule[
-                        scope.database.patient.activity_schedules.SEMANTIC_SET_ID
-                    ],
-                    rev=activity_schedule.get("_rev"),
-                )
+        scope.database.patient.activity_schedules.delete_activity_schedules(
+            collection=collection,
+            activity_schedules=[
+                activity_schedule
+                for activity_schedule in existing_activity_schedules
+                if activity_schedule.get(SEMANTIC_SET_ID) == set_id
+            ],
+        )
 
     return result
 
@@ -56,6 +55,7 @@ def delete_activity(
 def get_activities(
     *,
     collection: pymongo.collection.Collection,
+    projection: Optional[Dict[str, bool]] = None,
 ) -> Optional[List[dict]]:
     """
     Get list of "activity" documents.
@@ -66,6 +66,7 @@ def get_activities(
     return scope.database.collection_utils.get_set(
         collection=collection,
         document_type=DOCUMENT_TYPE,
+        projection=projection,
     )
 
 
@@ -114,12 +115,14 @@ def put_activity(
     - Because ScheduledActivity documents may reference this activity, their snapshots must be updated.
     """
 
-    activity_set_put_result = scope.database.collection_utils.put_set_element(
-        collection=collection,
-        document_type=DOCUMENT_TYPE,
-        semantic_set_id=SEMANTIC_SET_ID,
-        set_id=set_id,
-        document=activity,
+    activity_set_put_result = (
+        scope.database.collection_utils.compare_and_swap_set_element(
+            collection=collection,
+            document_type=DOCUMENT_TYPE,
+            semantic_set_id=SEMANTIC_SET_ID,
+            set_id=set_id,
+            document=activity,
+        )
     )
 
     if activity_set_put_result.inserted_count == 1:
@@ -1,8 +1,10 @@
 import copy
-from typing import List, Optional
+import datetime
+from typing import Dict, List, Optional
 
 import pymongo.collection
 import scope.database.collection_utils
+import scope.database.log_utils
 import scope.database.patient.scheduled_activities
 
 DOCUMENT_TYPE = "activityLog"
@@ -44,6 +46,72 @@ def _maintain_scheduled_activity(
     return scheduled_activity_put_result
 
 
+def _maintain_scheduled_activities(
+    *,
+    collection: pymongo.collection.Collection,
+    activity_logs: List[dict],
+) -> Dict[str, scope.database.collection_utils.SetPutResult]:
+    """
+    Maintain the scheduled activity of each of multiple activity logs.
+
+    Scheduled activities are obtained and put in single round trips.
+    Results are keyed by the set id of each scheduled activity.
+    """
+
+    scheduled_activity_ids = []
+    for activity_log_current in activity_logs:
+        scheduled_activity_id = activity_log_current.get(
+            scope.database.patient.scheduled_activities.SEMANTIC_SET_ID, None
+        )
+        if (
+            scheduled_activity_id
+            and scheduled_activity_id not in scheduled_activity_ids
+        ):
+            scheduled_activity_ids.append(scheduled_activity_id)
+
+    scheduled_activity_documents = scope.database.collection_utils.get_set_elements(
+        collection=collection,
+        document_type=scope.database.patient.scheduled_activities.DOCUMENT_TYPE,
+        set_ids=scheduled_activity_ids,
+    )
+
+    put_documents = {}
+    for (
+        set_id_current,
+        scheduled_activity_current,
+    ) in scheduled_activity_documents.items():
+        scheduled_activity_current["completed"] = True
+        del scheduled_activity_current["_id"]
+
+        put_documents[set_id_current] = scheduled_activity_current
+
+    try:
+        put_results = scope.database.collection_utils.put_set_elements(
+            collection=collection,
+            document_type=scope.database.patient.scheduled_activities.DOCUMENT_TYPE,
+            semantic_set_id=scope.database.patient.scheduled_activities.SEMANTIC_SET_ID,
+            documents=put_documents,
+        )
+    except scope.database.collection_utils.SetElementsWriteException as e:
+        # A scheduled activity was modified since it was obtained.
+        # Maintain it and any following individually, as when posting a single log.
+        put_results = list(e.results)
+        for set_id_current in list(put_documents.keys())[e.failed_index :]:
+            put_result = _maintain_scheduled_activity(
+                collection=collection,
+                activity_log={
+                    scope.database.patient.scheduled_activities.SEMANTIC_SET_ID: set_id_current,
+                },
+            )
+            if put_result:
+                put_results.append(put_result)
+
+    return {
+        put_result_current.inserted_set_id: put_result_current
+        for put_result_current in put_results
+    }
+
+
 def get_activity_logs(
     *,
     collection: pymongo.collection.Collection,
@@ -60,6 +128,28 @@ def get_activity_logs(
     )
 
 
+def get_activity_logs_recorded(
+    *,
+    collection: pymongo.collection.Collection,
+    recorded_since: Optional[datetime.datetime] = None,
+    recorded_until: Optional[datetime.datetime] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> List[dict]:
+    """
+    Get list of "activityLog" documents by their recordedDateTime.
+    """
+
+    return scope.database.log_utils.get_logs_recorded(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        recorded_since=recorded_since,
+        recorded_until=recorded_until,
+        limit=limit,
+        descending=descending,
+    )
+
+
 def get_activity_log(
     *,
     collection: pymongo.collection.Collection,
@@ -115,6 +205,55 @@ def post_activity_log(
     )
 
 
+def post_activity_logs(
+    *,
+    collection: pymongo.collection.Collection,
+    activity_logs: List[dict],
+) -> List[scope.database.collection_utils.SetPostResult]:
+    """
+    Post multiple "activityLog" documents.
+
+    Equivalent to post_activity_log for each document,
+    but scheduled activities are maintained and logs are inserted in single round trips.
+    """
+
+    maintained_scheduled_activity_set_put_results = _maintain_scheduled_activities(
+        collection=collection,
+        activity_logs=activity_logs,
+    )
+
+    updated_activity_logs = []
+    for activity_log_current in activity_logs:
+        updated_activity_log = copy.deepcopy(activity_log_current)
+
+        maintained_scheduled_activity_set_put_result = (
+            maintained_scheduled_activity_set_put_results.get(
+                activity_log_current.get(
+                    scope.database.patient.scheduled_activities.SEMANTIC_SET_ID, None
+                ),
+                None,
+            )
+        )
+        if maintained_scheduled_activity_set_put_result:
+            if maintained_scheduled_activity_set_put_result.inserted_count == 1:
+                updated_activity_log.update(
+                    {
+                        DATA_SNAPSHOT_PROPERTY: {
+                            scope.database.patient.scheduled_activities.DOCUMENT_TYPE: maintained_scheduled_activity_set_put_result.document,
+                        },
+                    }
+                )
+
+        updated_activity_logs.append(updated_activity_log)
+
+    return scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        semantic_set_id=SEMANTIC_SET_ID,
+        documents=updated_activity_logs,
+    )
+
+
 def put_activity_log(
     *,
     collection: pymongo.collection.Collection,
@@ -125,7 +264,7 @@ def put_activity_log(
     Put "activityLog" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
@@ -102,6 +102,34 @@ def _calculate_scheduled_activities_to_delete(
     return pending_scheduled_items
 
 
+def _delete_pending_scheduled_activities(
+    collection: pymongo.collection.Collection,
+    activity_schedule_ids: List[str],
+):
+    """
+    Perform only the delete component of maintenance, for any number of ActivitySchedules.
+    """
+
+    maintenance_datetime = pytz.utc.localize(datetime.datetime.utcnow())
+
+    # Query only pending scheduled activities of these ActivitySchedules,
+    # maintenance needs only the scheduling fields, not the data snapshot
+    delete_items = scope.database.patient.scheduled_activities.get_pending_scheduled_activities(
+        collection=collection,
+        after_datetime=maintenance_datetime,
+        activity_schedule_ids=activity_schedule_ids,
+        projection={
+            scope.database.patient.scheduled_activities.DATA_SNAPSHOT_PROPERTY: False
+        },
+    )
+
+    # Delete the documents
+    scope.database.patient.scheduled_activities.delete_scheduled_activities(
+        collection=collection,
+        scheduled_activities=delete_items,
+    )
+
+
 def _maintain_pending_scheduled_activities(
     collection: pymongo.collection.Collection,
     activity_schedule_id: str,
@@ -113,28 +141,23 @@ def _maintain_pending_scheduled_activities(
     # that no existing scheduled activities need deleted as part of maintenance.
     # This would be the case in a post of a new activity.
     if delete_existing:
-        # Remove existing scheduled activities as necessary
-        existing_scheduled_activities = (
-            scope.database.patient.scheduled_activities.get_scheduled_activities(
-                collection=collection
-            )
+        # Remove existing scheduled activities as necessary,
+        # querying only those which are pending for this ActivitySchedule,
+        # which needs only the scheduling fields, not the data snapshot
+        delete_items = scope.database.patient.scheduled_activities.get_pending_scheduled_activities(
+            collection=collection,
+            after_datetime=maintenance_datetime,
+            activity_schedule_ids=[activity_schedule_id],
+            projection={
+                scope.database.patient.scheduled_activities.DATA_SNAPSHOT_PROPERTY: False
+            },
         )
-        if existing_scheduled_activities:
-            delete_items = _calculate_scheduled_activities_to_delete(
-                scheduled_activities=existing_scheduled_activities,
-                activity_schedule_id=activity_schedule_id,
-                maintenance_datetime=maintenance_datetime,
-            )
-
+        if delete_items:
             # Mark all of them as deleted
-            for delete_item_current in delete_items:
-                scope.database.patient.scheduled_activities.delete_scheduled_activity(
-                    collection=collection,
-                    set_id=delete_item_current[
-                        scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
-                    ],
-                    rev=delete_item_current.get("_rev"),
-                )
+            scope.database.patient.scheduled_activities.delete_scheduled_activities(
+                collection=collection,
+                scheduled_activities=delete_items,
+            )
 
     # Create new scheduled activities as necessary
     create_items = _calculate_scheduled_activities_to_create(
@@ -173,9 +196,8 @@ def _maintain_pending_scheduled_activities(
             values=[value] if value else [],
         )
 
+        # Items are copied when posted, so they can share the snapshot
         for create_item_current in create_items:
-            create_item_current = copy.deepcopy(create_item_current)
-
             create_item_current.update(
                 {
                     scope.database.patient.scheduled_activities.DATA_SNAPSHOT_PROPERTY: data_snapshot
@@ -186,9 +208,10 @@ def _maintain_pending_scheduled_activities(
                 schema=scope.schema.scheduled_activity_schema,
             )
 
-            scope.database.patient.scheduled_activities.post_scheduled_activity(
-                collection=collection, scheduled_activity=create_item_current
-            )
+        scope.database.patient.scheduled_activities.post_scheduled_activities(
+            collection=collection,
+            scheduled_activities=create_items,
+        )
 
 
 def delete_activity_schedule(
@@ -211,30 +234,48 @@ def delete_activity_schedule(
     )
 
     if result.inserted_count == 1:
-        existing_scheduled_activities = (
-            scope.database.patient.scheduled_activities.get_scheduled_activities(
-                collection=collection
-            )
+        _delete_pending_scheduled_activities(
+            collection=collection,
+            activity_schedule_ids=[set_id],
         )
 
-        # Perform only the delete component of maintenance
-        delete_items = _calculate_scheduled_activities_to_delete(
-            scheduled_activities=existing_scheduled_activities,
-            activity_schedule_id=set_id,
-            maintenance_datetime=pytz.utc.localize(datetime.datetime.utcnow()),
-        )
+    return result
 
-        # Delete the documents
-        for delete_item_current in delete_items:
-            scope.database.patient.scheduled_activities.delete_scheduled_activity(
-                collection=collection,
-                set_id=delete_item_current[
-                    scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
-                ],
-                rev=delete_item_current.get("_rev"),
+
+def delete_activity_schedules(
+    *,
+    collection: pymongo.collection.Collection,
+    activity_schedules: List[dict],
+) -> List[scope.database.collection_utils.SetPutResult]:
+    """
+    Delete multiple "activity-schedule" documents.
+
+    - Any pending ScheduledActivity documents must also be deleted.
+    """
+
+    results = scope.database.collection_utils.delete_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        set_id_revs={
+            activity_schedule_current[SEMANTIC_SET_ID]: activity_schedule_current.get(
+                "_rev"
             )
+            for activity_schedule_current in activity_schedules
+        },
+    )
 
-    return result
+    deleted_activity_schedule_ids = [
+        result_current.inserted_set_id
+        for result_current in results
+        if result_current.inserted_count == 1
+    ]
+    if deleted_activity_schedule_ids:
+        _delete_pending_scheduled_activities(
+            collection=collection,
+            activity_schedule_ids=deleted_activity_schedule_ids,
+        )
+
+    return results
 
 
 def get_activity_schedules(
@@ -309,12 +350,14 @@ def put_activity_schedule(
     Put "activity-schedule" document.
     """
 
-    activity_schedule_set_put_result = scope.database.collection_utils.put_set_element(
-        collection=collection,
-        document_type=DOCUMENT_TYPE,
-        semantic_set_id=SEMANTIC_SET_ID,
-        set_id=set_id,
-        document=activity_schedule,
+    activity_schedule_set_put_result = (
+        scope.database.collection_utils.compare_and_swap_set_element(
+            collection=collection,
+            document_type=DOCUMENT_TYPE,
+            semantic_set_id=SEMANTIC_SET_ID,
+            set_id=set_id,
+            document=activity_schedule,
+        )
     )
 
     #
@@ -1,7 +1,9 @@
-from typing import List, Optional
+import datetime
+from typing import Dict, List, Optional
 
 import pymongo.collection
 import scope.database.collection_utils
+import scope.database.log_utils
 import scope.database.patient.scheduled_assessments
 
 DOCUMENT_TYPE = "assessmentLog"
@@ -42,9 +44,67 @@ def _maintain_scheduled_assessment(
     return scheduled_assessment_put_result
 
 
+def _maintain_scheduled_assessments(
+    *,
+    collection: pymongo.collection.Collection,
+    assessment_logs: List[dict],
+) -> None:
+    """
+    Maintain the scheduled assessment of each of multiple assessment logs.
+
+    Scheduled assessments are obtained and put in single round trips.
+    """
+
+    scheduled_assessment_ids = []
+    for assessment_log_current in assessment_logs:
+        scheduled_assessment_id = assessment_log_current.get(
+            scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID, None
+        )
+        if (
+            scheduled_assessment_id
+            and scheduled_assessment_id not in scheduled_assessment_ids
+        ):
+            scheduled_assessment_ids.append(scheduled_assessment_id)
+
+    scheduled_assessment_documents = scope.database.collection_utils.get_set_elements(
+        collection=collection,
+        document_type=scope.database.patient.scheduled_assessments.DOCUMENT_TYPE,
+        set_ids=scheduled_assessment_ids,
+    )
+
+    put_documents = {}
+    for (
+        set_id_current,
+        scheduled_assessment_current,
+    ) in scheduled_assessment_documents.items():
+        scheduled_assessment_current["completed"] = True
+        del scheduled_assessment_current["_id"]
+
+        put_documents[set_id_current] = scheduled_assessment_current
+
+    try:
+        scope.database.collection_utils.put_set_elements(
+            collection=collection,
+            document_type=scope.database.patient.scheduled_assessments.DOCUMENT_TYPE,
+            semantic_set_id=scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID,
+            documents=put_documents,
+        )
+    except scope.database.collection_utils.SetElementsWriteException as e:
+        # A scheduled assessment was modified since it was obtained.
+        # Maintain it and any following individually, as when posting a single log.
+        for set_id_current in list(put_documents.keys())[e.failed_index :]:
+            _maintain_scheduled_assessment(
+                collection=collection,
+                assessment_log={
+                    scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID: set_id_current,
+                },
+            )
+
+
 def get_assessment_logs(
     *,
     collection: pymongo.collection.Collection,
+    projection: Optional[Dict[str, bool]] = None,
 ) -> Optional[List[dict]]:
     """
     Get list of "assessmentLog" documents.
@@ -55,6 +115,29 @@ def get_assessment_logs(
     return scope.database.collection_utils.get_set(
         collection=collection,
         document_type=DOCUMENT_TYPE,
+        projection=projection,
+    )
+
+
+def get_assessment_logs_recorded(
+    *,
+    collection: pymongo.collection.Collection,
+    recorded_since: Optional[datetime.datetime] = None,
+    recorded_until: Optional[datetime.datetime] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> List[dict]:
+    """
+    Get list of "assessmentLog" documents by their recordedDateTime.
+    """
+
+    return scope.database.log_utils.get_logs_recorded(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        recorded_since=recorded_since,
+        recorded_until=recorded_until,
+        limit=limit,
+        descending=descending,
     )
 
 
@@ -99,6 +182,46 @@ def post_assessment_log(
     return assessment_log_set_post_result
 
 
+def post_assessment_logs(
+    *,
+    collection: pymongo.collection.Collection,
+    assessment_logs: List[dict],
+) -> List[scope.database.collection_utils.SetPostResult]:
+    """
+    Post multiple "assessmentLog" documents.
+
+    Equivalent to post_assessment_log for each document,
+    but logs are inserted and scheduled assessments maintained in single round trips.
+    """
+
+    try:
+        assessment_log_set_post_results = (
+            scope.database.collection_utils.post_set_elements(
+                collection=collection,
+                document_type=DOCUMENT_TYPE,
+                semantic_set_id=SEMANTIC_SET_ID,
+                documents=assessment_logs,
+            )
+        )
+    except scope.database.collection_utils.SetElementsWriteException as e:
+        # Logs that were inserted still complete their scheduled assessments
+        _maintain_scheduled_assessments(
+            collection=collection,
+            assessment_logs=[result_current.document for result_current in e.results],
+        )
+        raise
+
+    _maintain_scheduled_assessments(
+        collection=collection,
+        assessment_logs=[
+            result_current.document
+            for result_current in assessment_log_set_post_results
+        ],
+    )
+
+    return assessment_log_set_post_results
+
+
 def put_assessment_log(
     *,
     collection: pymongo.collection.Collection,
@@ -109,7 +232,7 @@ def put_assessment_log(
     Put "assessmentLog" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
@@ -88,28 +88,21 @@ def _maintain_pending_scheduled_assessments(
     assessment: dict,
     maintenance_datetime: datetime.datetime,
 ):
-    # Remove existing scheduled assessments as necessary
-    existing_scheduled_assessments = (
-        scope.database.patient.scheduled_assessments.get_scheduled_assessments(
-            collection=collection
+    # Remove existing scheduled assessments as necessary,
+    # querying only those which are pending for this assessment
+    delete_items = (
+        scope.database.patient.scheduled_assessments.get_pending_scheduled_assessments(
+            collection=collection,
+            after_datetime=maintenance_datetime,
+            assessment_ids=[assessment_id],
         )
     )
-    if existing_scheduled_assessments:
-        delete_items = _calculate_scheduled_assessments_to_delete(
-            assessment_id=assessment_id,
-            scheduled_assessments=existing_scheduled_assessments,
-            maintenance_datetime=maintenance_datetime,
+    if delete_items:
+        scope.database.patient.scheduled_assessments.delete_scheduled_assessments(
+            collection=collection,
+            scheduled_assessments=delete_items,
         )
 
-        for delete_item_current in delete_items:
-            scope.database.patient.scheduled_assessments.delete_scheduled_assessment(
-                collection=collection,
-                scheduled_assessment=delete_item_current,
-                set_id=delete_item_current[
-                    scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID
-                ],
-            )
-
     # Create new scheduled assessments as necessary
     create_items = _calculate_scheduled_assessments_to_create(
         assessment_id=assessment_id,
@@ -123,10 +116,10 @@ def _maintain_pending_scheduled_assessments(
                 schema=scope.schema.scheduled_assessment_schema,
             )
 
-            scope.database.patient.scheduled_assessments.post_scheduled_assessment(
-                collection=collection,
-                scheduled_assessment=create_item_current,
-            )
+        scope.database.patient.scheduled_assessments.post_scheduled_assessments(
+            collection=collection,
+            scheduled_assessments=create_items,
+        )
 
 
 def get_assessments(
@@ -178,12 +171,14 @@ def put_assessment(
     )
 
     # Put the document
-    assessment_set_put_result = scope.database.collection_utils.put_set_element(
-        collection=collection,
-        document_type=DOCUMENT_TYPE,
-        semantic_set_id=SEMANTIC_SET_ID,
-        set_id=set_id,
-        document=assessment,
+    assessment_set_put_result = (
+        scope.database.collection_utils.compare_and_swap_set_element(
+            collection=collection,
+            document_type=DOCUMENT_TYPE,
+            semantic_set_id=SEMANTIC_SET_ID,
+            set_id=set_id,
+            document=assessment,
+        )
     )
 
     #
@@ -66,7 +66,7 @@ def put_case_review(
     Put "caseReview" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         set_id=set_id,
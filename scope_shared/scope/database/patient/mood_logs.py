@@ -1,7 +1,9 @@
+import datetime
 from typing import List, Optional
 
 import pymongo.collection
 import scope.database.collection_utils
+import scope.database.log_utils
 
 DOCUMENT_TYPE = "moodLog"
 SEMANTIC_SET_ID = "moodLogId"
@@ -23,6 +25,28 @@ def get_mood_logs(
     )
 
 
+def get_mood_logs_recorded(
+    *,
+    collection: pymongo.collection.Collection,
+    recorded_since: Optional[datetime.datetime] = None,
+    recorded_until: Optional[datetime.datetime] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+) -> List[dict]:
+    """
+    Get list of "moodLog" documents by their recordedDateTime.
+    """
+
+    return scope.database.log_utils.get_logs_recorded(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        recorded_since=recorded_since,
+        recorded_until=recorded_until,
+        limit=limit,
+        descending=descending,
+    )
+
+
 def get_mood_log(
     *,
     collection: pymongo.collection.Collection,
@@ -56,6 +80,23 @@ def post_mood_log(
     )
 
 
+def post_mood_logs(
+    *,
+    collection: pymongo.collection.Collection,
+    mood_logs: List[dict],
+) -> List[scope.database.collection_utils.SetPostResult]:
+    """
+    Post multiple "moodLog" documents in a single round trip.
+    """
+
+    return scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        semantic_set_id=SEMANTIC_SET_ID,
+        documents=mood_logs,
+    )
+
+
 def put_mood_log(
     *,
     collection: pymongo.collection.Collection,
@@ -66,7 +107,7 @@ def put_mood_log(
     Put "moodLog" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
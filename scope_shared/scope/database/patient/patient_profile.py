@@ -1,5 +1,5 @@
 import copy
-from typing import Optional
+from typing import Dict, List, Optional
 
 import pymongo.database
 import scope.database.collection_utils
@@ -9,6 +9,33 @@ import scope.schema_utils as schema_utils
 
 DOCUMENT_TYPE = "profile"
 
+# Profile fields mirrored into the patient identity,
+# so a list of patients can be obtained from patient identities alone.
+# Identifying fields of the profile are always mirrored.
+IDENTITY_PROFILE_FIELDS: List[str] = [
+    "clinicCode",
+    "depressionTreatmentStatus",
+    "discussionFlag",
+    "enrollmentDate",
+    "followupSchedule",
+    "primaryCareManager",
+    "site",
+]
+_IDENTITY_PROFILE_REQUIRED_FIELDS = ["_id", "_type", "_rev", "name", "MRN"]
+_identity_profile_fields: List[str] = IDENTITY_PROFILE_FIELDS
+
+
+def configure_identity_profile_fields(*, fields: List[str]) -> None:
+    """
+    Configure which profile fields are mirrored into the patient identity.
+
+    An identity is updated to the configured fields when its profile is next put,
+    or by ensure_patient_identity_profile.
+    """
+
+    global _identity_profile_fields
+    _identity_profile_fields = list(fields)
+
 
 def get_patient_profile(
     *,
@@ -36,7 +63,7 @@ def put_patient_profile(
     )
 
     # Put the document
-    result = scope.database.collection_utils.put_singleton(
+    result = scope.database.collection_utils.compare_and_swap_singleton(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         document=patient_profile,
@@ -49,23 +76,86 @@ def put_patient_profile(
         # If no patient identity exists yet,
         # (e.g., if this profile is put in the midst of patient creation),
         # then a patient identity will not yet exist to be maintained.
-        patient_identity = scope.database.patients.get_patient_identity(
+        _maintain_patient_identity(
             database=database,
             patient_id=patient_id,
+            patient_profile=result.document,
         )
 
-        if patient_identity:
-            updated_identity = copy.deepcopy(patient_identity)
-            updated_identity["MRN"] = result.document["MRN"]
-            updated_identity["name"] = result.document["name"]
+    return result
+
+
+def _maintain_patient_identity(
+    *,
+    database: pymongo.database.Database,
+    patient_id: str,
+    patient_profile: dict,
+) -> None:
+    """
+    Maintain a patient identity, if it exists, to match its profile.
+    """
 
-            if patient_identity != updated_identity:
-                del updated_identity["_id"]
+    patient_identity = scope.database.patients.get_patient_identity(
+        database=database,
+        patient_id=patient_id,
+    )
 
-                scope.database.patients.put_patient_identity(
-                    database=database,
-                    patient_id=patient_id,
-                    patient_identity=updated_identity,
-                )
+    if patient_identity:
+        updated_identity = copy.deepcopy(patient_identity)
+        updated_identity["MRN"] = patient_profile["MRN"]
+        updated_identity["name"] = patient_profile["name"]
+        updated_identity["profile"] = identity_profile(patient_profile=patient_profile)
 
-    return result
+        if patient_identity != updated_identity:
+            del updated_identity["_id"]
+
+            scope.database.patients.put_patient_identity(
+                database=database,
+                patient_id=patient_id,
+                patient_identity=updated_identity,
+            )
+
+
+def ensure_patient_identity_profile(
+    *,
+    database: pymongo.database.Database,
+    collection: pymongo.collection.Collection,
+    patient_id: str,
+) -> None:
+    """
+    Ensure a patient identity mirrors the configured fields of its profile.
+
+    This function should be idempotent, it may be called many times.
+    """
+
+    patient_profile = get_patient_profile(collection=collection)
+    if patient_profile:
+        _maintain_patient_identity(
+            database=database,
+            patient_id=patient_id,
+            patient_profile=patient_profile,
+        )
+
+
+def identity_profile_projection() -> Dict[str, bool]:
+    """
+    Obtain a projection of a profile to the fields mirrored into the patient identity.
+    """
+
+    return {
+        key_current: True
+        for key_current in _IDENTITY_PROFILE_REQUIRED_FIELDS + _identity_profile_fields
+    }
+
+
+def identity_profile(*, patient_profile: dict) -> dict:
+    """
+    Obtain the fields of a profile that are mirrored into the patient identity.
+    """
+
+    return {
+        key_current: copy.deepcopy(value_current)
+        for key_current, value_current in patient_profile.items()
+        if key_current in _IDENTITY_PROFILE_REQUIRED_FIELDS
+        or key_current in _identity_profile_fields
+    }
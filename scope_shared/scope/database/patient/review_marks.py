@@ -64,7 +64,7 @@ def put_review_mark(
     Put "reviewMark" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
@@ -32,7 +32,7 @@ def put_safety_plan(
     )
 
     # Put the document
-    return scope.database.collection_utils.put_singleton(
+    return scope.database.collection_utils.compare_and_swap_singleton(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         document=safety_plan,
@@ -1,6 +1,7 @@
 import copy
 import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
+import pymongo
 import pymongo.collection
 
 import scope.database.collection_utils
@@ -14,6 +15,21 @@ DOCUMENT_TYPE = "scheduledActivity"
 SEMANTIC_SET_ID = "scheduledActivityId"
 DATA_SNAPSHOT_PROPERTY = "dataSnapshot"
 
+SECONDARY_INDEXES = [
+    # Pending scheduled activities of an ActivitySchedule.
+    # Property is activity_schedules.SEMANTIC_SET_ID,
+    # which cannot be referenced during import.
+    scope.database.collection_utils.SecondaryIndex(
+        name="scheduledActivity_pending",
+        document_type=DOCUMENT_TYPE,
+        keys=[
+            ("activityScheduleId", pymongo.ASCENDING),
+            ("dueDateTime", pymongo.ASCENDING),
+        ],
+        partial_filter={"completed": False},
+    ),
+]
+
 
 def build_data_snapshot(
     *,
@@ -118,9 +134,31 @@ def delete_scheduled_activity(
     )
 
 
+def delete_scheduled_activities(
+    *,
+    collection: pymongo.collection.Collection,
+    scheduled_activities: List[dict],
+) -> List[scope.database.collection_utils.SetPutResult]:
+    """
+    Delete multiple "scheduled-activity" documents.
+    """
+
+    return scope.database.collection_utils.delete_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        set_id_revs={
+            scheduled_activity_current[SEMANTIC_SET_ID]: scheduled_activity_current.get(
+                "_rev"
+            )
+            for scheduled_activity_current in scheduled_activities
+        },
+    )
+
+
 def get_scheduled_activities(
     *,
     collection: pymongo.collection.Collection,
+    projection: Optional[Dict[str, bool]] = None,
 ) -> Optional[List[dict]]:
     """
     Get list of "scheduledActivity" documents.
@@ -131,11 +169,46 @@ def get_scheduled_activities(
     scheduled_activities = scope.database.collection_utils.get_set(
         collection=collection,
         document_type=DOCUMENT_TYPE,
+        projection=projection,
     )
 
     return scheduled_activities
 
 
+def get_pending_scheduled_activities(
+    *,
+    collection: pymongo.collection.Collection,
+    after_datetime: datetime.datetime,
+    activity_schedule_ids: Optional[List[str]] = None,
+    projection: Optional[Dict[str, bool]] = None,
+) -> List[dict]:
+    """
+    Get list of pending "scheduledActivity" documents.
+
+    Optionally limited to those belonging to any of activity_schedule_ids.
+    """
+
+    match = scheduled_item_utils.pending_scheduled_items_match(
+        after_datetime=after_datetime,
+    )
+    if activity_schedule_ids is not None:
+        match[scope.database.patient.activity_schedules.SEMANTIC_SET_ID] = {
+            "$in": list(activity_schedule_ids)
+        }
+
+    scheduled_activities = scope.database.collection_utils.get_set_matching(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        match=match,
+        projection=projection,
+    )
+
+    return scheduled_item_utils.pending_scheduled_items(
+        scheduled_items=scheduled_activities,
+        after_datetime=after_datetime,
+    )
+
+
 def get_scheduled_activity(
     *,
     collection: pymongo.collection.Collection,
@@ -159,12 +232,9 @@ def maintain_scheduled_activities_data_snapshot(
     collection: pymongo.collection.Collection,
     maintenance_datetime: datetime.datetime,
 ) -> List[scope.database.collection_utils.SetPutResult]:
-    # Compute pending scheduled activities
-    scheduled_activities = get_scheduled_activities(collection=collection)
-
-    # Filter to only maintain those which are pending
-    pending_scheduled_activities = scheduled_item_utils.pending_scheduled_items(
-        scheduled_items=scheduled_activities,
+    # Obtain only those which are pending
+    pending_scheduled_activities = get_pending_scheduled_activities(
+        collection=collection,
         after_datetime=maintenance_datetime,
     )
 
@@ -245,6 +315,23 @@ def post_scheduled_activity(
     )
 
 
+def post_scheduled_activities(
+    *,
+    collection: pymongo.collection.Collection,
+    scheduled_activities: List[dict],
+) -> List[scope.database.collection_utils.SetPostResult]:
+    """
+    Post multiple "scheduleActivity" documents in a single round trip.
+    """
+
+    return scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        semantic_set_id=SEMANTIC_SET_ID,
+        documents=scheduled_activities,
+    )
+
+
 def put_scheduled_activity(
     *,
     collection: pymongo.collection.Collection,
@@ -255,7 +342,7 @@ def put_scheduled_activity(
     Put "scheduleActivity" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
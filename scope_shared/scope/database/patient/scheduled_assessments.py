@@ -1,9 +1,12 @@
 import copy
-from typing import List, Optional
+import datetime
+from typing import Dict, List, Optional
 
+import pymongo
 import pymongo.collection
 import scope.database.collection_utils
 import scope.database.patient.assessments
+import scope.database.scheduled_item_utils as scheduled_item_utils
 import scope.enums
 import scope.schema
 import scope.schema_utils as schema_utils
@@ -11,6 +14,21 @@ import scope.schema_utils as schema_utils
 DOCUMENT_TYPE = "scheduledAssessment"
 SEMANTIC_SET_ID = "scheduledAssessmentId"
 
+SECONDARY_INDEXES = [
+    # Pending scheduled assessments of an Assessment.
+    # Property is assessments.SEMANTIC_SET_ID,
+    # which cannot be referenced during import.
+    scope.database.collection_utils.SecondaryIndex(
+        name="scheduledAssessment_pending",
+        document_type=DOCUMENT_TYPE,
+        keys=[
+            ("assessmentId", pymongo.ASCENDING),
+            ("dueDateTime", pymongo.ASCENDING),
+        ],
+        partial_filter={"completed": False},
+    ),
+]
+
 
 def get_scheduled_assessments(
     *,
@@ -58,6 +76,74 @@ def delete_scheduled_assessment(
     )
 
 
+def delete_scheduled_assessments(
+    *,
+    collection: pymongo.collection.Collection,
+    scheduled_assessments: List[dict],
+) -> List[scope.database.collection_utils.SetPutResult]:
+    """
+    Delete multiple "scheduledAssessment" documents in a single round trip.
+    """
+
+    # put_set_elements will copy each document
+    delete_documents = {}
+    for scheduled_assessment_current in scheduled_assessments:
+        scheduled_assessment_current = dict(scheduled_assessment_current)
+
+        scheduled_assessment_current["_deleted"] = True
+        del scheduled_assessment_current["_id"]
+
+        schema_utils.assert_schema(
+            data=scheduled_assessment_current,
+            schema=scope.schema.scheduled_assessment_schema,
+        )
+
+        delete_documents[
+            scheduled_assessment_current[SEMANTIC_SET_ID]
+        ] = scheduled_assessment_current
+
+    return scope.database.collection_utils.put_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        semantic_set_id=SEMANTIC_SET_ID,
+        documents=delete_documents,
+    )
+
+
+def get_pending_scheduled_assessments(
+    *,
+    collection: pymongo.collection.Collection,
+    after_datetime: datetime.datetime,
+    assessment_ids: Optional[List[str]] = None,
+    projection: Optional[Dict[str, bool]] = None,
+) -> List[dict]:
+    """
+    Get list of pending "scheduledAssessment" documents.
+
+    Optionally limited to those belonging to any of assessment_ids.
+    """
+
+    match = scheduled_item_utils.pending_scheduled_items_match(
+        after_datetime=after_datetime,
+    )
+    if assessment_ids is not None:
+        match[scope.database.patient.assessments.SEMANTIC_SET_ID] = {
+            "$in": list(assessment_ids)
+        }
+
+    scheduled_assessments = scope.database.collection_utils.get_set_matching(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        match=match,
+        projection=projection,
+    )
+
+    return scheduled_item_utils.pending_scheduled_items(
+        scheduled_items=scheduled_assessments,
+        after_datetime=after_datetime,
+    )
+
+
 def get_scheduled_assessment(
     *,
     collection: pymongo.collection.Collection,
@@ -97,6 +183,23 @@ def post_scheduled_assessment(
     )
 
 
+def post_scheduled_assessments(
+    *,
+    collection: pymongo.collection.Collection,
+    scheduled_assessments: List[dict],
+) -> List[scope.database.collection_utils.SetPostResult]:
+    """
+    Post multiple "scheduleAssessment" documents in a single round trip.
+    """
+
+    return scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type=DOCUMENT_TYPE,
+        semantic_set_id=SEMANTIC_SET_ID,
+        documents=scheduled_assessments,
+    )
+
+
 def put_scheduled_assessment(
     *,
     collection: pymongo.collection.Collection,
@@ -107,7 +210,7 @@ def put_scheduled_assessment(
     Put "scheduleAssessment" document.
     """
 
-    return scope.database.collection_utils.put_set_element(
+    return scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
@@ -111,7 +111,7 @@ def put_value(
     - Because ScheduledActivity documents may reference this activity, their snapshots must be updated.
     """
 
-    value_set_put_result = scope.database.collection_utils.put_set_element(
+    value_set_put_result = scope.database.collection_utils.compare_and_swap_set_element(
         collection=collection,
         document_type=DOCUMENT_TYPE,
         semantic_set_id=SEMANTIC_SET_ID,
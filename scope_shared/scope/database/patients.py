@@ -5,11 +5,14 @@ from typing import List, Optional
 
 import scope.database.date_utils as date_utils
 import scope.database.collection_utils
+import scope.database.identity_directory
 import scope.database.patient.assessments
 import scope.database.patient.clinical_history
 import scope.database.patient.patient_profile
 import scope.database.patient.review_marks
 import scope.database.patient.safety_plan
+import scope.database.patient.scheduled_activities
+import scope.database.patient.scheduled_assessments
 import scope.database.patient.values_inventory
 import scope.enums
 import scope.schema
@@ -25,6 +28,31 @@ def _patient_collection_name(*, patient_id: str) -> str:
     return "patient_{}".format(patient_id)
 
 
+def patient_id_from_collection_name(*, collection_name: str) -> Optional[str]:
+    """
+    Obtain the patient_id of a patient collection, or None if not a patient collection.
+    """
+
+    prefix = _patient_collection_name(patient_id="")
+    if not collection_name.startswith(prefix) or collection_name == prefix:
+        return None
+
+    return collection_name[len(prefix) :]
+
+
+def patient_collection_secondary_indexes() -> List[
+    scope.database.collection_utils.SecondaryIndex
+]:
+    """
+    Secondary indexes of a patient collection, as declared by each document type.
+    """
+
+    return (
+        scope.database.patient.scheduled_activities.SECONDARY_INDEXES
+        + scope.database.patient.scheduled_assessments.SECONDARY_INDEXES
+    )
+
+
 def create_patient(
     *,
     database: pymongo.database.Database,
@@ -121,6 +149,8 @@ def delete_patient(
         exists = True
         database.drop_collection(name_or_collection=patient_collection_name)
 
+    scope.database.identity_directory.invalidate()
+
     return exists
 
 
@@ -150,7 +180,10 @@ def ensure_patient_collection(
         )
 
     # Ensure the collection has the desired index
-    scope.database.collection_utils.ensure_index(collection=patient_collection)
+    scope.database.collection_utils.ensure_index(
+        collection=patient_collection,
+        secondary_indexes=patient_collection_secondary_indexes(),
+    )
 
     return patient_collection
 
@@ -305,6 +338,20 @@ def ensure_patient_identity(
             "MRN": patient_mrn,
             "collection": patient_collection.name,
         }
+
+        # Mirror the profile, which was already ensured
+        patient_profile_document = (
+            scope.database.patient.patient_profile.get_patient_profile(
+                collection=patient_collection,
+            )
+        )
+        if patient_profile_document:
+            patient_identity_document[
+                "profile"
+            ] = scope.database.patient.patient_profile.identity_profile(
+                patient_profile=patient_profile_document,
+            )
+
         result = put_patient_identity(
             database=database,
             patient_id=patient_id,
@@ -354,7 +401,7 @@ def put_patient_identity(
     # Put the document
     patient_identity_collection = database.get_collection(PATIENT_IDENTITY_COLLECTION)
 
-    return scope.database.collection_utils.put_set_element(
+    result = scope.database.collection_utils.put_set_element(
         collection=patient_identity_collection,
         document_type=PATIENT_IDENTITY_DOCUMENT_TYPE,
         semantic_set_id=PATIENT_IDENTITY_SEMANTIC_SET_ID,
@@ -362,6 +409,10 @@ def put_patient_identity(
         document=patient_identity,
     )
 
+    scope.database.identity_directory.invalidate()
+
+    return result
+
 
 def get_patient_identities(
     *,
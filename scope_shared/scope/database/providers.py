@@ -3,6 +3,7 @@ import scope.database.collection_utils as collection_utils
 from typing import List, Optional
 
 import scope.database.collection_utils
+import scope.database.identity_directory
 
 PROVIDER_IDENTITY_COLLECTION = "providers"
 
@@ -51,6 +52,8 @@ def create_provider(
     )
     provider_identity_document = result.document
 
+    scope.database.identity_directory.invalidate()
+
     return provider_identity_document
 
 
@@ -85,6 +88,8 @@ def delete_provider(
         set_id=provider_id,
     )
 
+    scope.database.identity_directory.invalidate()
+
     return True
 
 
@@ -118,7 +123,7 @@ def put_provider_identity(
 
     provider_identity_collection = database.get_collection(PROVIDER_IDENTITY_COLLECTION)
 
-    return scope.database.collection_utils.put_set_element(
+    result = scope.database.collection_utils.put_set_element(
         collection=provider_identity_collection,
         document_type=PROVIDER_IDENTITY_DOCUMENT_TYPE,
         semantic_set_id=PROVIDER_IDENTITY_SEMANTIC_SET_ID,
@@ -126,6 +131,10 @@ def put_provider_identity(
         document=provider_identity,
     )
 
+    scope.database.identity_directory.invalidate()
+
+    return result
+
 
 def get_provider_identities(
     *,
@@ -2,7 +2,7 @@ import datetime as _datetime
 import dateutil.relativedelta
 import dateutil.rrule
 import pytz
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import scope.database.date_utils as date_utils
 import scope.enums
@@ -346,7 +346,7 @@ def create_scheduled_items(
 
 def pending_scheduled_items(
     *,
-    scheduled_items: List[dict],
+    scheduled_items: Iterable[dict],
     after_datetime: _datetime.datetime,
 ) -> List[dict]:
     """
@@ -376,3 +376,22 @@ def pending_scheduled_items(
             result_pending_scheduled_items.append(scheduled_item_current)
 
     return result_pending_scheduled_items
+
+
+def pending_scheduled_items_match(
+    *,
+    after_datetime: _datetime.datetime,
+) -> dict:
+    """
+    Query filter for candidate pending items, intended to be served by a partial index.
+
+    Datetimes in the query apply at the granularity of a second,
+    so results must still be confirmed with pending_scheduled_items.
+    """
+
+    return {
+        "completed": False,
+        "dueDateTime": {
+            "$gt": date_utils.format_datetime_query_bound(datetime=after_datetime),
+        },
+    }
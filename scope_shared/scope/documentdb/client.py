@@ -2,6 +2,7 @@ import aws_infrastructure.tasks.ssh
 import contextlib
 import pymongo
 import pymongo.database
+from typing import Optional
 
 
 def _documentdb_client(
@@ -17,6 +18,7 @@ def _documentdb_client(
     tls_insecure: bool,
     user: str,
     password: str,
+    max_pool_size: Optional[int] = None,
 ) -> pymongo.MongoClient:
     # Check if we are responsible for an SSH connection and a port forward
     if instance_ssh_config is not None:
@@ -57,6 +59,11 @@ def _documentdb_client(
         # Rely on provided parameters.
         pass
 
+    # Maximum connections, if not the PyMongo default
+    pool_options = {}
+    if max_pool_size is not None:
+        pool_options["maxPoolSize"] = max_pool_size
+
     return pymongo.MongoClient(
         # Synchronously initiate the connection
         connect=True,
@@ -73,6 +80,7 @@ def _documentdb_client(
         # Connect as admin
         username=user,
         password=password,
+        **pool_options,
     )
 
 
@@ -120,6 +128,8 @@ def documentdb_client_database(
     database_name: str,
     user: str,
     password: str,
+    # Maximum connections, if not the PyMongo default
+    max_pool_size: Optional[int] = None,
 ) -> pymongo.database.Database:
     """
     Obtain a DocumentDB client, authenticated as the user associated with a specific database.
@@ -134,6 +144,7 @@ def documentdb_client_database(
         password=password,
         direct_connection=direct_connection,
         tls_insecure=tls_insecure,
+        max_pool_size=max_pool_size,
     )
 
     return client.get_database(database_name)
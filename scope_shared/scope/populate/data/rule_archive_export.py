@@ -2,6 +2,7 @@ from pathlib import Path
 import pymongo.database
 from typing import Dict, List, Optional
 
+import scope.database.collection_utils
 import scope.populate.data.archive
 from scope.populate.types import PopulateAction, PopulateContext, PopulateRule
 
@@ -98,6 +99,11 @@ def _archive_export(
 
         # Each document is stored as a file in that directory
         for document_current in collection_current.find():
+            # The "_current" marker is a storage detail, restore will recreate it
+            document_current.pop(
+                scope.database.collection_utils.CURRENT_REVISION_FIELD, None
+            )
+
             entries[
                 Path(
                     collection_name_current,
@@ -3,6 +3,7 @@ from pathlib import Path
 import pymongo.database
 from typing import List, Optional
 
+import scope.database.collection_utils
 import scope.database.patients
 import scope.populate.data.archive
 from scope.populate.types import PopulateAction, PopulateContext, PopulateRule
@@ -211,3 +212,6 @@ def _collection_restore(
     )
     if not result.acknowledged:
         raise RuntimeError("Failed to restore collection: {}".format(collection.name))
+
+    # Restored documents do not include the "_current" marker
+    scope.database.collection_utils.ensure_current_revision(collection=collection)
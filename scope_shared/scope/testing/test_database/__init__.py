@@ -10,6 +10,7 @@ from scope.testing.test_database.test_assessment_maintains_scheduled_assessments
 from scope.testing.test_database.test_collection_utils import *
 from scope.testing.test_database.test_date_utils import *
 from scope.testing.test_database.test_database_put_size import *
+from scope.testing.test_database.test_identity_directory import *
 from scope.testing.test_database.test_patient_profile_maintains_identity import *
 from scope.testing.test_database.test_patients import *
 from scope.testing.test_database.test_providers import *
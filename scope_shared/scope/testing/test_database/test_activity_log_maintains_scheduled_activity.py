@@ -3,8 +3,10 @@ In addition to its standard set properties,
 a put to scope.database.patient.activity_logs must maintain the scheduled activity.
 """
 
-from typing import Callable
+import copy
+from typing import Callable, List
 
+import scope.database.collection_utils
 import scope.database.patient.activities
 import scope.database.patient.activity_logs
 import scope.database.patient.scheduled_activities
@@ -85,3 +87,238 @@ def test_activity_log_post_maintains_scheduled_activity(
         ][scope.database.patient.scheduled_activities.DOCUMENT_TYPE]
         == updated_scheduled_activity
     )
+
+
+def _post_scheduled_activities(
+    *,
+    patient_collection,
+    data_fake_scheduled_activity_factory: Callable[[], dict],
+    count: int,
+) -> List[dict]:
+    scheduled_activities = []
+    for _ in range(count):
+        fake_scheduled_activity = data_fake_scheduled_activity_factory()
+        fake_scheduled_activity.update({"completed": False})
+
+        scheduled_activity_post_result = (
+            scope.database.patient.scheduled_activities.post_scheduled_activity(
+                collection=patient_collection,
+                scheduled_activity=fake_scheduled_activity,
+            )
+        )
+        assert scheduled_activity_post_result.inserted_count == 1
+        scheduled_activities.append(scheduled_activity_post_result.document)
+
+    return scheduled_activities
+
+
+def _fake_activity_log(
+    *,
+    data_fake_activity_log_factory: Callable[[], dict],
+    scheduled_activity: dict,
+) -> dict:
+    fake_activity_log = data_fake_activity_log_factory()
+    fake_activity_log.update(
+        {
+            scope.database.patient.scheduled_activities.SEMANTIC_SET_ID: scheduled_activity[
+                scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
+            ]
+        }
+    )
+
+    return fake_activity_log
+
+
+def _assert_log_maintained_scheduled_activity(
+    *,
+    patient_collection,
+    activity_log_post_result: scope.database.collection_utils.SetPostResult,
+    scheduled_activity: dict,
+) -> dict:
+    """
+    Assert the scheduled activity is completed and the log's data snapshot matches it.
+
+    Returns the data snapshot.
+    """
+
+    updated_scheduled_activity = (
+        scope.database.patient.scheduled_activities.get_scheduled_activity(
+            collection=patient_collection,
+            set_id=scheduled_activity[
+                scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
+            ],
+        )
+    )
+    assert updated_scheduled_activity["completed"]
+
+    activity_log_get_result = scope.database.patient.activity_logs.get_activity_log(
+        collection=patient_collection,
+        set_id=activity_log_post_result.document[
+            scope.database.patient.activity_logs.SEMANTIC_SET_ID
+        ],
+    )
+    data_snapshot = activity_log_get_result[
+        scope.database.patient.activity_logs.DATA_SNAPSHOT_PROPERTY
+    ]
+    assert (
+        data_snapshot[scope.database.patient.scheduled_activities.DOCUMENT_TYPE]
+        == updated_scheduled_activity
+    )
+
+    return data_snapshot
+
+
+def test_activity_logs_post_maintains_scheduled_activities(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_scheduled_activity_factory: Callable[[], dict],
+    data_fake_activity_log_factory: Callable[[], dict],
+):
+    """
+    Test that posting multiple logs maintains scheduled activities as does posting each log.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    patient_collection = temp_patient.collection
+
+    scheduled_activities = _post_scheduled_activities(
+        patient_collection=patient_collection,
+        data_fake_scheduled_activity_factory=data_fake_scheduled_activity_factory,
+        count=3,
+    )
+
+    # Post a single log, for comparison
+    activity_log_post_result = scope.database.patient.activity_logs.post_activity_log(
+        collection=patient_collection,
+        activity_log=_fake_activity_log(
+            data_fake_activity_log_factory=data_fake_activity_log_factory,
+            scheduled_activity=scheduled_activities[0],
+        ),
+    )
+    assert activity_log_post_result.inserted_count == 1
+    data_snapshot_single = _assert_log_maintained_scheduled_activity(
+        patient_collection=patient_collection,
+        activity_log_post_result=activity_log_post_result,
+        scheduled_activity=scheduled_activities[0],
+    )
+
+    # Post multiple logs
+    activity_log_post_results = scope.database.patient.activity_logs.post_activity_logs(
+        collection=patient_collection,
+        activity_logs=[
+            _fake_activity_log(
+                data_fake_activity_log_factory=data_fake_activity_log_factory,
+                scheduled_activity=scheduled_activity_current,
+            )
+            for scheduled_activity_current in scheduled_activities[1:]
+        ],
+    )
+    assert len(activity_log_post_results) == 2
+
+    for activity_log_post_result_current, scheduled_activity_current in zip(
+        activity_log_post_results,
+        scheduled_activities[1:],
+    ):
+        assert activity_log_post_result_current.inserted_count == 1
+        data_snapshot = _assert_log_maintained_scheduled_activity(
+            patient_collection=patient_collection,
+            activity_log_post_result=activity_log_post_result_current,
+            scheduled_activity=scheduled_activity_current,
+        )
+
+        # The snapshot has the same form as that of a single log
+        assert data_snapshot.keys() == data_snapshot_single.keys()
+
+
+def test_activity_logs_post_maintains_scheduled_activities_modified(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_scheduled_activity_factory: Callable[[], dict],
+    data_fake_activity_log_factory: Callable[[], dict],
+    monkeypatch,
+):
+    """
+    Test that a scheduled activity modified while posting multiple logs is still maintained.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    patient_collection = temp_patient.collection
+
+    scheduled_activities = _post_scheduled_activities(
+        patient_collection=patient_collection,
+        data_fake_scheduled_activity_factory=data_fake_scheduled_activity_factory,
+        count=3,
+    )
+    scheduled_activity_modified = scheduled_activities[1]
+
+    # After scheduled activities are obtained, another process modifies one of them,
+    # so putting the obtained revision fails with SetElementsWriteException.
+    get_set_elements = scope.database.collection_utils.get_set_elements
+
+    def _get_set_elements_then_modify(**kwargs):
+        result = get_set_elements(**kwargs)
+
+        monkeypatch.setattr(
+            scope.database.collection_utils,
+            "get_set_elements",
+            get_set_elements,
+        )
+        modified = copy.deepcopy(scheduled_activity_modified)
+        del modified["_id"]
+        scope.database.patient.scheduled_activities.put_scheduled_activity(
+            collection=patient_collection,
+            set_id=modified[
+                scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
+            ],
+            scheduled_activity=modified,
+        )
+
+        return result
+
+    monkeypatch.setattr(
+        scope.database.collection_utils,
+        "get_set_elements",
+        _get_set_elements_then_modify,
+    )
+
+    activity_log_post_results = scope.database.patient.activity_logs.post_activity_logs(
+        collection=patient_collection,
+        activity_logs=[
+            _fake_activity_log(
+                data_fake_activity_log_factory=data_fake_activity_log_factory,
+                scheduled_activity=scheduled_activity_current,
+            )
+            for scheduled_activity_current in scheduled_activities
+        ],
+    )
+    assert len(activity_log_post_results) == 3
+
+    # Every scheduled activity is completed, and every log has its snapshot
+    for activity_log_post_result_current, scheduled_activity_current in zip(
+        activity_log_post_results,
+        scheduled_activities,
+    ):
+        assert activity_log_post_result_current.inserted_count == 1
+        _assert_log_maintained_scheduled_activity(
+            patient_collection=patient_collection,
+            activity_log_post_result=activity_log_post_result_current,
+            scheduled_activity=scheduled_activity_current,
+        )
+
+    # The modified scheduled activity was completed after its modification
+    updated_scheduled_activity_modified = (
+        scope.database.patient.scheduled_activities.get_scheduled_activity(
+            collection=patient_collection,
+            set_id=scheduled_activity_modified[
+                scope.database.patient.scheduled_activities.SEMANTIC_SET_ID
+            ],
+        )
+    )
+    assert (
+        updated_scheduled_activity_modified["_rev"]
+        == scheduled_activity_modified["_rev"] + 2
+    )
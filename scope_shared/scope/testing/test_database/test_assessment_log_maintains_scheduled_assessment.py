@@ -3,9 +3,11 @@ In addition to its standard set properties,
 a put to scope.database.patient.assessment_logs must maintain the scheduled assessment.
 """
 
+import copy
 import pytest
-from typing import Callable
+from typing import Callable, List
 
+import scope.database.collection_utils
 import scope.database.patient.assessments
 import scope.database.patient.assessment_logs
 import scope.database.patient.scheduled_assessments
@@ -73,3 +75,204 @@ def test_assessment_log_post_maintains_scheduled_assessment(
         )
     )
     assert updated_scheduled_assessment["completed"]
+
+
+def _post_scheduled_assessments(
+    *,
+    patient_collection,
+    data_fake_scheduled_assessment_factory: Callable[[], dict],
+    count: int,
+) -> List[dict]:
+    scheduled_assessments = []
+    for _ in range(count):
+        fake_scheduled_assessment = data_fake_scheduled_assessment_factory()
+        fake_scheduled_assessment.update({"completed": False})
+
+        scheduled_assessment_post_result = (
+            scope.database.patient.scheduled_assessments.post_scheduled_assessment(
+                collection=patient_collection,
+                scheduled_assessment=fake_scheduled_assessment,
+            )
+        )
+        assert scheduled_assessment_post_result.inserted_count == 1
+        scheduled_assessments.append(scheduled_assessment_post_result.document)
+
+    return scheduled_assessments
+
+
+def _fake_assessment_log(
+    *,
+    data_fake_assessment_log_factory: Callable[[], dict],
+    scheduled_assessment: dict,
+) -> dict:
+    fake_assessment_log = data_fake_assessment_log_factory()
+    fake_assessment_log.update(
+        {
+            scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID: scheduled_assessment[
+                scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID
+            ]
+        }
+    )
+
+    return fake_assessment_log
+
+
+def _get_scheduled_assessment(
+    *,
+    patient_collection,
+    scheduled_assessment: dict,
+) -> dict:
+    return scope.database.patient.scheduled_assessments.get_scheduled_assessment(
+        collection=patient_collection,
+        set_id=scheduled_assessment[
+            scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID
+        ],
+    )
+
+
+def test_assessment_logs_post_maintains_scheduled_assessments(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_scheduled_assessment_factory: Callable[[], dict],
+    data_fake_assessment_log_factory: Callable[[], dict],
+):
+    """
+    Test that posting multiple logs maintains scheduled assessments as does posting each log.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    patient_collection = temp_patient.collection
+
+    scheduled_assessments = _post_scheduled_assessments(
+        patient_collection=patient_collection,
+        data_fake_scheduled_assessment_factory=data_fake_scheduled_assessment_factory,
+        count=2,
+    )
+
+    assessment_log_post_results = (
+        scope.database.patient.assessment_logs.post_assessment_logs(
+            collection=patient_collection,
+            assessment_logs=[
+                _fake_assessment_log(
+                    data_fake_assessment_log_factory=data_fake_assessment_log_factory,
+                    scheduled_assessment=scheduled_assessment_current,
+                )
+                for scheduled_assessment_current in scheduled_assessments
+            ],
+        )
+    )
+    assert len(assessment_log_post_results) == 2
+
+    for assessment_log_post_result_current, scheduled_assessment_current in zip(
+        assessment_log_post_results,
+        scheduled_assessments,
+    ):
+        assert assessment_log_post_result_current.inserted_count == 1
+
+        # The log is stored as posted
+        assert (
+            scope.database.patient.assessment_logs.get_assessment_log(
+                collection=patient_collection,
+                set_id=assessment_log_post_result_current.document[
+                    scope.database.patient.assessment_logs.SEMANTIC_SET_ID
+                ],
+            )
+            == assessment_log_post_result_current.document
+        )
+
+        # The scheduled assessment is completed, with a single new revision
+        updated_scheduled_assessment = _get_scheduled_assessment(
+            patient_collection=patient_collection,
+            scheduled_assessment=scheduled_assessment_current,
+        )
+        assert updated_scheduled_assessment["completed"]
+        assert (
+            updated_scheduled_assessment["_rev"]
+            == scheduled_assessment_current["_rev"] + 1
+        )
+
+
+def test_assessment_logs_post_maintains_scheduled_assessments_modified(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_scheduled_assessment_factory: Callable[[], dict],
+    data_fake_assessment_log_factory: Callable[[], dict],
+    monkeypatch,
+):
+    """
+    Test that a scheduled assessment modified while posting multiple logs is still maintained.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    patient_collection = temp_patient.collection
+
+    scheduled_assessments = _post_scheduled_assessments(
+        patient_collection=patient_collection,
+        data_fake_scheduled_assessment_factory=data_fake_scheduled_assessment_factory,
+        count=3,
+    )
+    scheduled_assessment_modified = scheduled_assessments[1]
+
+    # After scheduled assessments are obtained, another process modifies one of them,
+    # so putting the obtained revision fails with SetElementsWriteException.
+    get_set_elements = scope.database.collection_utils.get_set_elements
+
+    def _get_set_elements_then_modify(**kwargs):
+        result = get_set_elements(**kwargs)
+
+        monkeypatch.setattr(
+            scope.database.collection_utils,
+            "get_set_elements",
+            get_set_elements,
+        )
+        modified = copy.deepcopy(scheduled_assessment_modified)
+        del modified["_id"]
+        scope.database.patient.scheduled_assessments.put_scheduled_assessment(
+            collection=patient_collection,
+            set_id=modified[
+                scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID
+            ],
+            scheduled_assessment=modified,
+        )
+
+        return result
+
+    monkeypatch.setattr(
+        scope.database.collection_utils,
+        "get_set_elements",
+        _get_set_elements_then_modify,
+    )
+
+    assessment_log_post_results = (
+        scope.database.patient.assessment_logs.post_assessment_logs(
+            collection=patient_collection,
+            assessment_logs=[
+                _fake_assessment_log(
+                    data_fake_assessment_log_factory=data_fake_assessment_log_factory,
+                    scheduled_assessment=scheduled_assessment_current,
+                )
+                for scheduled_assessment_current in scheduled_assessments
+            ],
+        )
+    )
+    assert len(assessment_log_post_results) == 3
+
+    # Every scheduled assessment is completed
+    for scheduled_assessment_current in scheduled_assessments:
+        assert _get_scheduled_assessment(
+            patient_collection=patient_collection,
+            scheduled_assessment=scheduled_assessment_current,
+        )["completed"]
+
+    # The modified scheduled assessment was completed after its modification
+    assert (
+        _get_scheduled_assessment(
+            patient_collection=patient_collection,
+            scheduled_assessment=scheduled_assessment_modified,
+        )["_rev"]
+        == scheduled_assessment_modified["_rev"] + 2
+    )
@@ -2,6 +2,8 @@
 Module testing collection_utils.
 """
 
+from scope.testing.test_database.test_collection_utils.test_changes import *
+from scope.testing.test_database.test_collection_utils.test_current_revision import *
 from scope.testing.test_database.test_collection_utils.test_ensure_index import *
 from scope.testing.test_database.test_collection_utils.test_get_multiple_types import *
 from scope.testing.test_database.test_collection_utils.test_set import *
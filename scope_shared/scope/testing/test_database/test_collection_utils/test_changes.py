@@ -0,0 +1,59 @@
+import pymongo.collection
+import pytest
+from typing import Callable
+
+import scope.database.collection_utils
+
+
+def test_get_changes(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of changes since a change token.
+    """
+    collection = database_temp_collection_factory()
+
+    scope.database.collection_utils.put_singleton(
+        collection=collection,
+        document_type="singleton",
+        document={"_type": "singleton"},
+    )
+    result_set = scope.database.collection_utils.post_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        document={"_type": "set"},
+    )
+
+    # Without a token, obtains every document
+    result = scope.database.collection_utils.get_changes(
+        collection=collection,
+        change_token=None,
+    )
+    assert [document_current["_type"] for document_current in result.documents] == [
+        "singleton",
+        "set",
+    ]
+    change_token = result.change_token
+    assert change_token == result_set.document["_id"]
+
+    # A deletion is obtained as a change
+    result_delete = scope.database.collection_utils.delete_set_element(
+        collection=collection,
+        document_type="set",
+        set_id=result_set.inserted_set_id,
+        rev=result_set.document["_rev"],
+    )
+    result = scope.database.collection_utils.get_changes(
+        collection=collection,
+        change_token=change_token,
+    )
+    assert result_delete.document in result.documents
+    assert result.change_token == result_delete.document["_id"]
+
+    # An invalid token is rejected
+    with pytest.raises(ValueError):
+        scope.database.collection_utils.get_changes(
+            collection=collection,
+            change_token="invalid",
+        )
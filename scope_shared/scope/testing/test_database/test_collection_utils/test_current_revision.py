@@ -0,0 +1,294 @@
+import pymongo.collection
+import pytest
+from typing import Callable
+
+import scope.database.collection_utils
+
+
+@pytest.fixture(name="current_revision_maintain")
+def fixture_current_revision_maintain():
+    """
+    Enable maintaining current revision markers for the duration of a test.
+    """
+
+    scope.database.collection_utils.configure_current_revision(
+        maintain=True,
+        reads=False,
+    )
+    yield
+    scope.database.collection_utils.configure_current_revision(
+        maintain=False,
+        reads=False,
+    )
+
+
+@pytest.fixture(name="current_revision_reads")
+def fixture_current_revision_reads():
+    """
+    Enable current revision reads for the duration of a test.
+    """
+
+    scope.database.collection_utils.configure_current_revision(
+        maintain=True,
+        reads=True,
+    )
+    yield
+    scope.database.collection_utils.configure_current_revision(
+        maintain=False,
+        reads=False,
+    )
+
+
+def _configure_collection(*, collection: pymongo.collection.Collection) -> None:
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    # Populate documents without the "_current" marker, as if written before it existed
+    result = collection.insert_many(
+        [
+            {"_type": "singleton", "_rev": 1},
+            {"_type": "singleton", "_rev": 2},
+            {"_type": "set", "_set_id": "1", "_rev": 1},
+            {"_type": "set", "_set_id": "1", "_rev": 2},
+            {"_type": "set", "_set_id": "2", "_rev": 1},
+            {"_type": "set", "_set_id": "2", "_rev": 2, "_deleted": True},
+        ]
+    )
+    assert len(result.inserted_ids) == 6
+
+    scope.database.collection_utils.ensure_current_revision(collection=collection)
+
+
+def _current_revisions(*, collection: pymongo.collection.Collection) -> list:
+    return sorted(
+        [
+            (document["_type"], document.get("_set_id"), document["_rev"])
+            for document in collection.find(
+                {scope.database.collection_utils.CURRENT_REVISION_FIELD: True}
+            )
+        ],
+        key=lambda current: (current[0], current[1] or "", current[2]),
+    )
+
+
+def test_ensure_current_revision(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test the "_current" marker is applied to exactly the head revisions.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    assert _current_revisions(collection=collection) == [
+        ("set", "1", 2),
+        ("set", "2", 2),
+        ("singleton", None, 2),
+    ]
+
+    # Should be idempotent
+    scope.database.collection_utils.ensure_current_revision(collection=collection)
+    assert _current_revisions(collection=collection) == [
+        ("set", "1", 2),
+        ("set", "2", 2),
+        ("singleton", None, 2),
+    ]
+
+
+def test_put_maintains_current_revision(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+    current_revision_maintain,
+):
+    """
+    Test writes move the "_current" marker to the new revision.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    scope.database.collection_utils.put_singleton(
+        collection=collection,
+        document_type="singleton",
+        document={"_rev": 2},
+    )
+    scope.database.collection_utils.put_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="1",
+        document={"_rev": 2},
+    )
+    result = scope.database.collection_utils.post_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        document={},
+    )
+
+    # The marker is a storage detail, it should not be returned
+    assert scope.database.collection_utils.CURRENT_REVISION_FIELD not in (
+        result.document
+    )
+
+    assert _current_revisions(collection=collection) == sorted(
+        [
+            ("set", "1", 3),
+            ("set", "2", 2),
+            ("set", result.inserted_set_id, 1),
+            ("singleton", None, 3),
+        ],
+        key=lambda current: (current[0], current[1] or "", current[2]),
+    )
+
+
+def test_current_revision_reads(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test reads via the "_current" marker match reads of every revision.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    def _read_all() -> dict:
+        return {
+            "singleton": scope.database.collection_utils.get_singleton(
+                collection=collection,
+                document_type="singleton",
+            ),
+            "set": scope.database.collection_utils.get_set(
+                collection=collection,
+                document_type="set",
+            ),
+            "set_element": scope.database.collection_utils.get_set_element(
+                collection=collection,
+                document_type="set",
+                set_id="1",
+            ),
+            "deleted_set_element": scope.database.collection_utils.get_set_element(
+                collection=collection,
+                document_type="set",
+                set_id="2",
+            ),
+            "multiple_types": scope.database.collection_utils.get_multiple_types(
+                collection=collection,
+                singleton_types=["singleton"],
+                set_types=["set"],
+            ),
+        }
+
+    result_aggregate = _read_all()
+
+    scope.database.collection_utils.configure_current_revision(
+        maintain=True,
+        reads=True,
+    )
+    try:
+        result_current = _read_all()
+    finally:
+        scope.database.collection_utils.configure_current_revision(
+            maintain=False,
+            reads=False,
+        )
+
+    assert result_current == result_aggregate
+    assert result_current["deleted_set_element"] is None
+
+
+def test_current_revision_reads_duplicate_marker(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+    current_revision_reads,
+):
+    """
+    Test reads tolerate a previous revision that has not yet had its marker removed.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    # Simulate a write interrupted before removing the marker from the previous revision
+    collection.insert_one(
+        {
+            "_type": "set",
+            "_set_id": "1",
+            "_rev": 3,
+            scope.database.collection_utils.CURRENT_REVISION_FIELD: True,
+        }
+    )
+
+    result = scope.database.collection_utils.get_set_element(
+        collection=collection,
+        document_type="set",
+        set_id="1",
+    )
+    del result["_id"]
+
+    assert result == {"_type": "set", "_set_id": "1", "_rev": 3}
+
+
+def test_put_without_maintaining_current_revision(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test writes do not maintain the "_current" marker unless configured.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    scope.database.collection_utils.put_singleton(
+        collection=collection,
+        document_type="singleton",
+        document={"_rev": 2},
+    )
+
+    # The previous revision remains marked until ensure_current_revision is applied
+    assert _current_revisions(collection=collection) == [
+        ("set", "1", 2),
+        ("set", "2", 2),
+        ("singleton", None, 2),
+    ]
+
+    scope.database.collection_utils.ensure_current_revision(collection=collection)
+    assert _current_revisions(collection=collection) == [
+        ("set", "1", 2),
+        ("set", "2", 2),
+        ("singleton", None, 3),
+    ]
+
+
+def test_ensure_current_revision_batches(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+    monkeypatch,
+):
+    """
+    Test corrections split across multiple bulk writes are all applied.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    monkeypatch.setattr(
+        scope.database.collection_utils,
+        "ENSURE_CURRENT_REVISION_BATCH_SIZE",
+        2,
+    )
+
+    # Some first revisions remain marked, as if writes had been interrupted
+    collection.insert_many(
+        [
+            {
+                "_type": "set",
+                "_set_id": str(set_id_current),
+                "_rev": rev_current,
+                scope.database.collection_utils.CURRENT_REVISION_FIELD: True,
+            }
+            for set_id_current in range(5)
+            for rev_current in [1, 2]
+            if rev_current == 1 or set_id_current % 2 == 0
+        ]
+    )
+
+    scope.database.collection_utils.ensure_current_revision(collection=collection)
+    assert _current_revisions(collection=collection) == [
+        ("set", "0", 2),
+        ("set", "1", 1),
+        ("set", "2", 2),
+        ("set", "3", 1),
+        ("set", "4", 2),
+    ]
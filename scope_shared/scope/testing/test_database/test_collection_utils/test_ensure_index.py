@@ -12,11 +12,12 @@ def assert_collection_utils_index(*, collection: pymongo.collection.Collection):
 
     index_information = collection.index_information()
 
-    # Index should include "_id_" plus our desired index
-    assert list(index_information.keys()) == [
+    # Index should include "_id_" plus our desired indices
+    assert set(index_information.keys()) == {
         "_id_",
         scope.database.collection_utils.PRIMARY_COLLECTION_INDEX_NAME,
-    ]
+        scope.database.collection_utils.CURRENT_REVISION_INDEX_NAME,
+    }
 
     # Check properties of our desired index
     index = index_information[
@@ -25,6 +26,13 @@ def assert_collection_utils_index(*, collection: pymongo.collection.Collection):
     assert index["key"] == scope.database.collection_utils.PRIMARY_COLLECTION_INDEX
     assert index["unique"]
 
+    # Check properties of our current revision index
+    index = index_information[
+        scope.database.collection_utils.CURRENT_REVISION_INDEX_NAME
+    ]
+    assert index["key"] == scope.database.collection_utils.CURRENT_REVISION_INDEX
+    assert not index.get("unique", False)
+
 
 def test_index_creation(
     database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
@@ -71,3 +79,44 @@ def test_index_replacement(
     scope.database.collection_utils.ensure_index(collection=collection)
 
     assert_collection_utils_index(collection=collection)
+
+
+def test_index_secondary(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test declared secondary indexes are created and retained, and others removed.
+    """
+    collection = database_temp_collection_factory()
+
+    secondary_index = scope.database.collection_utils.SecondaryIndex(
+        name="set_pending",
+        document_type="set",
+        keys=[("due", pymongo.ASCENDING)],
+        partial_filter={"completed": False},
+    )
+
+    scope.database.collection_utils.ensure_index(
+        collection=collection,
+        secondary_indexes=[secondary_index],
+    )
+
+    index_information = collection.index_information()
+    assert secondary_index.name in index_information
+    index = index_information[secondary_index.name]
+    assert index["key"] == secondary_index.index_keys
+    assert dict(index["partialFilterExpression"]) == {
+        "_type": "set",
+        "completed": False,
+    }
+
+    # Ensuring again retains the index
+    scope.database.collection_utils.ensure_index(
+        collection=collection,
+        secondary_indexes=[secondary_index],
+    )
+    assert secondary_index.name in collection.index_information()
+
+    # Ensuring without the declaration removes the index
+    scope.database.collection_utils.ensure_index(collection=collection)
+    assert_collection_utils_index(collection=collection)
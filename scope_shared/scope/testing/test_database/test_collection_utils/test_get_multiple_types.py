@@ -104,3 +104,51 @@ def test_get_multiple_types(
     assert result["other singleton"] == result_other_singleton
     assert result["other set"] == result_other_set
     assert result["nothing"] is None
+
+
+def test_get_multiple_types_type_projections(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of multiple types with a projection specific to a type.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    collection.insert_one(
+        {"_type": "set", "_set_id": "1", "_rev": 3, "kept": 1, "removed": 1}
+    )
+    collection.insert_one(
+        {"_type": "other set", "_set_id": "1", "_rev": 3, "kept": 1, "removed": 1}
+    )
+
+    result = scope.database.collection_utils.get_multiple_types(
+        collection=collection,
+        singleton_types=["singleton"],
+        set_types=["set", "other set"],
+        type_projections={
+            "set": {"kept": True, "missing": True},
+        },
+    )
+
+    # Only the projected type is modified, and missing fields are omitted
+    result_set = {document["_set_id"]: document for document in result["set"]}
+    result_other_set = {
+        document["_set_id"]: document for document in result["other set"]
+    }
+    assert result_set["1"]["kept"] == 1
+    assert "removed" not in result_set["1"]
+    assert "missing" not in result_set["1"]
+    assert result_set["1"]["_rev"] == 3
+    assert result_other_set["1"]["removed"] == 1
+    assert result["singleton"]["_rev"] == 2
+
+    with pytest.raises(ValueError):
+        scope.database.collection_utils.get_multiple_types(
+            collection=collection,
+            singleton_types=[],
+            set_types=["set"],
+            type_projections={
+                "set": {"removed": False},
+            },
+        )
@@ -3,7 +3,7 @@ import copy
 import pymongo.collection
 import pymongo.errors
 import pytest
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 import scope.database.collection_utils
 
@@ -89,6 +89,142 @@ def test_delete_set_element(
     assert result is None
 
 
+def test_compare_and_swap_set_element(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test compare and swap reports conflicts with the existing head.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    result = scope.database.collection_utils.compare_and_swap_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="1",
+        document={"value": "first"},
+    )
+    assert result.document["_rev"] == 1
+
+    result = scope.database.collection_utils.compare_and_swap_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="1",
+        document={"_rev": 1, "value": "second"},
+    )
+    assert result.document["_rev"] == 2
+
+    # A stale "_rev" conflicts, reporting the existing head
+    with pytest.raises(
+        scope.database.collection_utils.DocumentModifiedException
+    ) as exception_info:
+        scope.database.collection_utils.compare_and_swap_set_element(
+            collection=collection,
+            document_type="set",
+            semantic_set_id=None,
+            set_id="1",
+            document={"_rev": 1, "value": "stale"},
+        )
+    assert exception_info.value.document_existing == result.document
+
+    # Deleting an element that does not exist is not found, and puts no tombstone
+    with pytest.raises(scope.database.collection_utils.DocumentNotFoundException):
+        scope.database.collection_utils.delete_set_element(
+            collection=collection,
+            document_type="set",
+            set_id="missing",
+            rev=1,
+        )
+    assert collection.count_documents({"_set_id": "missing"}) == 0
+
+    # Deleting a "_rev" that does not yet exist conflicts with the existing head
+    with pytest.raises(scope.database.collection_utils.DocumentModifiedException):
+        scope.database.collection_utils.delete_set_element(
+            collection=collection,
+            document_type="set",
+            set_id="1",
+            rev=5,
+        )
+
+    # Deleting conflicts with the existing head
+    with pytest.raises(scope.database.collection_utils.DocumentModifiedException):
+        scope.database.collection_utils.delete_set_element(
+            collection=collection,
+            document_type="set",
+            set_id="1",
+            rev=1,
+        )
+
+    # Deleting again with the same "_rev" finds the element already deleted
+    scope.database.collection_utils.delete_set_element(
+        collection=collection,
+        document_type="set",
+        set_id="1",
+        rev=2,
+    )
+    with pytest.raises(scope.database.collection_utils.DocumentNotFoundException):
+        scope.database.collection_utils.delete_set_element(
+            collection=collection,
+            document_type="set",
+            set_id="1",
+            rev=2,
+        )
+
+
+def test_delete_set_elements(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test deletion of multiple set elements.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    # A mismatched "_rev" should fail before any element is deleted
+    with pytest.raises(scope.database.collection_utils.DocumentModifiedException):
+        scope.database.collection_utils.delete_set_elements(
+            collection=collection,
+            document_type="set",
+            set_id_revs={"1": 2, "2": 1},
+        )
+    assert (
+        len(
+            scope.database.collection_utils.get_set(
+                collection=collection,
+                document_type="set",
+            )
+        )
+        == 2
+    )
+
+    # A missing element should fail before any element is deleted
+    with pytest.raises(scope.database.collection_utils.DocumentNotFoundException):
+        scope.database.collection_utils.delete_set_elements(
+            collection=collection,
+            document_type="set",
+            set_id_revs={"1": 2, "nothing": 1},
+        )
+
+    results = scope.database.collection_utils.delete_set_elements(
+        collection=collection,
+        document_type="set",
+        set_id_revs={"1": 2, "2": 2},
+    )
+    assert [result_current.inserted_set_id for result_current in results] == [
+        "1",
+        "2",
+    ]
+    assert all(result_current.document["_rev"] == 3 for result_current in results)
+
+    result = scope.database.collection_utils.get_set(
+        collection=collection,
+        document_type="set",
+    )
+    assert result == []
+
+
 def test_get_set(
     database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
 ):
@@ -156,6 +292,124 @@ def test_get_deleted_set_element(
     assert result is None
 
 
+def test_get_head_ids(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of the "_id" of head revisions, which changes with any put.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    documents = scope.database.collection_utils.get_set(
+        collection=collection,
+        document_type="other set",
+    )
+    head_ids = scope.database.collection_utils.get_head_ids(
+        collection=collection,
+        document_type="other set",
+    )
+    assert head_ids == [document_current["_id"] for document_current in documents]
+
+    head_ids_element = scope.database.collection_utils.get_head_ids(
+        collection=collection,
+        document_type="set",
+        set_id="1",
+    )
+    assert len(head_ids_element) == 1
+
+    result = scope.database.collection_utils.put_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="1",
+        document={"_type": "set", "_set_id": "1", "_rev": 2},
+    )
+    assert result.inserted_count == 1
+
+    assert scope.database.collection_utils.get_head_ids(
+        collection=collection,
+        document_type="set",
+        set_id="1",
+    ) == [result.document["_id"]]
+    assert head_ids_element != [result.document["_id"]]
+
+
+def test_get_set_projection(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of a set with a projection.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    for document_current in [
+        {"included": "1", "excluded": "1"},
+        {"included": "2", "excluded": "2"},
+    ]:
+        scope.database.collection_utils.post_set_element(
+            collection=collection,
+            document_type="set",
+            semantic_set_id=None,
+            document=document_current,
+        )
+
+    # An inclusion projection retains fields that identify the document
+    result = scope.database.collection_utils.get_set(
+        collection=collection,
+        document_type="set",
+        projection={"included": True},
+    )
+    for result_current in result:
+        assert set(result_current.keys()) == {
+            "_id",
+            "_type",
+            "_set_id",
+            "_rev",
+            "included",
+        }
+
+    # An exclusion projection removes only the excluded fields
+    result = scope.database.collection_utils.get_set(
+        collection=collection,
+        document_type="set",
+        projection={"excluded": False},
+    )
+    for result_current in result:
+        assert set(result_current.keys()) == {
+            "_id",
+            "_type",
+            "_set_id",
+            "_rev",
+            "included",
+        }
+
+    result_element = scope.database.collection_utils.get_set_element(
+        collection=collection,
+        document_type="set",
+        set_id=result[0]["_set_id"],
+        projection={"excluded": False},
+    )
+    assert result_element == result[0]
+
+    # A projection cannot both include and exclude
+    with pytest.raises(ValueError):
+        scope.database.collection_utils.get_set(
+            collection=collection,
+            document_type="set",
+            projection={"included": True, "excluded": False},
+        )
+
+    # A projection cannot exclude fields that identify the document
+    with pytest.raises(ValueError):
+        scope.database.collection_utils.get_set(
+            collection=collection,
+            document_type="set",
+            projection={"_rev": False},
+        )
+
+
 def test_get_set_empty(
     database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
 ):
@@ -216,6 +470,275 @@ def test_get_set_element_not_found(
     assert result is None
 
 
+def test_get_set_elements(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of multiple set elements.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    result = scope.database.collection_utils.get_set_elements(
+        collection=collection,
+        document_type="other set",
+        set_ids=["1", "2", "nothing"],
+    )
+
+    # Remove the "_id" field that was created upon insertion
+    for result_current in result.values():
+        del result_current["_id"]
+
+    # Deleted and missing elements are omitted
+    assert result == {
+        "1": {"_type": "other set", "_set_id": "1", "_rev": 2},
+    }
+
+    # Each element should match an individual retrieval
+    result = scope.database.collection_utils.get_set_elements(
+        collection=collection,
+        document_type="set",
+        set_ids=["1", "2"],
+    )
+    for set_id_current in ["1", "2"]:
+        assert result[
+            set_id_current
+        ] == scope.database.collection_utils.get_set_element(
+            collection=collection,
+            document_type="set",
+            set_id=set_id_current,
+        )
+
+    result = scope.database.collection_utils.get_set_elements(
+        collection=collection,
+        document_type="set",
+        set_ids=[],
+    )
+    assert result == {}
+
+
+def test_iter_set(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test iteration over a set matches retrieval of the set.
+    """
+    collection = database_temp_collection_factory()
+    _configure_collection(collection=collection)
+
+    for document_type_current in ["set", "other set", "nothing"]:
+        result_get = scope.database.collection_utils.get_set(
+            collection=collection,
+            document_type=document_type_current,
+        )
+
+        # A batch size smaller than the set requires multiple batches
+        result_iter = list(
+            scope.database.collection_utils.iter_set(
+                collection=collection,
+                document_type=document_type_current,
+                batch_size=1,
+            )
+        )
+
+        # Iteration order is not normalized
+        assert sorted(result_iter, key=lambda document: document["_id"]) == result_get
+
+
+def test_post_set_elements(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test post of multiple set elements.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    documents = [{"index": index_current} for index_current in range(3)]
+    results = scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type="set",
+        semantic_set_id="setId",
+        documents=documents,
+    )
+
+    # Provided documents are not modified
+    assert documents == [{"index": index_current} for index_current in range(3)]
+
+    # Results are in order, and match an individual retrieval
+    assert len(results) == 3
+    for index_current, result_current in enumerate(results):
+        assert result_current.inserted_count == 1
+        assert result_current.document["index"] == index_current
+        assert result_current.document["setId"] == result_current.inserted_set_id
+        document_retrieved = scope.database.collection_utils.get_set_element(
+            collection=collection,
+            document_type="set",
+            set_id=result_current.inserted_set_id,
+        )
+        assert result_current.document == document_retrieved
+
+    results = scope.database.collection_utils.post_set_elements(
+        collection=collection,
+        document_type="set",
+        semantic_set_id="setId",
+        documents=[],
+    )
+    assert results == []
+
+
+def test_put_set_elements_conflict(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test put of multiple set elements reports an ordered failure.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    scope.database.collection_utils.put_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="2",
+        document={"_rev": 1},
+    )
+
+    # Element "2" is already at "_rev" 2, so putting "_rev" 2 conflicts
+    with pytest.raises(
+        scope.database.collection_utils.SetElementsWriteException
+    ) as exception_info:
+        scope.database.collection_utils.put_set_elements(
+            collection=collection,
+            document_type="set",
+            semantic_set_id=None,
+            documents={
+                "1": {},
+                "2": {"_rev": 1},
+                "3": {},
+            },
+        )
+
+    assert exception_info.value.duplicate_key
+    assert exception_info.value.failed_index == 1
+    results = exception_info.value.results
+    assert [result_current.inserted_set_id for result_current in results] == ["1"]
+
+    # Elements preceding the failure were written, those following were not
+    assert scope.database.collection_utils.get_set_element(
+        collection=collection,
+        document_type="set",
+        set_id="1",
+    )
+    assert (
+        scope.database.collection_utils.get_set_element(
+            collection=collection,
+            document_type="set",
+            set_id="3",
+        )
+        is None
+    )
+
+
+def test_get_set_matching(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of set elements whose head revision matches a filter.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    for set_id_current in ["1", "2", "3"]:
+        scope.database.collection_utils.put_set_element(
+            collection=collection,
+            document_type="set",
+            semantic_set_id=None,
+            set_id=set_id_current,
+            document={"completed": False},
+        )
+
+    # An earlier revision matches, but the head revision does not
+    scope.database.collection_utils.put_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="2",
+        document={"_rev": 1, "completed": True},
+    )
+
+    # An earlier revision matches, but the element is deleted
+    scope.database.collection_utils.delete_set_element(
+        collection=collection,
+        document_type="set",
+        set_id="3",
+        rev=1,
+    )
+
+    result = scope.database.collection_utils.get_set_matching(
+        collection=collection,
+        document_type="set",
+        match={"completed": False},
+    )
+    assert [result_current["_set_id"] for result_current in result] == ["1"]
+
+    result = scope.database.collection_utils.get_set_matching(
+        collection=collection,
+        document_type="other set",
+        match={"completed": False},
+    )
+    assert result == []
+
+
+def test_get_set_range(
+    database_temp_collection_factory: Callable[[], pymongo.collection.Collection],
+):
+    """
+    Test retrieval of set elements within a range of a field.
+    """
+    collection = database_temp_collection_factory()
+    scope.database.collection_utils.ensure_index(collection=collection)
+
+    for set_id_current, recorded_current in [
+        ("1", "2022-01-01"),
+        ("2", "2022-01-02"),
+        ("3", "2022-01-03"),
+        ("4", "2022-01-04"),
+    ]:
+        scope.database.collection_utils.put_set_element(
+            collection=collection,
+            document_type="set",
+            semantic_set_id=None,
+            set_id=set_id_current,
+            document={"recorded": recorded_current},
+        )
+
+    # Range applies to the head revision
+    scope.database.collection_utils.put_set_element(
+        collection=collection,
+        document_type="set",
+        semantic_set_id=None,
+        set_id="4",
+        document={"_rev": 1, "recorded": "2022-01-05"},
+    )
+
+    def _get_set_range(**kwargs) -> List[str]:
+        result = scope.database.collection_utils.get_set_range(
+            collection=collection,
+            document_type="set",
+            range_field="recorded",
+            **kwargs,
+        )
+        return [result_current["_set_id"] for result_current in result]
+
+    assert _get_set_range() == ["1", "2", "3", "4"]
+    assert _get_set_range(range_start="2022-01-02") == ["2", "3", "4"]
+    assert _get_set_range(range_end="2022-01-03") == ["1", "2"]
+    assert _get_set_range(range_start="2022-01-04", range_end="2022-01-05") == []
+    assert _get_set_range(descending=True, limit=2) == ["4", "3"]
+    assert _get_set_range(range_end="2022-01-04", descending=True, limit=1) == ["3"]
+
+
 @pytest.mark.parametrize(
     ["document"],
     [
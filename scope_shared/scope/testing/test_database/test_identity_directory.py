@@ -0,0 +1,115 @@
+import pymongo.database
+
+import scope.database.identity_directory
+import scope.database.patients
+
+
+def test_identity_directory_patient(
+    database_client: pymongo.database.Database,
+):
+    """
+    Test the identity directory follows creation and deletion of a patient.
+    """
+
+    identity_directory = scope.database.identity_directory.IdentityDirectory()
+
+    created_patient_identity = scope.database.patients.create_patient(
+        database=database_client,
+        patient_name="TEST NAME",
+        patient_mrn="TEST MRN",
+    )
+    patient_id = created_patient_identity[
+        scope.database.patients.PATIENT_IDENTITY_SEMANTIC_SET_ID
+    ]
+
+    try:
+        # A patient created after the directory was loaded is found
+        assert (
+            identity_directory.patient_identity_by_patient_id(
+                database=database_client,
+                patient_id=patient_id,
+            )
+            == created_patient_identity
+        )
+        assert (
+            scope.database.identity_directory.get_patient_collection_name(
+                database=database_client,
+                patient_id=patient_id,
+            )
+            == created_patient_identity["collection"]
+        )
+    finally:
+        scope.database.patients.delete_patient(
+            database=database_client,
+            patient_id=patient_id,
+            destructive=True,
+        )
+
+    # A deleted patient is no longer found
+    assert (
+        scope.database.identity_directory.get_patient_collection_name(
+            database=database_client,
+            patient_id=patient_id,
+        )
+        is None
+    )
+
+
+def test_identity_directory_ttl(
+    database_client: pymongo.database.Database,
+):
+    """
+    Test the identity directory is used without consulting the database within its TTL.
+    """
+
+    now = [0.0]
+    identity_directory = scope.database.identity_directory.IdentityDirectory(
+        ttl_seconds=5,
+        clock=lambda: now[0],
+    )
+
+    created_patient_identity = scope.database.patients.create_patient(
+        database=database_client,
+        patient_name="TEST NAME",
+        patient_mrn="TEST MRN",
+    )
+    patient_id = created_patient_identity[
+        scope.database.patients.PATIENT_IDENTITY_SEMANTIC_SET_ID
+    ]
+
+    try:
+        assert (
+            identity_directory.patient_identity_by_patient_id(
+                database=database_client,
+                patient_id=patient_id,
+            )
+            == created_patient_identity
+        )
+    finally:
+        # Deletion invalidates only the process-wide directory,
+        # as would a deletion by another process
+        scope.database.patients.delete_patient(
+            database=database_client,
+            patient_id=patient_id,
+            destructive=True,
+        )
+
+    # Within the TTL, the deleted patient remains in the directory
+    now[0] += 1
+    assert (
+        identity_directory.patient_identity_by_patient_id(
+            database=database_client,
+            patient_id=patient_id,
+        )
+        == created_patient_identity
+    )
+
+    # After the TTL, the directory follows the database
+    now[0] += 5
+    assert (
+        identity_directory.patient_identity_by_patient_id(
+            database=database_client,
+            patient_id=patient_id,
+        )
+        is None
+    )
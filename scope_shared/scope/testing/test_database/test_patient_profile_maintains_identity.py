@@ -52,3 +52,16 @@ def test_patient_profile_maintains_identity(
 
     assert modified_identity["name"] == modified_profile_document["name"]
     assert modified_identity["MRN"] == modified_profile_document["MRN"]
+
+    # Confirm mirrored profile fields were also modified in patient identity
+    modified_profile_document = (
+        scope.database.patient.patient_profile.get_patient_profile(
+            collection=patient_collection,
+        )
+    )
+
+    assert modified_identity[
+        "profile"
+    ] == scope.database.patient.patient_profile.identity_profile(
+        patient_profile=modified_profile_document,
+    )
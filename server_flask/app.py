@@ -1,9 +1,11 @@
 import os
+import signal
+import threading
 from urllib.parse import urljoin
 
 from flask import Blueprint, Flask, request
 from flask_cors import CORS
-from flask_json import FlaskJSON, as_json
+from flask_json import FlaskJSON
 
 import blueprints.identities
 import blueprints.app.config
@@ -11,8 +13,10 @@ import blueprints.patient.summary
 import blueprints.registry.activities
 import blueprints.registry.activity_logs
 import blueprints.registry.activity_schedules
+import blueprints.registry.change_feed
 import blueprints.registry.assessments
 import blueprints.registry.assessment_logs
+import blueprints.registry.logs
 import blueprints.registry.case_reviews
 import blueprints.registry.clinical_history
 import blueprints.registry.mood_logs
@@ -26,7 +30,11 @@ import blueprints.registry.scheduled_activities
 import blueprints.registry.scheduled_assessments
 import blueprints.registry.values
 import blueprints.registry.values_inventory
+import change_feed
 import database
+import executors
+import profiling
+import response_utils
 
 
 def create_app():
@@ -53,13 +61,39 @@ def create_app():
     # Improved support for JSON in endpoints.
     FlaskJSON().init_app(app=app)
 
+    # Serializer of JSON responses
+    response_utils.init_app(app=app)
+
+    # Profiling of requests, preceding the database connection it monitors
+    profiling.init_app(app=app)
+
     # Database connection
     database.Database().init_app(app=app)
 
+    # Thread pools for queries executed in parallel
+    executors.init_app(app=app)
+
+    # Notifications of writes to patient collections
+    change_feed.init_app(app=app)
+
+    # Memo of computed patient summaries
+    blueprints.patient.summary.init_app(app=app)
+
+    # Reload app config content on SIGHUP, where supported.
+    # The handler only flags content for reload, so it never waits on a load it interrupted.
+    if (
+        hasattr(signal, "SIGHUP")
+        and threading.current_thread() is threading.main_thread()
+    ):
+        signal.signal(
+            signal.SIGHUP,
+            lambda signum, frame: blueprints.app.config.reload(app=app),
+        )
+
     # Basic status endpoint.
     # TODO - move this into a blueprint
     @app.route("/")
-    @as_json
+    @response_utils.as_json
     def status():
         return {}
 
@@ -89,6 +123,10 @@ def create_app():
         blueprints.registry.providers.providers_blueprint,
         url_prefix="/",
     )
+    app.register_blueprint(
+        blueprints.registry.change_feed.change_feed_blueprint,
+        url_prefix="/",
+    )
     app.register_blueprint(
         blueprints.registry.patient_profile.patient_profile_blueprint,
         url_prefix="/patient/",
@@ -146,6 +184,10 @@ def create_app():
         blueprints.registry.assessment_logs.assessment_logs_blueprint,
         url_prefix="/patient/",
     )
+    app.register_blueprint(
+        blueprints.registry.logs.logs_blueprint,
+        url_prefix="/patient/",
+    )
     app.register_blueprint(
         blueprints.registry.values.values_blueprint,
         url_prefix="/patient/",
@@ -1,13 +1,19 @@
+import collections
 import dataclasses
 import flask
+import hashlib
+import json
 import jwt
 import pymongo.database
 import re
-from typing import Optional
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, Optional, Tuple
 
+import profiling
 import request_utils
-import scope.database.patients
-import scope.database.providers
+import scope.database.identity_directory
 
 
 @dataclasses.dataclass(frozen=True)
@@ -16,6 +22,217 @@ class AuthenticatedIdentities:
     provider_identity: Optional[str]
 
 
+# Signing keys are refreshed after this many seconds
+JWKS_CACHE_TTL_SECONDS = 60 * 60
+
+# A token with an unknown "kid" triggers a refresh,
+# but at most once within this many seconds
+JWKS_CACHE_MIN_REFRESH_SECONDS = 60
+
+# Maximum number of verified tokens retained
+VERIFIED_TOKEN_CACHE_SIZE = 1024
+
+
+def _fetch_jwks(jwks_url: str) -> dict:
+    with urllib.request.urlopen(jwks_url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+class JWKSCache:
+    """
+    Signing keys from a JWKS endpoint, retained for a TTL.
+
+    A "kid" that is not known causes a refresh, to obtain any newly rotated key.
+    """
+
+    def __init__(
+        self,
+        *,
+        jwks_url: str,
+        ttl_seconds: float = JWKS_CACHE_TTL_SECONDS,
+        min_refresh_seconds: float = JWKS_CACHE_MIN_REFRESH_SECONDS,
+        fetch_jwks: Callable[[str], dict] = _fetch_jwks,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._jwks_url = jwks_url
+        self._ttl_seconds = ttl_seconds
+        self._min_refresh_seconds = min_refresh_seconds
+        self._fetch_jwks = fetch_jwks
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._refreshed: Optional[float] = None
+
+    def _refresh(self) -> None:
+        jwk_set = jwt.PyJWKSet.from_dict(self._fetch_jwks(self._jwks_url))
+
+        self._keys = {
+            jwk_current.key_id: jwk_current
+            for jwk_current in jwk_set.keys
+            if jwk_current.key_id
+        }
+        self._refreshed = self._clock()
+
+    def signing_key(self, *, kid: str) -> jwt.PyJWK:
+        """
+        Obtain the signing key for a "kid".
+
+        Raises jwt.exceptions.InvalidTokenError if no such key is found.
+        """
+
+        with self._lock:
+            now = self._clock()
+
+            if self._refreshed is None or now - self._refreshed >= self._ttl_seconds:
+                self._refresh()
+            elif kid not in self._keys:
+                if now - self._refreshed >= self._min_refresh_seconds:
+                    self._refresh()
+
+            signing_key = self._keys.get(kid, None)
+
+        if signing_key is None:
+            raise jwt.exceptions.InvalidTokenError(
+                'Signing key not found for kid "{}".'.format(kid)
+            )
+
+        return signing_key
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of claims from verified tokens.
+
+    - Keyed by a hash of the token, so tokens themselves are not retained.
+    - An entry expires at the "exp" of its token.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = VERIFIED_TOKEN_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._max_size = max_size
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[str, dict] = collections.OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, *, token: str) -> Optional[dict]:
+        key = self._key(token)
+
+        with self._lock:
+            claims = self._entries.get(key, None)
+            if claims is None:
+                return None
+
+            if claims["exp"] <= self._clock():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+            return claims
+
+    def put(self, *, token: str, claims: dict) -> None:
+        # A token without "exp" cannot be known to expire, so it is not retained
+        if "exp" not in claims:
+            return
+
+        key = self._key(token)
+
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+class TokenVerifier:
+    """
+    Verify tokens from an issuer for an audience, retaining keys and verified claims.
+    """
+
+    def __init__(
+        self,
+        *,
+        issuer: str,
+        audience: str,
+        jwks_cache: JWKSCache,
+        verified_token_cache: VerifiedTokenCache,
+    ):
+        self._issuer = issuer
+        self._audience = audience
+        self._jwks_cache = jwks_cache
+        self._verified_token_cache = verified_token_cache
+
+    def verify(self, *, token: str) -> dict:
+        """
+        Obtain claims of a verified token.
+
+        Raises jwt.exceptions.InvalidTokenError if the token cannot be verified.
+        """
+
+        claims = self._verified_token_cache.get(token=token)
+        if claims is not None:
+            return claims
+
+        kid = jwt.get_unverified_header(token).get("kid", None)
+        if kid is None:
+            raise jwt.exceptions.InvalidTokenError("Token header has no kid.")
+
+        signing_key = self._jwks_cache.signing_key(kid=kid)
+
+        claims = jwt.decode(
+            jwt=token,
+            key=signing_key.key,
+            algorithms=["RS256"],
+            audience=self._audience,
+            issuer=self._issuer,
+            options={
+                "verify_aud": True,
+                "verify_exp": True,
+                "verify_iss": True,
+            },
+        )
+
+        self._verified_token_cache.put(token=token, claims=claims)
+
+        return claims
+
+
+# Process-wide verifiers, keyed by issuer and audience
+_token_verifiers: Dict[Tuple[str, str], TokenVerifier] = {}
+_token_verifiers_lock = threading.Lock()
+
+
+def token_verifier(*, issuer: str, audience: str) -> TokenVerifier:
+    """
+    Obtain the process-wide verifier for an issuer and audience.
+    """
+
+    with _token_verifiers_lock:
+        key = (issuer, audience)
+        if key not in _token_verifiers:
+            _token_verifiers[key] = TokenVerifier(
+                issuer=issuer,
+                audience=audience,
+                jwks_cache=JWKSCache(
+                    jwks_url="{issuer}/.well-known/jwks.json".format(issuer=issuer),
+                ),
+                verified_token_cache=VerifiedTokenCache(),
+            )
+
+        return _token_verifiers[key]
+
+
 def authenticated_identities(
     *,
     database: pymongo.database.Database,
@@ -39,24 +256,11 @@ def authenticated_identities(
         userPoolId=pool_id,
     )
 
-    jwks_url = "{tokenIssuer}/.well-known/jwks.json".format(tokenIssuer=token_issuer)
-
-    jwks_client = jwt.PyJWKClient(jwks_url)
-    signing_key = jwks_client.get_signing_key_from_jwt(authorization_token)
+    verifier = token_verifier(issuer=token_issuer, audience=pool_client_id)
 
     try:
-        authorization_data = jwt.decode(
-            jwt=authorization_token,
-            key=signing_key.key,
-            algorithms=["RS256"],
-            audience=pool_client_id,
-            iss=token_issuer,
-            options={
-                "verify_aud": True,
-                "verify_exp": True,
-                "verify_iss": True,
-            },
-        )
+        with profiling.phase("jwt"):
+            authorization_data = verifier.verify(token=authorization_token)
     except jwt.exceptions.InvalidTokenError:
         request_utils.abort_not_authorized("Invalid token error.")
 
@@ -65,27 +269,19 @@ def authenticated_identities(
 
     verified_cognito_id = authorization_data["sub"]
 
-    verified_patient_identity = None
-    patient_identities = scope.database.patients.get_patient_identities(
-        database=database
-    )
-    for patient_identity_current in patient_identities:
-        account_current = patient_identity_current.get("cognitoAccount", {})
-        cognito_id_current = account_current.get("cognitoId", None)
-
-        if cognito_id_current == verified_cognito_id:
-            verified_patient_identity = patient_identity_current
-
-    verified_provider_identity = None
-    provider_identities = scope.database.providers.get_provider_identities(
-        database=database
-    )
-    for provider_identity_current in provider_identities:
-        account_current = provider_identity_current.get("cognitoAccount", {})
-        cognito_id_current = account_current.get("cognitoId", None)
-
-        if cognito_id_current == verified_cognito_id:
-            verified_provider_identity = provider_identity_current
+    with profiling.phase("identity"):
+        verified_patient_identity = (
+            scope.database.identity_directory.get_patient_identity_by_cognito_id(
+                database=database,
+                cognito_id=verified_cognito_id,
+            )
+        )
+        verified_provider_identity = (
+            scope.database.identity_directory.get_provider_identity_by_cognito_id(
+                database=database,
+                cognito_id=verified_cognito_id,
+            )
+        )
 
     return AuthenticatedIdentities(
         patient_identity=verified_patient_identity,
@@ -1,9 +1,17 @@
+from dataclasses import dataclass
 import flask
-import flask_json
-import http
+import hashlib
 import json
 import random
 from pathlib import Path
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import request_utils
+import response_utils
+import scope.schema
+import scope.schema_utils as schema_utils
 
 
 APP_CONFIG_ASSESSMENTS_PATH = "./app_config/assessments"
@@ -12,6 +20,9 @@ APP_CONFIG_PATIENT_RESOURCES_PATH = "./app_config/patient_resources"
 APP_CONFIG_REGISTRY_RESOURCES_PATH = "./app_config/registry_resources"
 APP_QUOTES_PATH = "./app_config/quotes.json"
 
+# Within this many seconds, content is used without checking whether files were modified
+APP_CONFIG_CHECK_SECONDS = 2
+
 
 app_config_blueprint = flask.Blueprint(
     "app_config_blueprint",
@@ -19,48 +30,124 @@ app_config_blueprint = flask.Blueprint(
 )
 
 
-@app_config_blueprint.route(
-    "/config",
-    methods=["GET"],
-)
-@flask_json.as_json
-def get_app_config():
+@dataclass(frozen=True)
+class _LoadedContent:
+    version: Tuple
+    encoded: List[bytes]
+    etags: List[str]
+
+
+class FileBackedContent:
     """
-    Obtain application configuration to be used by client.
+    Pre-serialized responses loaded from files.
+
+    - Responses are loaded once, then reloaded only if any file was modified
+      or if the content was invalidated.
+    - Modification is checked by file mtimes, at most every APP_CONFIG_CHECK_SECONDS.
+    - Invalidation only sets a flag, without taking the lock,
+      so it is safe from a signal handler that interrupts a load.
     """
 
-    # Load assessments configurations
-    content_assessments = []
-    for path_current in Path(APP_CONFIG_ASSESSMENTS_PATH).iterdir():
+    def __init__(
+        self,
+        *,
+        paths: List[str],
+        load: Callable[[], List[dict]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._paths = [Path(path_current) for path_current in paths]
+        self._load = load
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._loaded: Optional[_LoadedContent] = None
+        self._checked: float = 0
+        self._invalidated = False
+
+    def invalidate(self) -> None:
+        self._invalidated = True
+
+    def _version(self) -> Tuple:
+        # Modification of a directory's contents is reflected in its files,
+        # and in its own mtime if any file was added or removed
+        version = []
+        for path_current in self._paths:
+            version.append((str(path_current), path_current.stat().st_mtime_ns))
+            if path_current.is_dir():
+                for child_current in sorted(path_current.iterdir()):
+                    version.append(
+                        (str(child_current), child_current.stat().st_mtime_ns)
+                    )
+
+        return tuple(version)
+
+    def current(self) -> _LoadedContent:
+        with self._lock:
+            now = self._clock()
+            invalidated = self._invalidated
+            if self._loaded is not None and not invalidated:
+                if now - self._checked < APP_CONFIG_CHECK_SECONDS:
+                    return self._loaded
+
+            # Cleared before loading, so an invalidation during the load is retained
+            self._invalidated = False
+            try:
+                version = self._version()
+                if (
+                    invalidated
+                    or self._loaded is None
+                    or self._loaded.version != version
+                ):
+                    encoded = [
+                        response_utils.encode_json(data=data_current)
+                        for data_current in self._load()
+                    ]
+                    self._loaded = _LoadedContent(
+                        version=version,
+                        encoded=encoded,
+                        etags=[
+                            hashlib.sha256(encoded_current).hexdigest()
+                            for encoded_current in encoded
+                        ],
+                    )
+            except Exception:
+                if invalidated:
+                    self._invalidated = True
+                raise
+            self._checked = now
+
+            return self._loaded
+
+
+def _load_json_directory(path: str) -> List[dict]:
+    content = []
+    for path_current in sorted(Path(path).iterdir()):
         if path_current.match("*.json"):
             with open(path_current, encoding="utf-8") as config_file:
-                config_json = json.load(config_file)
-                content_assessments.append(config_json)
+                content.append(json.load(config_file))
+
+    return content
+
+
+def _load_app_config() -> List[dict]:
+    """
+    Load application configuration, validated against its schema.
+    """
+
+    # Load assessments configurations
+    content_assessments = _load_json_directory(APP_CONFIG_ASSESSMENTS_PATH)
 
     # Load life areas configurations
-    content_life_areas = []
-    for path_current in Path(APP_CONFIG_LIFE_AREAS_PATH).iterdir():
-        if path_current.match("*.json"):
-            with open(path_current, encoding="utf-8") as config_file:
-                config_json = json.load(config_file)
-                content_life_areas.append(config_json)
+    content_life_areas = _load_json_directory(APP_CONFIG_LIFE_AREAS_PATH)
     content_life_areas = sorted(content_life_areas, key=lambda c: c["sortKey"])
 
     # Load patient resources configurations
-    content_patient_resources = []
-    for path_current in Path(APP_CONFIG_PATIENT_RESOURCES_PATH).iterdir():
-        if path_current.match("*.json"):
-            with open(path_current, encoding="utf-8") as config_file:
-                config_json = json.load(config_file)
-                content_patient_resources.append(config_json)
+    content_patient_resources = _load_json_directory(APP_CONFIG_PATIENT_RESOURCES_PATH)
 
     # Load registry resources configurations
-    content_registry_resources = []
-    for path_current in Path(APP_CONFIG_REGISTRY_RESOURCES_PATH).iterdir():
-        if path_current.match("*.json"):
-            with open(path_current, encoding="utf-8") as config_file:
-                config_json = json.load(config_file)
-                content_registry_resources.append(config_json)
+    content_registry_resources = _load_json_directory(
+        APP_CONFIG_REGISTRY_RESOURCES_PATH
+    )
 
     result = {
         "auth": {
@@ -75,25 +162,93 @@ def get_app_config():
         },
     }
 
-    return result
+    schema_utils.raise_for_invalid_schema(
+        data=result,
+        schema=scope.schema.app_config_schema,
+    )
+
+    return [result]
+
+
+def _load_app_quotes() -> List[dict]:
+    """
+    Load quotes, each as a separate response.
+    """
+
+    with open(Path(APP_QUOTES_PATH), encoding="utf-8") as quotes_file:
+        quotes_json = json.load(quotes_file)
+
+    if not quotes_json or not all(isinstance(quote, str) for quote in quotes_json):
+        raise ValueError('"{}" must be a list of quotes'.format(APP_QUOTES_PATH))
+
+    return [{"quote": quote_current} for quote_current in quotes_json]
+
+
+def _file_backed_content(
+    *,
+    name: str,
+    paths: List[str],
+    load: Callable[[], List[dict]],
+) -> FileBackedContent:
+    # Content is held by the app, as it includes app configuration
+    return flask.current_app.extensions.setdefault(
+        name,
+        FileBackedContent(paths=paths, load=load),
+    )
+
+
+def reload(*, app: flask.Flask) -> None:
+    """
+    Reload all content at its next request.
+    """
+
+    for name_current in ["app_config_content", "app_quotes_content"]:
+        content = app.extensions.get(name_current, None)
+        if content is not None:
+            content.invalidate()
+
+
+@app_config_blueprint.route(
+    "/config",
+    methods=["GET"],
+)
+@response_utils.as_json
+@response_utils.static_content
+def get_app_config():
+    """
+    Obtain application configuration to be used by client.
+    """
+
+    content = _file_backed_content(
+        name="app_config_content",
+        paths=[
+            APP_CONFIG_ASSESSMENTS_PATH,
+            APP_CONFIG_LIFE_AREAS_PATH,
+            APP_CONFIG_PATIENT_RESOURCES_PATH,
+            APP_CONFIG_REGISTRY_RESOURCES_PATH,
+        ],
+        load=_load_app_config,
+    ).current()
+
+    request_utils.etag_validate(etag=content.etags[0])
+
+    return content.encoded[0]
 
 
 @app_config_blueprint.route(
     "/quote",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_app_quote():
     """
     Obtain a quote to be used by client.
     """
 
-    quotes_path = Path(APP_QUOTES_PATH)
+    content = _file_backed_content(
+        name="app_quotes_content",
+        paths=[APP_QUOTES_PATH],
+        load=_load_app_quotes,
+    ).current()
 
-    # Load quotes configurations
-    with open(quotes_path, encoding="utf-8") as quotes_file:
-        quotes_json = json.load(quotes_file)
-
-    return {
-        "quote": random.choice(quotes_json),
-    }
+    return random.choice(content.encoded)
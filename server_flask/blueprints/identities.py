@@ -1,9 +1,9 @@
 import flask
-import flask_json
 
 import authorization_utils
 import request_context
 import request_utils
+import response_utils
 import scope.database.patients
 import scope.database.providers
 
@@ -17,7 +17,7 @@ identities_blueprint = flask.Blueprint(
     "/identities",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_identities():
     context = request_context.authorization_unverified()
 
@@ -50,7 +50,7 @@ def get_identities():
     "/identities/patientIdentity",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_patient_identity():
     context = request_context.authorization_unverified()
 
@@ -70,7 +70,7 @@ def get_patient_identity():
     "/identities/providerIdentity",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_provider_identity():
     context = request_context.authorization_unverified()
 
@@ -1,17 +1,67 @@
+import bson.objectid
+import collections
+from dataclasses import dataclass
 import datetime
 import flask
-import flask_json
+import pymongo.collection
+import pytz
+import threading
+from typing import List, Optional
+import weakref
 
 import request_context
 import request_utils
-import scope.database.date_utils as date_utils
+import response_utils
+import scope.database.collection_utils
 import scope.database.patient.activities
 import scope.database.patient.assessment_logs
+import scope.database.patient.assessments
 import scope.database.patient.safety_plan
 import scope.database.patient.scheduled_assessments
+import scope.database.patient.values
 import scope.database.patient.values_inventory
 import scope.utils.compute_patient_summary
 
+# Number of patients whose summary is retained
+PATIENT_SUMMARY_CACHE_SIZE = 1024
+
+# Document types from which a summary is computed
+PATIENT_SUMMARY_SINGLETON_TYPES = [
+    scope.database.patient.safety_plan.DOCUMENT_TYPE,
+    scope.database.patient.values_inventory.DOCUMENT_TYPE,
+]
+PATIENT_SUMMARY_SET_TYPES = [
+    scope.database.patient.activities.DOCUMENT_TYPE,
+    scope.database.patient.assessment_logs.DOCUMENT_TYPE,
+    scope.database.patient.scheduled_assessments.DOCUMENT_TYPE,
+]
+PATIENT_SUMMARY_DOCUMENT_TYPES = (
+    PATIENT_SUMMARY_SINGLETON_TYPES + PATIENT_SUMMARY_SET_TYPES
+)
+
+# The summary needs only a few fields of most documents.
+# Scheduled assessments are included whole in the summary.
+PATIENT_SUMMARY_TYPE_PROJECTIONS = {
+    scope.database.patient.activities.DOCUMENT_TYPE: {
+        scope.database.patient.values.SEMANTIC_SET_ID: True,
+        "editedDateTime": True,
+    },
+    scope.database.patient.assessment_logs.DOCUMENT_TYPE: {
+        scope.database.patient.assessments.SEMANTIC_SET_ID: True,
+        "patientSubmitted": True,
+        "recordedDateTime": True,
+    },
+    scope.database.patient.safety_plan.DOCUMENT_TYPE: {
+        "assigned": True,
+        "assignedDateTime": True,
+        "lastUpdatedDateTime": True,
+    },
+    scope.database.patient.values_inventory.DOCUMENT_TYPE: {
+        "assigned": True,
+        "assignedDateTime": True,
+    },
+}
+
 
 patient_summary_blueprint = flask.Blueprint(
     "patient_summary_blueprint",
@@ -19,48 +69,136 @@ patient_summary_blueprint = flask.Blueprint(
 )
 
 
-@patient_summary_blueprint.route(
-    "/<string:patient_id>/summary",
-    methods=["GET"],
-)
-@flask_json.as_json
-def get_patient_summary(patient_id):
+@dataclass(frozen=True)
+class _PatientSummaryEntry:
+    date_due: datetime.date
+    computed: datetime.datetime
+    summary: dict
+
+
+class PatientSummaryCache:
     """
-    Obtain patient summary to be used by patient app.
+    Computed patient summaries, retained for each patient.
+
+    - A summary is computed from documents obtained in a single query.
+    - A summary is retained until a document of a type it is computed from is written,
+      or until the date it was computed for has passed.
+    - Dates are local dates in the timezone in which scheduled items are created,
+      as are the due dates of scheduled items,
+      so a summary does not depend on the timezone of the server.
+    - Writes by this process invalidate a summary immediately.
+      Writes by any process are detected by a query for documents generated after
+      the summary was computed, allowing CHANGES_OVERLAP_SECONDS for concurrent inserts.
     """
 
-    context = request_context.authorized_for_patient(patient_id=patient_id)
-    patient_collection = context.patient_collection(patient_id=patient_id)
+    def __init__(self, *, max_size: int = PATIENT_SUMMARY_CACHE_SIZE):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict = collections.OrderedDict()
 
-    activity_documents = scope.database.patient.activities.get_activities(
-        collection=patient_collection,
-    )
-    activity_documents = activity_documents or []
+    def invalidate(self, *, collection: pymongo.collection.Collection) -> None:
+        with self._lock:
+            self._entries.pop((collection.database.name, collection.name), None)
 
-    assessment_log_documents = (
-        scope.database.patient.assessment_logs.get_assessment_logs(
-            collection=patient_collection
-        )
-    )
-    assessment_log_documents = assessment_log_documents or []
+    def _write_listener(
+        self,
+        collection: pymongo.collection.Collection,
+        documents: Optional[List[dict]],
+    ) -> None:
+        # Documents of None indicates a write whose documents are not known
+        if documents is None or any(
+            document_current.get("_type", None) in PATIENT_SUMMARY_DOCUMENT_TYPES
+            for document_current in documents
+        ):
+            self.invalidate(collection=collection)
 
-    safety_plan_document = scope.database.patient.safety_plan.get_safety_plan(
-        collection=patient_collection,
-    )
+    def get(
+        self,
+        *,
+        collection: pymongo.collection.Collection,
+        date_due: datetime.date,
+    ) -> dict:
+        key = (collection.database.name, collection.name)
 
-    scheduled_assessment_documents = (
-        scope.database.patient.scheduled_assessments.get_scheduled_assessments(
-            collection=patient_collection,
+        with self._lock:
+            entry: Optional[_PatientSummaryEntry] = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if (
+            entry is not None
+            and entry.date_due == date_due
+            and not _written_since(collection=collection, since=entry.computed)
+        ):
+            return entry.summary
+
+        # Obtain the time before any documents are read,
+        # so any write during computation is detected by a later request
+        computed = datetime.datetime.now(tz=datetime.timezone.utc)
+        summary = _compute_patient_summary(
+            collection=collection,
+            date_due=date_due,
         )
+
+        with self._lock:
+            self._entries[key] = _PatientSummaryEntry(
+                date_due=date_due,
+                computed=computed,
+                summary=summary,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return summary
+
+
+def _written_since(
+    *,
+    collection: pymongo.collection.Collection,
+    since: datetime.datetime,
+) -> bool:
+    """
+    Determine whether a document of a summary type was written since a time.
+    """
+
+    # Writes of other types, such as mood logs, do not modify the summary
+    written_document = collection.find_one(
+        filter={
+            "_id": {
+                "$gt": bson.objectid.ObjectId.from_datetime(
+                    generation_time=since
+                    - datetime.timedelta(
+                        seconds=scope.database.collection_utils.CHANGES_OVERLAP_SECONDS
+                    )
+                )
+            },
+            "_type": {"$in": PATIENT_SUMMARY_DOCUMENT_TYPES},
+        },
+        projection={"_id": True},
     )
-    scheduled_assessment_documents = scheduled_assessment_documents or []
 
-    values_inventory_document = (
-        scope.database.patient.values_inventory.get_values_inventory(
-            collection=patient_collection,
-        )
+    return written_document is not None
+
+
+def _compute_patient_summary(
+    *,
+    collection: pymongo.collection.Collection,
+    date_due: datetime.date,
+) -> dict:
+    documents_by_type = scope.database.collection_utils.get_multiple_types(
+        collection=collection,
+        singleton_types=PATIENT_SUMMARY_SINGLETON_TYPES,
+        set_types=PATIENT_SUMMARY_SET_TYPES,
+        type_projections=PATIENT_SUMMARY_TYPE_PROJECTIONS,
     )
 
+    safety_plan_document = documents_by_type[
+        scope.database.patient.safety_plan.DOCUMENT_TYPE
+    ]
+    values_inventory_document = documents_by_type[
+        scope.database.patient.values_inventory.DOCUMENT_TYPE
+    ]
     if not all(
         [
             safety_plan_document,
@@ -70,10 +208,86 @@ def get_patient_summary(patient_id):
         request_utils.abort_document_not_found()
 
     return scope.utils.compute_patient_summary.compute_patient_summary(
-        activity_documents=activity_documents,
-        assessment_log_documents=assessment_log_documents,
+        activity_documents=documents_by_type[
+            scope.database.patient.activities.DOCUMENT_TYPE
+        ],
+        assessment_log_documents=documents_by_type[
+            scope.database.patient.assessment_logs.DOCUMENT_TYPE
+        ],
         safety_plan_document=safety_plan_document,
-        scheduled_assessment_documents=scheduled_assessment_documents,
+        scheduled_assessment_documents=documents_by_type[
+            scope.database.patient.scheduled_assessments.DOCUMENT_TYPE
+        ],
         values_inventory_document=values_inventory_document,
-        date_due=datetime.date.today(),
+        date_due=date_due,
+    )
+
+
+# Summary caches of every app in this process, held weakly so a discarded app is not retained
+_summary_caches: "weakref.WeakSet[PatientSummaryCache]" = weakref.WeakSet()
+
+
+def _write_listener(
+    collection: pymongo.collection.Collection,
+    documents: Optional[List[dict]],
+) -> None:
+    for summary_cache_current in list(_summary_caches):
+        summary_cache_current._write_listener(collection, documents)
+
+
+_write_listener_registered = False
+
+
+def init_app(*, app: flask.Flask) -> None:
+    """
+    Configure the cache of patient summaries, if enabled.
+    """
+
+    global _write_listener_registered
+
+    if not app.config.get("PATIENT_SUMMARY_CACHE", False):
+        return
+
+    summary_cache = PatientSummaryCache()
+
+    # The listener is process-wide, register it only once
+    if not _write_listener_registered:
+        scope.database.collection_utils.add_write_listener(_write_listener)
+        _write_listener_registered = True
+
+    _summary_caches.add(summary_cache)
+
+    # Summaries are held by the app, so each app has its own
+    app.extensions["patient_summary_cache"] = summary_cache
+
+
+@patient_summary_blueprint.route(
+    "/<string:patient_id>/summary",
+    methods=["GET"],
+)
+@response_utils.as_json
+def get_patient_summary(patient_id):
+    """
+    Obtain patient summary to be used by patient app.
+    """
+
+    context = request_context.authorized_for_patient(patient_id=patient_id)
+    patient_collection = context.patient_collection(patient_id=patient_id)
+
+    # Temporarily assume everybody is always in local timezone,
+    # as when scheduled items are created with their due dates.
+    # A summary computed for a date is not reused after that local date ends.
+    timezone = pytz.timezone("America/Los_Angeles")
+    date_due = datetime.datetime.now(tz=pytz.utc).astimezone(timezone).date()
+
+    summary_cache = flask.current_app.extensions.get("patient_summary_cache", None)
+    if summary_cache is None:
+        return _compute_patient_summary(
+            collection=patient_collection,
+            date_due=date_due,
+        )
+
+    return summary_cache.get(
+        collection=patient_collection,
+        date_due=date_due,
     )
@@ -1,9 +1,8 @@
 import flask
-import flask_json
-import pymongo.errors
 import request_context
 
 import request_utils
+import response_utils
 from scope.database import collection_utils
 import scope.database.patient.activities
 import scope.schema
@@ -18,11 +17,19 @@ activities_blueprint = flask.Blueprint(
     "/<string:patient_id>/activities",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_activities(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.activities.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.activities.get_activities(
         collection=patient_collection,
     )
@@ -45,7 +52,7 @@ def get_activities(patient_id):
     schema=scope.schema.activity_schema,
     key="activity",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_activities(patient_id):
     """
     Creates a new activity in the patient record and returns the activity result.
@@ -83,11 +90,20 @@ def post_activities(patient_id):
     "/<string:patient_id>/activity/<string:activity_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_activity(patient_id, activity_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.activities.DOCUMENT_TYPE,
+            set_id=activity_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.activities.get_activity(
         collection=patient_collection,
@@ -112,7 +128,7 @@ def get_activity(patient_id, activity_id):
     schema=scope.schema.activity_schema,
     key="activity",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_activity(patient_id, activity_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -134,11 +150,12 @@ def put_activity(patient_id, activity_id):
             activity=document,
             set_id=activity_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.activities.get_activity(
-            collection=patient_collection, set_id=activity_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -164,7 +181,7 @@ def put_activity(patient_id, activity_id):
     "/<string:patient_id>/activity/<string:activity_id>",
     methods=["DELETE"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def delete_activity(patient_id, activity_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
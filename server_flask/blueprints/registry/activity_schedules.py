@@ -1,9 +1,8 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
 from scope.database import collection_utils
 import scope.database.patient.activity_schedules
 import scope.schema
@@ -18,11 +17,19 @@ activity_schedules_blueprint = flask.Blueprint(
     "/<string:patient_id>/activityschedules",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_activity_schedules(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.activity_schedules.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.activity_schedules.get_activity_schedules(
         collection=patient_collection,
     )
@@ -45,7 +52,7 @@ def get_activity_schedules(patient_id):
     schema=scope.schema.activity_schedule_schema,
     key="activityschedule",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_activity_schedules(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -79,11 +86,20 @@ def post_activity_schedules(patient_id):
     "/<string:patient_id>/activityschedule/<string:activityschedule_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_activity_schedule(patient_id, activityschedule_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.activity_schedules.DOCUMENT_TYPE,
+            set_id=activityschedule_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.activity_schedules.get_activity_schedule(
         collection=patient_collection,
@@ -108,7 +124,7 @@ def get_activity_schedule(patient_id, activityschedule_id):
     schema=scope.schema.activity_schedule_schema,
     key="activityschedule",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_activity_schedule(patient_id, activityschedule_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -130,13 +146,12 @@ def put_activity_schedule(patient_id, activityschedule_id):
             activity_schedule=document,
             set_id=activityschedule_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = (
-            scope.database.patient.activity_schedules.get_activity_schedule(
-                collection=patient_collection, set_id=activityschedule_id
-            )
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -162,7 +177,7 @@ def put_activity_schedule(patient_id, activityschedule_id):
     "/<string:patient_id>/activityschedule/<string:activityschedule_id>",
     methods=["DELETE"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def delete_activity_schedule(patient_id, activityschedule_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
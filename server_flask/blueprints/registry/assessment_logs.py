@@ -1,11 +1,11 @@
 import flask
-import flask_json
-import pymongo.errors
 import scope.database
 import scope.database.patient.assessment_logs
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.schema
 
 assessment_logs_blueprint = flask.Blueprint(
@@ -18,14 +18,34 @@ assessment_logs_blueprint = flask.Blueprint(
     "/<string:patient_id>/assessmentlogs",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_assessment_logs(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
-    documents = scope.database.patient.assessment_logs.get_assessment_logs(
-        collection=patient_collection,
-    )
+    # Query parameters may request a range of logs
+    range_request = request_utils.set_get_range_request_validate()
+
+    if range_request:
+        documents = scope.database.patient.assessment_logs.get_assessment_logs_recorded(
+            collection=patient_collection,
+            recorded_since=range_request.since,
+            recorded_until=range_request.until,
+            limit=range_request.limit,
+            descending=range_request.descending,
+        )
+    else:
+        # Respond "304 Not Modified" if the client already has the current revisions
+        request_utils.conditional_get_validate(
+            head_ids=collection_utils.get_head_ids(
+                collection=patient_collection,
+                document_type=scope.database.patient.assessment_logs.DOCUMENT_TYPE,
+            )
+        )
+
+        documents = scope.database.patient.assessment_logs.get_assessment_logs(
+            collection=patient_collection,
+        )
 
     # Validate and normalize the response
     documents = request_utils.set_get_response_validate(
@@ -45,7 +65,7 @@ def get_assessment_logs(patient_id):
     schema=scope.schema.assessment_log_schema,
     key="assessmentlog",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_assessment_logs(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -79,11 +99,20 @@ def post_assessment_logs(patient_id):
     "/<string:patient_id>/assessmentlog/<string:assessmentlog_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_assessment_log(patient_id, assessmentlog_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.assessment_logs.DOCUMENT_TYPE,
+            set_id=assessmentlog_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.assessment_logs.get_assessment_log(
         collection=patient_collection,
@@ -108,7 +137,7 @@ def get_assessment_log(patient_id, assessmentlog_id):
     schema=scope.schema.assessment_log_schema,
     key="assessmentlog",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_assessment_log(patient_id, assessmentlog_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -130,11 +159,12 @@ def put_assessment_log(patient_id, assessmentlog_id):
             assessment_log=document,
             set_id=assessmentlog_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.assessment_logs.get_assessment_log(
-            collection=patient_collection, set_id=assessmentlog_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
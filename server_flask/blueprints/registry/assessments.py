@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.assessments
 import scope.schema
@@ -18,11 +18,19 @@ assessments_blueprint = flask.Blueprint(
     "/<string:patient_id>/assessments",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_assessments(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.assessments.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.assessments.get_assessments(
         collection=patient_collection,
     )
@@ -41,11 +49,20 @@ def get_assessments(patient_id):
     "/<string:patient_id>/assessment/<string:assessment_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_assessment(patient_id, assessment_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.assessments.DOCUMENT_TYPE,
+            set_id=assessment_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.assessments.get_assessment(
         collection=patient_collection,
@@ -70,7 +87,7 @@ def get_assessment(patient_id, assessment_id):
     schema=scope.schema.assessment_schema,
     key="assessment",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_assessment(patient_id, assessment_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -92,11 +109,12 @@ def put_assessment(patient_id, assessment_id):
             assessment=document,
             set_id=assessment_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.assessments.get_assessment(
-            collection=patient_collection, set_id=assessment_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.case_reviews
 import scope.schema
@@ -18,11 +18,19 @@ case_reviews_blueprint = flask.Blueprint(
     "/<string:patient_id>/casereviews",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_case_reviews(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.case_reviews.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.case_reviews.get_case_reviews(
         collection=patient_collection,
     )
@@ -45,7 +53,7 @@ def get_case_reviews(patient_id):
     schema=scope.schema.case_review_schema,
     key="casereview",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_case_review(patient_id):
     """
     Creates a new case review in the patient record and returns the case review result.
@@ -82,11 +90,20 @@ def post_case_review(patient_id):
     "/<string:patient_id>/casereview/<string:casereview_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_case_review(patient_id, casereview_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.case_reviews.DOCUMENT_TYPE,
+            set_id=casereview_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.case_reviews.get_case_review(
         collection=patient_collection,
@@ -111,7 +128,7 @@ def get_case_review(patient_id, casereview_id):
     schema=scope.schema.case_review_schema,
     key="casereview",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_case_review(patient_id, casereview_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -133,11 +150,12 @@ def put_case_review(patient_id, casereview_id):
             case_review=document,
             set_id=casereview_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.case_reviews.get_case_review(
-            collection=patient_collection, set_id=casereview_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -0,0 +1,40 @@
+import flask
+
+import change_feed
+import request_context
+
+change_feed_blueprint = flask.Blueprint(
+    "change_feed_blueprint",
+    __name__,
+)
+
+
+@change_feed_blueprint.route(
+    "/patients/changes/stream",
+    methods=["GET"],
+)
+def get_patients_changes_stream():
+    """
+    Stream Server-Sent Events notifying of changes to patients.
+
+    Any "patientId" query parameters limit events to those patients.
+    Only those patients are polled for changes made by other processes,
+    without them every patient is polled.
+    """
+
+    request_context.authorized_for_everything()
+
+    patient_ids = flask.request.args.getlist("patientId")
+
+    feed = change_feed.current_change_feed()
+    subscription = feed.subscribe(patient_ids=set(patient_ids) if patient_ids else None)
+
+    return flask.Response(
+        flask.stream_with_context(feed.stream(subscription=subscription)),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Ingress must not buffer the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
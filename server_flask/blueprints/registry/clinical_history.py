@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.clinical_history
 import scope.schema
@@ -15,11 +15,20 @@ clinical_history_blueprint = flask.Blueprint("clinical_history_blueprint", __nam
     "/<string:patient_id>/clinicalhistory",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_clinical_history(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.clinical_history.DOCUMENT_TYPE,
+            filter_deleted=False,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.clinical_history.get_clinical_history(
         collection=patient_collection,
@@ -43,7 +52,7 @@ def get_clinical_history(patient_id):
     schema=scope.schema.clinical_history_schema,
     key="clinicalhistory",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_clinical_history(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -62,13 +71,9 @@ def put_clinical_history(patient_id):
             collection=patient_collection,
             clinical_history=document,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = (
-            scope.database.patient.clinical_history.get_clinical_history(
-                collection=patient_collection
-            )
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
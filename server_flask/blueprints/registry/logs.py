@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+import flask
+import http
+import jschon
+from typing import Callable, Dict, List, Optional
+import werkzeug.exceptions
+
+import profiling
+import request_context
+import request_utils
+import response_utils
+from scope.database import collection_utils
+import scope.database.patient.activity_logs
+import scope.database.patient.assessment_logs
+import scope.database.patient.mood_logs
+import scope.schema
+
+# Maximum number of logs in a single batch
+LOGS_BATCH_MAX_SIZE = 500
+
+logs_blueprint = flask.Blueprint(
+    "logs_blueprint",
+    __name__,
+)
+
+
+@dataclass(frozen=True)
+class _LogType:
+    # Key of a document in responses, matching the endpoint of a single log
+    key: str
+    schema: jschon.JSONSchema
+    semantic_set_id: str
+    post_logs: Callable[..., List[collection_utils.SetPostResult]]
+
+
+def _post_mood_logs(*, collection, logs):
+    return scope.database.patient.mood_logs.post_mood_logs(
+        collection=collection,
+        mood_logs=logs,
+    )
+
+
+def _post_activity_logs(*, collection, logs):
+    return scope.database.patient.activity_logs.post_activity_logs(
+        collection=collection,
+        activity_logs=logs,
+    )
+
+
+def _post_assessment_logs(*, collection, logs):
+    return scope.database.patient.assessment_logs.post_assessment_logs(
+        collection=collection,
+        assessment_logs=logs,
+    )
+
+
+_LOG_TYPES: Dict[str, _LogType] = {
+    scope.database.patient.mood_logs.DOCUMENT_TYPE: _LogType(
+        key="moodlog",
+        schema=scope.schema.mood_log_schema,
+        semantic_set_id=scope.database.patient.mood_logs.SEMANTIC_SET_ID,
+        post_logs=_post_mood_logs,
+    ),
+    scope.database.patient.activity_logs.DOCUMENT_TYPE: _LogType(
+        key="activitylog",
+        schema=scope.schema.activity_log_schema,
+        semantic_set_id=scope.database.patient.activity_logs.SEMANTIC_SET_ID,
+        post_logs=_post_activity_logs,
+    ),
+    scope.database.patient.assessment_logs.DOCUMENT_TYPE: _LogType(
+        key="assessmentlog",
+        schema=scope.schema.assessment_log_schema,
+        semantic_set_id=scope.database.patient.assessment_logs.SEMANTIC_SET_ID,
+        post_logs=_post_assessment_logs,
+    ),
+}
+
+
+def _item_error(*, status: int, message: str, **kwargs) -> dict:
+    return dict(
+        {
+            "status": status,
+            "message": message,
+        },
+        **kwargs,
+    )
+
+
+def _validate_log(*, document: object) -> Optional[dict]:
+    """
+    Validate a log as would the endpoint for posting a single log of its type.
+
+    Returns None if the log is valid, otherwise the result of the failed log.
+    """
+
+    if not isinstance(document, dict):
+        return _item_error(
+            status=http.HTTPStatus.BAD_REQUEST,
+            message="Log must be an object.",
+        )
+
+    log_type = _LOG_TYPES.get(document.get("_type", None), None)
+    if log_type is None:
+        return _item_error(
+            status=http.HTTPStatus.BAD_REQUEST,
+            message='Unsupported "_type".',
+        )
+
+    result = log_type.schema.evaluate(jschon.JSON(document))
+    if not result.output("flag")["valid"]:
+        return _item_error(
+            status=http.HTTPStatus.BAD_REQUEST,
+            message="Schema validation failed.",
+            error=result.output("detailed"),
+        )
+
+    # Validation of a single log aborts, its response becomes the result of the log
+    try:
+        request_utils.set_post_request_validate(
+            semantic_set_id=log_type.semantic_set_id,
+            document=document,
+        )
+    except werkzeug.exceptions.HTTPException as e:
+        return _item_error(
+            status=e.response.status_code,
+            message=e.response.get_json()["message"],
+        )
+
+    return None
+
+
+@logs_blueprint.route(
+    "/<string:patient_id>/logs",
+    methods=["POST"],
+)
+@response_utils.as_json
+def post_logs(patient_id):
+    """
+    Post a batch of mood logs, activity logs, and assessment logs.
+
+    Each log is validated as if it were posted individually,
+    and logs of each type are then written in bulk.
+    The response has a result for each log, in order of the request,
+    including the status that posting only that log would have had.
+    """
+
+    context = request_context.authorized_for_patient(patient_id=patient_id)
+    patient_collection = context.patient_collection(patient_id=patient_id)
+
+    # Obtain the logs being posted
+    body = flask.request.get_json(silent=True)
+    if not isinstance(body, dict):
+        request_utils.abort_invalid_batch_request(
+            reason='Body must be an object with "logs".'
+        )
+    documents = body.get("logs", None)
+    if not isinstance(documents, list):
+        request_utils.abort_invalid_batch_request(reason='"logs" must be a list.')
+    if len(documents) > LOGS_BATCH_MAX_SIZE:
+        request_utils.abort_invalid_batch_request(
+            reason='"logs" must not exceed {} items.'.format(LOGS_BATCH_MAX_SIZE)
+        )
+
+    # Validate every log in one pass, grouping valid logs by type
+    results: List[Optional[dict]] = [None] * len(documents)
+    indexes_by_type: Dict[str, List[int]] = {}
+    with profiling.phase("validate"):
+        for index_current, document_current in enumerate(documents):
+            results[index_current] = _validate_log(document=document_current)
+            if results[index_current] is None:
+                indexes_by_type.setdefault(document_current["_type"], []).append(
+                    index_current
+                )
+
+    # Store the logs of each type in bulk
+    for document_type_current, indexes_current in indexes_by_type.items():
+        log_type = _LOG_TYPES[document_type_current]
+
+        try:
+            post_results = log_type.post_logs(
+                collection=patient_collection,
+                logs=[documents[index_current] for index_current in indexes_current],
+            )
+        except collection_utils.SetElementsWriteException as e:
+            # Writes are ordered, so logs following the failure were not attempted
+            post_results = e.results
+            for index_current in indexes_current[e.failed_index :]:
+                results[index_current] = _item_error(
+                    status=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                    message="Log was not stored.",
+                )
+
+        for index_current, post_result_current in zip(indexes_current, post_results):
+            # Validate and normalize the response
+            document_response = request_utils.set_post_response_validate(
+                document=post_result_current.document,
+            )
+
+            results[index_current] = {
+                "status": http.HTTPStatus.OK,
+                log_type.key: document_response,
+            }
+
+    return {
+        "results": results,
+    }
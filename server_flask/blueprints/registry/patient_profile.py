@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.patient_profile
 import scope.database.patients
@@ -19,11 +19,20 @@ patient_profile_blueprint = flask.Blueprint(
     "/<string:patient_id>/profile",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_patient_profile(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.patient_profile.DOCUMENT_TYPE,
+            filter_deleted=False,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.patient_profile.get_patient_profile(
         collection=patient_collection,
@@ -47,7 +56,7 @@ def get_patient_profile(patient_id):
     schema=scope.schema.patient_profile_schema,
     key="profile",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_patient_profile(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -68,11 +77,9 @@ def put_patient_profile(patient_id):
             patient_id=patient_id,
             patient_profile=document,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.patient_profile.get_patient_profile(
-            collection=patient_collection
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
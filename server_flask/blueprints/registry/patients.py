@@ -1,11 +1,12 @@
 from collections.abc import Callable
 import copy
 import flask
-import flask_json
-from multiprocessing.dummy import Pool as ThreadPool
 import pymongo.collection
+from typing import Optional
 
+import executors
 import request_utils
+import response_utils
 import request_context
 import scope.database.collection_utils
 import scope.database.patient.activities
@@ -31,7 +32,8 @@ patients_blueprint = flask.Blueprint(
     __name__,
 )
 
-pool = ThreadPool(4)
+# Number of patients obtained ahead of those already sent in a streamed response
+PATIENTS_STREAMING_WINDOW = 16
 
 
 def _construct_patient_document(
@@ -39,11 +41,14 @@ def _construct_patient_document(
     patient_identity: dict,
     patient_collection: pymongo.collection.Collection,
     include_complete_details: bool,
+    executor: Optional[executors.InstrumentedExecutor] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     # First obtain all the documents we will obtain.
     documents_by_type = {}
     if not include_complete_details:
-        # Obtain only the patient profile.
+        # Obtain only the fields of the patient profile that an identity mirrors,
+        # so a patient matches those whose identity mirrors its profile.
         documents_by_type.update(
             scope.database.collection_utils.get_multiple_types(
                 collection=patient_collection,
@@ -51,8 +56,19 @@ def _construct_patient_document(
                     scope.database.patient.patient_profile.DOCUMENT_TYPE,
                 ],
                 set_types=[],
+                type_projections={
+                    scope.database.patient.patient_profile.DOCUMENT_TYPE: scope.database.patient.patient_profile.identity_profile_projection(),
+                },
             )
         )
+        if documents_by_type[scope.database.patient.patient_profile.DOCUMENT_TYPE]:
+            documents_by_type[
+                scope.database.patient.patient_profile.DOCUMENT_TYPE
+            ] = scope.database.patient.patient_profile.identity_profile(
+                patient_profile=documents_by_type[
+                    scope.database.patient.patient_profile.DOCUMENT_TYPE
+                ],
+            )
     else:
         # A worker task that performs the main query.
         def _task_multiple() -> dict:
@@ -88,12 +104,15 @@ def _construct_patient_document(
             }
 
         # Execute both tasks and combine their results.
+        # Without an executor, the tasks are executed sequentially.
         def _task_execute(task: Callable[[], dict]) -> dict:
             return task()
 
-        task_results = pool.map(
-            _task_execute, [_task_multiple, _task_scheduled_assessments]
-        )
+        tasks = [_task_multiple, _task_scheduled_assessments]
+        if executor is not None:
+            task_results = executor.map(_task_execute, tasks, deadline=deadline)
+        else:
+            task_results = [_task_execute(task_current) for task_current in tasks]
         for task_result_current in task_results:
             documents_by_type.update(task_result_current)
 
@@ -101,8 +120,9 @@ def _construct_patient_document(
     patient_document = {}
     patient_document["_type"] = "patient"
 
-    # Identity
+    # Identity, without the profile fields it mirrors
     patient_document["identity"] = copy.deepcopy(patient_identity)
+    patient_document["identity"].pop("profile", None)
 
     # Activities
     if scope.database.patient.activities.DOCUMENT_TYPE in documents_by_type:
@@ -207,7 +227,7 @@ def _construct_patient_document(
     "/patients",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_patients():
     context = request_context.authorized_for_everything()
     database = context.database
@@ -217,12 +237,29 @@ def get_patients():
         database=database,
     )
 
+    # Each patient identity mirrors the fields of its profile needed in a list of patients.
+    # A patient identity that does not yet mirror its profile
+    # requires obtaining those fields of the profile from the patient collection.
+    # Either way, a profile includes only the currently mirrored fields.
+    #
     # PyMongo is thread safe, but not process safe.
     # Sequential retrieval of each patient is IO-bound.
     # This is notable in development, and testing with include_complete_details=True
     # did find some performance differences in a deployment.
     # Given no clear negative to thread parallelization, we are using that approach.
     def _get_patients_map(patient_identity_current: dict) -> dict:
+        if "profile" in patient_identity_current:
+            patient_identity_current = copy.deepcopy(patient_identity_current)
+            patient_profile = scope.database.patient.patient_profile.identity_profile(
+                patient_profile=patient_identity_current.pop("profile"),
+            )
+
+            return {
+                "_type": "patient",
+                "identity": patient_identity_current,
+                "profile": patient_profile,
+            }
+
         patient_collection = database.get_collection(
             patient_identity_current["collection"]
         )
@@ -233,7 +270,30 @@ def get_patients():
             include_complete_details=False,
         )
 
-    patient_documents = pool.map(_get_patients_map, patient_identities)
+    executor = executors.current_executor(executors.EXECUTOR_PATIENTS)
+    deadline = executors.request_deadline()
+
+    # Streaming sends each patient as it is obtained,
+    # instead of holding every patient until all are obtained
+    if flask.current_app.config.get("PATIENTS_STREAMING", False):
+        return response_utils.streamed_json_array_response(
+            key="patients",
+            items=executor.imap_bounded(
+                _get_patients_map,
+                patient_identities,
+                window=PATIENTS_STREAMING_WINDOW,
+                deadline=deadline,
+            ),
+        )
+
+    try:
+        patient_documents = executor.map(
+            _get_patients_map,
+            patient_identities,
+            deadline=deadline,
+        )
+    except executors.DeadlineExceeded:
+        request_utils.abort_deadline_exceeded()
 
     return {
         "patients": patient_documents,
@@ -244,7 +304,7 @@ def get_patients():
     "/patient/<string:patient_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_patient(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     database = context.database
@@ -260,22 +320,57 @@ def get_patient(patient_id):
     # Construct a full patient document
     patient_collection = database.get_collection(patient_identity["collection"])
 
-    patient_document = _construct_patient_document(
-        patient_identity=patient_identity,
-        patient_collection=patient_collection,
-        include_complete_details=True,
-    )
+    try:
+        patient_document = _construct_patient_document(
+            patient_identity=patient_identity,
+            patient_collection=patient_collection,
+            include_complete_details=True,
+            executor=executors.current_executor(executors.EXECUTOR_PATIENT_DOCUMENT),
+            deadline=executors.request_deadline(),
+        )
+    except executors.DeadlineExceeded:
+        request_utils.abort_deadline_exceeded()
 
     return {
         "patient": patient_document,
     }
 
 
+@patients_blueprint.route(
+    "/patient/<string:patient_id>/changes",
+    methods=["GET"],
+)
+@response_utils.as_json
+def get_patient_changes(patient_id):
+    """
+    Obtain documents changed since the change token in the "since" query parameter.
+
+    Without "since", all documents are obtained.
+    The response includes a token for obtaining subsequent changes.
+    """
+
+    context = request_context.authorized_for_patient(patient_id=patient_id)
+    patient_collection = context.patient_collection(patient_id=patient_id)
+
+    try:
+        result = scope.database.collection_utils.get_changes(
+            collection=patient_collection,
+            change_token=flask.request.args.get("since", None),
+        )
+    except ValueError:
+        request_utils.abort_invalid_query_parameter(parameter="since")
+
+    return {
+        "changes": result.documents,
+        "token": result.change_token,
+    }
+
+
 @patients_blueprint.route(
     "/patientidentities",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_patient_identities():
     context = request_context.authorized_for_everything()
     database = context.database
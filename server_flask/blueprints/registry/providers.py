@@ -1,8 +1,8 @@
 import flask
-import flask_json
 
 import request_context
 import request_utils
+import response_utils
 import scope.database.providers
 
 providers_blueprint = flask.Blueprint(
@@ -15,7 +15,7 @@ providers_blueprint = flask.Blueprint(
     "/providers",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_providers():
     context = request_context.authorized_for_everything()
     database = context.database
@@ -34,7 +34,7 @@ def get_providers():
     "/provider/<string:provider_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_provider(provider_id):
     context = request_context.authorized_for_everything()
     database = context.database
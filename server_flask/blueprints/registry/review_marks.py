@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.review_marks
 import scope.schema
@@ -18,11 +18,19 @@ review_marks_blueprint = flask.Blueprint(
     "/<string:patient_id>/reviewmarks",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_review_marks(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.review_marks.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.review_marks.get_review_marks(
         collection=patient_collection,
     )
@@ -45,7 +53,7 @@ def get_review_marks(patient_id):
     schema=scope.schema.review_mark_schema,
     key="reviewmark",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_review_marks(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -79,11 +87,20 @@ def post_review_marks(patient_id):
     "/<string:patient_id>/reviewmark/<string:reviewmark_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_review_mark(patient_id, reviewmark_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.review_marks.DOCUMENT_TYPE,
+            set_id=reviewmark_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.review_marks.get_review_mark(
         collection=patient_collection,
@@ -108,7 +125,7 @@ def get_review_mark(patient_id, reviewmark_id):
     schema=scope.schema.review_mark_schema,
     key="reviewmark",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_review_mark(patient_id, reviewmark_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -130,11 +147,12 @@ def put_review_mark(patient_id, reviewmark_id):
             review_mark=document,
             set_id=reviewmark_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.review_marks.get_review_mark(
-            collection=patient_collection, set_id=reviewmark_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
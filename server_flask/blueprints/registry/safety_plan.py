@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.safety_plan
 import scope.schema
@@ -18,11 +18,20 @@ safety_plan_blueprint = flask.Blueprint(
     "/<string:patient_id>/safetyplan",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_safety_plan(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.safety_plan.DOCUMENT_TYPE,
+            filter_deleted=False,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.safety_plan.get_safety_plan(
         collection=patient_collection,
@@ -46,7 +55,7 @@ def get_safety_plan(patient_id):
     schema=scope.schema.safety_plan_schema,
     key="safetyplan",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_safety_plan(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -65,11 +74,9 @@ def put_safety_plan(patient_id):
             collection=patient_collection,
             safety_plan=document,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.safety_plan.get_safety_plan(
-            collection=patient_collection
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.scheduled_activities
 import scope.schema
@@ -18,11 +18,19 @@ scheduled_activities_blueprint = flask.Blueprint(
     "/<string:patient_id>/scheduledactivities",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_scheduled_activities(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.scheduled_activities.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.scheduled_activities.get_scheduled_activities(
         collection=patient_collection,
     )
@@ -45,7 +53,7 @@ def get_scheduled_activities(patient_id):
     schema=scope.schema.scheduled_activity_schema,
     key="scheduledactivity",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_scheduled_activities(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -79,11 +87,20 @@ def post_scheduled_activities(patient_id):
     "/<string:patient_id>/scheduledactivity/<string:scheduleactivity_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_scheduled_activity(patient_id, scheduleactivity_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.scheduled_activities.DOCUMENT_TYPE,
+            set_id=scheduleactivity_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.scheduled_activities.get_scheduled_activity(
         collection=patient_collection,
@@ -108,7 +125,7 @@ def get_scheduled_activity(patient_id, scheduleactivity_id):
     schema=scope.schema.scheduled_activity_schema,
     key="scheduledactivity",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_scheduled_activity(patient_id, scheduleactivity_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -130,13 +147,12 @@ def put_scheduled_activity(patient_id, scheduleactivity_id):
             scheduled_activity=document,
             set_id=scheduleactivity_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = (
-            scope.database.patient.scheduled_activities.get_scheduled_activity(
-                collection=patient_collection, set_id=scheduleactivity_id
-            )
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.scheduled_assessments
 import scope.schema
@@ -18,11 +18,19 @@ scheduled_assessments_blueprint = flask.Blueprint(
     "/<string:patient_id>/scheduledassessments",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_scheduled_assessments(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.scheduled_assessments.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.scheduled_assessments.get_scheduled_assessments(
         collection=patient_collection,
     )
@@ -45,7 +53,7 @@ def get_scheduled_assessments(patient_id):
     schema=scope.schema.scheduled_assessment_schema,
     key="scheduledassessment",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_scheduled_assessments(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -79,11 +87,20 @@ def post_scheduled_assessments(patient_id):
     "/<string:patient_id>/scheduledassessment/<string:scheduleassessment_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_scheduled_assessment(patient_id, scheduleassessment_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.scheduled_assessments.DOCUMENT_TYPE,
+            set_id=scheduleassessment_id,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.scheduled_assessments.get_scheduled_assessment(
         collection=patient_collection,
@@ -108,7 +125,7 @@ def get_scheduled_assessment(patient_id, scheduleassessment_id):
     schema=scope.schema.scheduled_assessment_schema,
     key="scheduledassessment",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_scheduled_assessment(patient_id, scheduleassessment_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -130,13 +147,12 @@ def put_scheduled_assessment(patient_id, scheduleassessment_id):
             scheduled_assessment=document,
             set_id=scheduleassessment_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = (
-            scope.database.patient.scheduled_assessments.get_scheduled_assessment(
-                collection=patient_collection, set_id=scheduleassessment_id
-            )
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.sessions
 import scope.schema
@@ -18,11 +18,19 @@ sessions_blueprint = flask.Blueprint(
     "/<string:patient_id>/sessions",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_sessions(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.sessions.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.sessions.get_sessions(
         collection=patient_collection,
     )
@@ -45,7 +53,7 @@ def get_sessions(patient_id):
     schema=scope.schema.session_schema,
     key="session",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_session(patient_id):
     """
     Creates and return a new session.
@@ -83,11 +91,20 @@ def post_session(patient_id):
     "/<string:patient_id>/session/<string:session_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_session(patient_id, session_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.sessions.DOCUMENT_TYPE,
+            set_id=session_id,
+        )
+    )
+
     document = scope.database.patient.sessions.get_session(
         collection=patient_collection,
         set_id=session_id,
@@ -111,7 +128,7 @@ def get_session(patient_id, session_id):
     schema=scope.schema.session_schema,
     key="session",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_session(patient_id, session_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -133,11 +150,12 @@ def put_session(patient_id, session_id):
             session=document,
             set_id=session_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.sessions.get_session(
-            collection=patient_collection, set_id=session_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -1,9 +1,8 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
 from scope.database import collection_utils
 import scope.database.patient.values
 import scope.schema
@@ -18,11 +17,19 @@ values_blueprint = flask.Blueprint(
     "/<string:patient_id>/values",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_values(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revisions
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.values.DOCUMENT_TYPE,
+        )
+    )
+
     documents = scope.database.patient.values.get_values(
         collection=patient_collection,
     )
@@ -45,7 +52,7 @@ def get_values(patient_id):
     schema=scope.schema.value_schema,
     key="value",
 )
-@flask_json.as_json
+@response_utils.as_json
 def post_value(patient_id):
     """
     Creates and return a new value.
@@ -83,11 +90,20 @@ def post_value(patient_id):
     "/<string:patient_id>/value/<string:value_id>",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_value(patient_id, value_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.values.DOCUMENT_TYPE,
+            set_id=value_id,
+        )
+    )
+
     document = scope.database.patient.values.get_value(
         collection=patient_collection,
         set_id=value_id,
@@ -111,7 +127,7 @@ def get_value(patient_id, value_id):
     schema=scope.schema.value_schema,
     key="value",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_value(patient_id, value_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -133,11 +149,12 @@ def put_value(patient_id, value_id):
             value=document,
             set_id=value_id,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentNotFoundException:
+        # The document may have been deleted
+        request_utils.abort_document_not_found()
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = scope.database.patient.values.get_value(
-            collection=patient_collection, set_id=value_id
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -163,7 +180,7 @@ def put_value(patient_id, value_id):
     "/<string:patient_id>/value/<string:value_id>",
     methods=["DELETE"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def delete_value(patient_id, value_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
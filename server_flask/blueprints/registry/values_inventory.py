@@ -1,9 +1,9 @@
 import flask
-import flask_json
-import pymongo.errors
 
 import request_context
 import request_utils
+import response_utils
+from scope.database import collection_utils
 import scope.database
 import scope.database.patient.values_inventory
 import scope.schema
@@ -18,11 +18,20 @@ values_inventory_blueprint = flask.Blueprint(
     "/<string:patient_id>/valuesinventory",
     methods=["GET"],
 )
-@flask_json.as_json
+@response_utils.as_json
 def get_values_inventory(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
 
+    # Respond "304 Not Modified" if the client already has the current revision
+    request_utils.conditional_get_validate(
+        head_ids=collection_utils.get_head_ids(
+            collection=patient_collection,
+            document_type=scope.database.patient.values_inventory.DOCUMENT_TYPE,
+            filter_deleted=False,
+        )
+    )
+
     # Get the document
     document = scope.database.patient.values_inventory.get_values_inventory(
         collection=patient_collection,
@@ -46,7 +55,7 @@ def get_values_inventory(patient_id):
     schema=scope.schema.values_inventory_schema,
     key="valuesinventory",
 )
-@flask_json.as_json
+@response_utils.as_json
 def put_values_inventory(patient_id):
     context = request_context.authorized_for_patient(patient_id=patient_id)
     patient_collection = context.patient_collection(patient_id=patient_id)
@@ -65,13 +74,9 @@ def put_values_inventory(patient_id):
             collection=patient_collection,
             values_inventory=document,
         )
-    except pymongo.errors.DuplicateKeyError:
+    except collection_utils.DocumentModifiedException as e:
         # Indicates a revision race condition, return error with current revision
-        document_conflict = (
-            scope.database.patient.values_inventory.get_values_inventory(
-                collection=patient_collection
-            )
-        )
+        document_conflict = e.document_existing
         # Validate and normalize the response
         document_conflict = request_utils.singleton_put_response_validate(
             document=document_conflict
@@ -0,0 +1,420 @@
+import bson.objectid
+from dataclasses import dataclass
+import flask
+import json
+import logging
+import pymongo
+import pymongo.collection
+import pymongo.database
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Set
+import weakref
+
+import scope.database.collection_utils
+import scope.database.identity_directory
+import scope.database.patients
+
+# Number of events buffered for a subscription before it must resynchronize
+CHANGE_FEED_QUEUE_SIZE = 100
+
+# Interval at which a subscription is sent a comment, so idle connections are retained
+CHANGE_FEED_KEEPALIVE_SECONDS = 15
+
+# Suggested delay before a client reconnects, in milliseconds
+CHANGE_FEED_RETRY_MILLISECONDS = 5000
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    patient_id: str
+    document_types: List[str]
+
+
+class ChangeSubscription:
+    """
+    Events for a subscriber, optionally limited to some patients.
+
+    If events are not consumed and the queue fills, the subscription is marked
+    as overflowed and the subscriber must resynchronize.
+    """
+
+    patient_ids: Optional[Set[str]]
+    events: queue.Queue
+    overflowed: bool
+
+    def __init__(self, *, patient_ids: Optional[Set[str]]):
+        self.patient_ids = patient_ids
+        self.events = queue.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE)
+        self.overflowed = False
+
+    def matches(self, *, event: ChangeEvent) -> bool:
+        return self.patient_ids is None or event.patient_id in self.patient_ids
+
+
+def _format_event(*, event: str, data: dict) -> str:
+    return "event: {}\ndata: {}\n\n".format(event, json.dumps(data))
+
+
+class ChangeFeed:
+    """
+    Publishes changes to patient collections to subscriptions.
+
+    - Writes in this process are published by a collection_utils write listener.
+    - Writes in other processes are published by polling, if a poll interval is configured.
+      Each poll queries the patient identity collection for identities written since the last poll,
+      then queries the latest "_id" of each patient collection that some subscription follows.
+      While every subscription names its patients, only those patient collections are queried.
+      A subscription to every patient requires querying every patient collection,
+      one query for each patient in each poll.
+    - An error in a poll is logged, and polling continues at the next interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        database: pymongo.database.Database,
+        poll_seconds: Optional[float],
+        logger: logging.Logger = logging.getLogger(__name__),
+    ):
+        self._database = database
+        self._poll_seconds = poll_seconds
+        self._logger = logger
+
+        self._lock = threading.Lock()
+        self._subscriptions: List[ChangeSubscription] = []
+        self._poll_thread: Optional[threading.Thread] = None
+
+        # Latest "_id" known in each patient collection, keyed by patient_id
+        self._latest_ids: Dict[str, str] = {}
+
+        # Latest "_id" known in the patient identity collection
+        self._latest_identity_id: Optional[bson.objectid.ObjectId] = None
+
+    def publish(self, *, event: ChangeEvent) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        for subscription_current in subscriptions:
+            if not subscription_current.matches(event=event):
+                continue
+
+            try:
+                subscription_current.events.put_nowait(event)
+            except queue.Full:
+                subscription_current.overflowed = True
+
+    def subscribe(self, *, patient_ids: Optional[Set[str]]) -> ChangeSubscription:
+        subscription = ChangeSubscription(patient_ids=patient_ids)
+
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+            # Polling starts with the first subscription
+            if self._poll_seconds and self._poll_thread is None:
+                self._poll_thread = threading.Thread(
+                    target=_poll_forever,
+                    kwargs={"change_feed_ref": weakref.ref(self)},
+                    name="change_feed_poll",
+                    daemon=True,
+                )
+                self._poll_thread.start()
+
+        return subscription
+
+    def unsubscribe(self, *, subscription: ChangeSubscription) -> None:
+        with self._lock:
+            self._subscriptions.remove(subscription)
+
+    def stream(self, *, subscription: ChangeSubscription) -> Iterator[str]:
+        """
+        Stream a subscription as Server-Sent Events, unsubscribing when closed.
+
+        - A "change" event identifies a patient and any document types that changed.
+          An empty list of document types indicates any document may have changed.
+        - A "resync" event indicates changes were not retained,
+          so any patient may have changed.
+        """
+
+        try:
+            yield "retry: {}\n\n".format(CHANGE_FEED_RETRY_MILLISECONDS)
+
+            while True:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield _format_event(event="resync", data={})
+
+                try:
+                    event = subscription.events.get(
+                        timeout=CHANGE_FEED_KEEPALIVE_SECONDS
+                    )
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+
+                yield _format_event(
+                    event="change",
+                    data={
+                        "patientId": event.patient_id,
+                        "types": event.document_types,
+                    },
+                )
+        finally:
+            self.unsubscribe(subscription=subscription)
+
+    def _write_listener(
+        self,
+        collection: pymongo.collection.Collection,
+        documents: Optional[List[dict]],
+    ) -> None:
+        if collection.database.name != self._database.name:
+            return
+
+        if collection.name == scope.database.patients.PATIENT_IDENTITY_COLLECTION:
+            # Record these, so polling does not publish them again
+            if documents:
+                latest_identity_id = max(
+                    document_current["_id"] for document_current in documents
+                )
+                with self._lock:
+                    if (
+                        self._latest_identity_id is None
+                        or latest_identity_id > self._latest_identity_id
+                    ):
+                        self._latest_identity_id = latest_identity_id
+
+            # A patient identity changed, publish it as a change of that patient
+            for document_current in documents or []:
+                self.publish(
+                    event=ChangeEvent(
+                        patient_id=document_current["_set_id"],
+                        document_types=[document_current["_type"]],
+                    )
+                )
+            return
+
+        patient_id = scope.database.patients.patient_id_from_collection_name(
+            collection_name=collection.name
+        )
+        if patient_id is None:
+            return
+
+        document_types = []
+        if documents:
+            document_types = sorted(
+                set(document_current["_type"] for document_current in documents)
+            )
+
+            # Record these, so polling does not publish them again
+            latest_id = max(
+                str(document_current["_id"]) for document_current in documents
+            )
+            with self._lock:
+                if latest_id > self._latest_ids.get(patient_id, ""):
+                    self._latest_ids[patient_id] = latest_id
+
+        self.publish(
+            event=ChangeEvent(
+                patient_id=patient_id,
+                document_types=document_types,
+            )
+        )
+
+    def _poll(self) -> None:
+        """
+        Publish changes written by other processes since the previous poll.
+        """
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        if not subscriptions:
+            return
+
+        self._poll_patient_identities()
+
+        # A subscription to every patient requires polling every patient
+        if any(
+            subscription_current.patient_ids is None
+            for subscription_current in subscriptions
+        ):
+            for patient_identity_current in (
+                scope.database.patients.get_patient_identities(database=self._database)
+                or []
+            ):
+                self._poll_patient(
+                    patient_id=patient_identity_current[
+                        scope.database.patients.PATIENT_IDENTITY_SEMANTIC_SET_ID
+                    ],
+                    collection_name=patient_identity_current["collection"],
+                )
+            return
+
+        # Otherwise only the patients named by some subscription are polled
+        patient_ids: Set[str] = set()
+        for subscription_current in subscriptions:
+            patient_ids.update(subscription_current.patient_ids)
+
+        for patient_id_current in sorted(patient_ids):
+            collection_name = (
+                scope.database.identity_directory.get_patient_collection_name(
+                    database=self._database,
+                    patient_id=patient_id_current,
+                )
+            )
+            if collection_name is None:
+                continue
+
+            self._poll_patient(
+                patient_id=patient_id_current,
+                collection_name=collection_name,
+            )
+
+    def _poll_patient_identities(self) -> None:
+        """
+        Publish a change for each patient identity inserted since the latest known "_id".
+        """
+
+        collection = self._database.get_collection(
+            scope.database.patients.PATIENT_IDENTITY_COLLECTION
+        )
+
+        with self._lock:
+            previous_id = self._latest_identity_id
+
+        # The first poll establishes the latest "_id"
+        if previous_id is None:
+            document_latest = collection.find_one(
+                filter={},
+                projection={"_id": True},
+                sort=[("_id", pymongo.DESCENDING)],
+            )
+            if document_latest is not None:
+                with self._lock:
+                    if self._latest_identity_id is None:
+                        self._latest_identity_id = document_latest["_id"]
+            return
+
+        documents = list(
+            collection.find(
+                filter={
+                    "_id": {"$gt": previous_id},
+                    "_type": scope.database.patients.PATIENT_IDENTITY_DOCUMENT_TYPE,
+                },
+                projection={"_id": True, "_type": True, "_set_id": True},
+                sort=[("_id", pymongo.ASCENDING)],
+            )
+        )
+        if not documents:
+            return
+
+        with self._lock:
+            if documents[-1]["_id"] > self._latest_identity_id:
+                self._latest_identity_id = documents[-1]["_id"]
+
+        for document_current in documents:
+            self.publish(
+                event=ChangeEvent(
+                    patient_id=document_current["_set_id"],
+                    document_types=[document_current["_type"]],
+                )
+            )
+
+    def _poll_patient(self, *, patient_id: str, collection_name: str) -> None:
+        """
+        Publish a change for a patient collection whose latest "_id" has changed.
+        """
+
+        document_latest = self._database.get_collection(collection_name).find_one(
+            filter={},
+            projection={"_id": True},
+            sort=[("_id", pymongo.DESCENDING)],
+        )
+        if document_latest is None:
+            return
+
+        latest_id = str(document_latest["_id"])
+        with self._lock:
+            previous_id = self._latest_ids.get(patient_id, None)
+            if previous_id is None or latest_id > previous_id:
+                self._latest_ids[patient_id] = latest_id
+
+        # The first poll of a patient establishes its latest "_id"
+        if previous_id is not None and latest_id > previous_id:
+            self.publish(
+                event=ChangeEvent(
+                    patient_id=patient_id,
+                    document_types=[],
+                )
+            )
+
+
+def _poll_forever(*, change_feed_ref: "weakref.ref[ChangeFeed]") -> None:
+    """
+    Poll a change feed until it is discarded.
+
+    The feed is held only while polling, so the thread does not retain a discarded app.
+    """
+
+    while True:
+        change_feed = change_feed_ref()
+        if change_feed is None:
+            return
+        poll_seconds = change_feed._poll_seconds
+        del change_feed
+
+        time.sleep(poll_seconds)
+
+        change_feed = change_feed_ref()
+        if change_feed is None:
+            return
+
+        try:
+            change_feed._poll()
+        except Exception:
+            # Polling is retried at the next interval
+            change_feed._logger.exception("Change feed poll failed.")
+        del change_feed
+
+
+# Change feeds of every app in this process, held weakly so a discarded app is not retained
+_change_feeds: "weakref.WeakSet[ChangeFeed]" = weakref.WeakSet()
+
+
+def _write_listener(
+    collection: pymongo.collection.Collection,
+    documents: Optional[List[dict]],
+) -> None:
+    for change_feed_current in list(_change_feeds):
+        change_feed_current._write_listener(collection, documents)
+
+
+_write_listener_registered = False
+
+
+def current_change_feed() -> ChangeFeed:
+    return flask.current_app.extensions["change_feed"]
+
+
+def init_app(*, app: flask.Flask) -> None:
+    """
+    Create the change feed of the app, publishing writes made in this process.
+    """
+
+    global _write_listener_registered
+
+    change_feed = ChangeFeed(
+        database=app.database_must_not_be_directly_accessed,
+        poll_seconds=app.config.get("CHANGE_FEED_POLL_SECONDS", None),
+        logger=app.logger,
+    )
+
+    # The listener is process-wide, register it only once
+    if not _write_listener_registered:
+        scope.database.collection_utils.add_write_listener(_write_listener)
+        _write_listener_registered = True
+
+    _change_feeds.add(change_feed)
+
+    # The feed is held by the app, so each app has its own
+    app.extensions["change_feed"] = change_feed
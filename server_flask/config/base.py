@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List, Optional
 
 
 @dataclass
@@ -85,3 +86,100 @@ class Config:
     #
     # Additional fixed configuration
     #
+
+    DATABASE_CURRENT_REVISION_MAINTAIN: bool = False
+    """
+    Whether writes maintain the "_current" marker on the head revision of each document.
+
+    Maintaining the marker requires an additional round trip for any revision after the first.
+    """
+
+    DATABASE_CURRENT_REVISION: bool = False
+    """
+    Whether reads obtain head revisions via the "_current" marker, instead of aggregating every revision.
+
+    Implies DATABASE_CURRENT_REVISION_MAINTAIN.
+    Requires every process already maintains the marker,
+    and the database was since initialized with current revision markers.
+    """
+
+    PATIENT_IDENTITY_PROFILE_FIELDS: Optional[List[str]] = None
+    """
+    Profile fields mirrored into each patient identity, for obtaining a list of patients.
+
+    If None, the fields defined in scope.database.patient.patient_profile are mirrored.
+    """
+
+    JSON_SERIALIZER: str = "auto"
+    """
+    Serializer of JSON responses, either "orjson", "json", or "auto".
+
+    If "auto", orjson is used if it is installed.
+    """
+
+    RESPONSE_COMPRESSION: bool = True
+    """
+    Whether responses are compressed with an encoding negotiated from "Accept-Encoding".
+    """
+
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+    """
+    Size in bytes below which a response is not compressed.
+    """
+
+    DATABASE_MAX_POOL_SIZE: Optional[int] = None
+    """
+    Maximum connections in the database connection pool.
+
+    If None, the PyMongo default of 100 is used.
+    Each executor worker may hold a connection, so this should be at least the total executor workers.
+    """
+
+    EXECUTOR_PATIENTS_WORKERS: int = 4
+    """
+    Threads obtaining each patient in a list of patients, shared by all requests.
+    """
+
+    EXECUTOR_PATIENT_DOCUMENT_WORKERS: int = 4
+    """
+    Threads executing the queries that together obtain a patient, shared by all requests.
+    """
+
+    EXECUTOR_DEADLINE_SECONDS: Optional[float] = 30
+    """
+    Time after a request starts, by which tasks it submitted to executors must complete.
+
+    Measured from the start of the request, not from its first task.
+    If None, a request waits indefinitely.
+    """
+
+    PATIENTS_STREAMING: bool = False
+    """
+    Whether a list of patients is streamed with chunked transfer, sending each patient as it is obtained.
+
+    Disabled by default, as clients must then handle an error after the status was sent.
+    Such a response ends with an "error" field after the patients sent so far,
+    and is otherwise indistinguishable from a complete list.
+    A streamed response is not compressed.
+    """
+
+    PATIENT_SUMMARY_CACHE: bool = True
+    """
+    Whether each patient's computed summary is retained until documents it is computed from are written.
+    """
+
+    CHANGE_FEED_POLL_SECONDS: Optional[float] = 5
+    """
+    Interval at which the change feed polls for writes made by other processes.
+
+    Each poll queries the patient identity collection and each patient followed by a subscription,
+    so a subscription to every patient queries every patient collection.
+    If None, the change feed publishes only writes made by this process.
+    """
+
+    REQUEST_PROFILING: bool = False
+    """
+    Whether each request reports the wall time of its phases and its database commands.
+
+    Reported in a "Server-Timing" header and a structured log line.
+    """
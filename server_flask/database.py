@@ -1,5 +1,7 @@
 import flask
 
+import scope.database.collection_utils
+import scope.database.patient.patient_profile
 import scope.documentdb.client
 
 
@@ -31,7 +33,23 @@ class Database:
             database_name=app.config["DATABASE_NAME"],
             user=app.config["DATABASE_USER"],
             password=app.config["DATABASE_PASSWORD"],
+            # Tuned together with executor workers, which each may hold a connection
+            max_pool_size=app.config.get("DATABASE_MAX_POOL_SIZE", None),
         )
 
         # Store the database client on the Flask app
         app.database_must_not_be_directly_accessed = database
+
+        # Configure how head revisions are obtained
+        current_revision_reads = app.config.get("DATABASE_CURRENT_REVISION", False)
+        scope.database.collection_utils.configure_current_revision(
+            maintain=current_revision_reads
+            or app.config.get("DATABASE_CURRENT_REVISION_MAINTAIN", False),
+            reads=current_revision_reads,
+        )
+
+        # Configure which profile fields are mirrored into patient identities
+        if app.config.get("PATIENT_IDENTITY_PROFILE_FIELDS", None) is not None:
+            scope.database.patient.patient_profile.configure_identity_profile_fields(
+                fields=app.config["PATIENT_IDENTITY_PROFILE_FIELDS"],
+            )
@@ -0,0 +1,280 @@
+import collections
+import concurrent.futures
+import contextvars
+from dataclasses import dataclass
+import flask
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Executor for obtaining each patient in a list of patients
+EXECUTOR_PATIENTS = "patients"
+
+# Executor for the queries that together obtain a single patient document.
+# Tasks of EXECUTOR_PATIENTS submit to this executor,
+# so it must be separate or nested tasks could wait on each other.
+EXECUTOR_PATIENT_DOCUMENT = "patient_document"
+
+
+class DeadlineExceeded(Exception):
+    """
+    Tasks were not complete before the deadline of the request that submitted them.
+    """
+
+
+@dataclass(frozen=True)
+class ExecutorMetrics:
+    name: str
+    max_workers: int
+    # Tasks submitted but not yet started
+    queue_depth: int
+    # Tasks started but not yet complete
+    active: int
+    submitted: int
+    completed: int
+    # Time tasks waited between submission and start
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class InstrumentedExecutor:
+    """
+    A thread pool that records how long tasks wait and how many are queued.
+
+    - Tasks are applied with a deadline, after which waiting for results is abandoned
+      and any tasks not yet started are cancelled.
+    - Each pymongo thread may hold a connection, so max_workers of all executors
+      together should remain within the pymongo maxPoolSize.
+    """
+
+    def __init__(self, *, name: str, max_workers: int):
+        self._name = name
+        self._max_workers = max_workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="executor-{}".format(name),
+        )
+
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def metrics(self) -> ExecutorMetrics:
+        with self._lock:
+            return ExecutorMetrics(
+                name=self._name,
+                max_workers=self._max_workers,
+                queue_depth=self._queue_depth,
+                active=self._active,
+                submitted=self._submitted,
+                completed=self._completed,
+                wait_seconds_total=self._wait_seconds_total,
+                wait_seconds_max=self._wait_seconds_max,
+            )
+
+    def submit(
+        self,
+        function: Callable[..., _R],
+        *args,
+    ) -> "concurrent.futures.Future[_R]":
+        time_submitted = time.monotonic()
+
+        # A task runs in a copy of the submitting context, such as a request profile
+        context = contextvars.copy_context()
+
+        def _task() -> _R:
+            wait_seconds = time.monotonic() - time_submitted
+            with self._lock:
+                self._queue_depth -= 1
+                self._active += 1
+                self._wait_seconds_total += wait_seconds
+                self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+
+            try:
+                return context.run(function, *args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queue_depth += 1
+            self._submitted += 1
+
+        future = self._executor.submit(_task)
+
+        # A task cancelled before it started is no longer queued
+        def _done(future_done: concurrent.futures.Future) -> None:
+            if future_done.cancelled():
+                with self._lock:
+                    self._queue_depth -= 1
+
+        future.add_done_callback(_done)
+
+        return future
+
+    def map(
+        self,
+        function: Callable[[_T], _R],
+        items: Iterable[_T],
+        *,
+        deadline: Optional[float],
+    ) -> List[_R]:
+        """
+        Apply function to each of items, returning results in order of items.
+        """
+
+        futures = [self.submit(function, item_current) for item_current in items]
+
+        return [
+            _result(future=future_current, futures=futures, deadline=deadline)
+            for future_current in futures
+        ]
+
+    def imap_bounded(
+        self,
+        function: Callable[[_T], _R],
+        items: Iterable[_T],
+        *,
+        window: int,
+        deadline: Optional[float],
+    ) -> Iterator[_R]:
+        """
+        Apply function to each of items, yielding results in order of items.
+
+        At most window items are submitted ahead of the results consumed,
+        so results are never accumulated faster than they are consumed.
+        """
+
+        pending = collections.deque()
+        for item_current in items:
+            pending.append(self.submit(function, item_current))
+            if len(pending) >= window:
+                yield _result(
+                    future=pending.popleft(),
+                    futures=pending,
+                    deadline=deadline,
+                )
+
+        while pending:
+            yield _result(future=pending.popleft(), futures=pending, deadline=deadline)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _result(
+    *,
+    future: concurrent.futures.Future,
+    futures: Iterable[concurrent.futures.Future],
+    deadline: Optional[float],
+):
+    timeout = None
+    if deadline is not None:
+        timeout = max(deadline - time.monotonic(), 0)
+
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        # Remaining tasks are of no use to the request
+        future.cancel()
+        for future_current in futures:
+            future_current.cancel()
+
+        raise DeadlineExceeded()
+
+
+def current_executor(name: str) -> InstrumentedExecutor:
+    """
+    Obtain an executor of the current app.
+    """
+
+    flask.g.executors_used = True
+
+    return flask.current_app.extensions["executors"][name]
+
+
+def request_deadline() -> Optional[float]:
+    """
+    Obtain the deadline of the current request, as a time.monotonic value.
+
+    The deadline is EXECUTOR_DEADLINE_SECONDS after the request started,
+    as recorded before the request is dispatched, so it includes time spent
+    before any task was submitted. It is shared by all tasks of the request.
+    """
+
+    deadline_seconds = flask.current_app.config.get("EXECUTOR_DEADLINE_SECONDS", None)
+    if deadline_seconds is None:
+        return None
+
+    # A request not dispatched by an app with executors starts when first asked
+    if "request_start" not in flask.g:
+        flask.g.request_start = time.monotonic()
+
+    return flask.g.request_start + deadline_seconds
+
+
+def init_app(*, app: flask.Flask) -> None:
+    """
+    Create the executors of an app, sized by its configuration.
+    """
+
+    executors: Dict[str, InstrumentedExecutor] = {
+        EXECUTOR_PATIENTS: InstrumentedExecutor(
+            name=EXECUTOR_PATIENTS,
+            max_workers=app.config.get("EXECUTOR_PATIENTS_WORKERS", 4),
+        ),
+        EXECUTOR_PATIENT_DOCUMENT: InstrumentedExecutor(
+            name=EXECUTOR_PATIENT_DOCUMENT,
+            max_workers=app.config.get("EXECUTOR_PATIENT_DOCUMENT_WORKERS", 4),
+        ),
+    }
+    app.extensions["executors"] = executors
+
+    # Every executor thread may simultaneously hold a database connection
+    max_pool_size = app.config.get("DATABASE_MAX_POOL_SIZE", None)
+    executor_workers = sum(
+        executor_current.max_workers for executor_current in executors.values()
+    )
+    if max_pool_size is not None and max_pool_size < executor_workers:
+        app.logger.warning(
+            "DATABASE_MAX_POOL_SIZE {} is less than the {} executor workers.".format(
+                max_pool_size,
+                executor_workers,
+            )
+        )
+
+    @app.before_request
+    def record_request_start() -> None:
+        flask.g.request_start = time.monotonic()
+
+    @app.after_request
+    def log_executors(response: flask.Response) -> flask.Response:
+        if flask.g.get("executors_used", False):
+            for executor_current in executors.values():
+                metrics = executor_current.metrics()
+                app.logger.debug(
+                    "Executor {}: {} queued, {} active, {:.1f} ms maximum wait.".format(
+                        metrics.name,
+                        metrics.queue_depth,
+                        metrics.active,
+                        metrics.wait_seconds_max * 1000,
+                    )
+                )
+
+        return response
@@ -0,0 +1,199 @@
+import contextlib
+import contextvars
+import flask
+import json
+import pymongo.monitoring
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+# Phases are reported in this order, followed by any others
+PROFILING_PHASES = ["jwt", "identity", "validate", "db", "serialize"]
+
+
+class RequestProfile:
+    """
+    Wall time of each phase of a request, and the database commands it executed.
+
+    Phases may overlap, such as database commands executed while obtaining an identity.
+    Tasks of an executor share the profile of the request that submitted them,
+    so a profile is updated concurrently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._phase_seconds: Dict[str, float] = {}
+        self._command_counts: Dict[str, int] = {}
+        self._command_seconds: Dict[str, float] = {}
+
+    def add_phase(self, *, name: str, seconds: float) -> None:
+        with self._lock:
+            self._phase_seconds[name] = self._phase_seconds.get(name, 0.0) + seconds
+
+    def add_command(self, *, name: str, seconds: float) -> None:
+        with self._lock:
+            self._command_counts[name] = self._command_counts.get(name, 0) + 1
+            self._command_seconds[name] = self._command_seconds.get(name, 0.0) + seconds
+
+    def phase_seconds(self) -> Dict[str, float]:
+        with self._lock:
+            phase_seconds = dict(self._phase_seconds)
+            if self._command_seconds:
+                phase_seconds["db"] = sum(self._command_seconds.values())
+
+        ordered = {
+            name_current: phase_seconds.pop(name_current)
+            for name_current in PROFILING_PHASES
+            if name_current in phase_seconds
+        }
+        ordered.update(phase_seconds)
+        ordered["total"] = time.perf_counter() - self._started
+
+        return ordered
+
+    def commands(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                name_current: {
+                    "count": self._command_counts[name_current],
+                    "ms": round(self._command_seconds[name_current] * 1000, 1),
+                }
+                for name_current in sorted(self._command_counts.keys())
+            }
+
+
+# Profile of the current request.
+# Executors run each task in a copy of the submitting context, so tasks share it.
+_current_profile = contextvars.ContextVar("request_profile", default=None)
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Record the wall time of a phase of the current request, if it is being profiled.
+    """
+
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    time_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name=name, seconds=time.perf_counter() - time_start)
+
+
+class _CommandListener(pymongo.monitoring.CommandListener):
+    """
+    Record each database command in the profile of the request that executed it.
+    """
+
+    def _record(self, event) -> None:
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add_command(
+                name=event.command_name,
+                seconds=event.duration_micros / 1_000_000,
+            )
+
+    def started(self, event: pymongo.monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: pymongo.monitoring.CommandSucceededEvent) -> None:
+        self._record(event)
+
+    def failed(self, event: pymongo.monitoring.CommandFailedEvent) -> None:
+        self._record(event)
+
+
+_command_listener_registered = False
+
+
+def _server_timing(
+    *,
+    phase_seconds: Dict[str, float],
+    commands: Dict[str, dict],
+) -> str:
+    server_timing = []
+    for name_current, seconds_current in phase_seconds.items():
+        metric = "{};dur={:.1f}".format(name_current, seconds_current * 1000)
+        if name_current == "db":
+            metric += ';desc="{} commands"'.format(
+                sum(command_current["count"] for command_current in commands.values())
+            )
+        server_timing.append(metric)
+
+    return ", ".join(server_timing)
+
+
+def init_app(*, app: flask.Flask) -> None:
+    """
+    Configure profiling of requests, if enabled.
+
+    Must precede creating the database connection,
+    as command monitoring applies only to clients created after it is registered.
+    """
+
+    global _command_listener_registered
+
+    if not app.config.get("REQUEST_PROFILING", False):
+        return
+
+    # The listener is process-wide, register it only once
+    if not _command_listener_registered:
+        pymongo.monitoring.register(_CommandListener())
+        _command_listener_registered = True
+
+    @app.before_request
+    def start_profile() -> None:
+        flask.g.request_profile = RequestProfile()
+        flask.g.request_profile_token = _current_profile.set(flask.g.request_profile)
+
+    @app.after_request
+    def report_profile(response: flask.Response) -> flask.Response:
+        profile: Optional[RequestProfile] = flask.g.get("request_profile", None)
+        if profile is None:
+            return response
+
+        # Serialization is timed by response_utils
+        serialization_seconds = flask.g.get("serialization_seconds", None)
+        if serialization_seconds is not None:
+            profile.add_phase(name="serialize", seconds=serialization_seconds)
+
+        phase_seconds = profile.phase_seconds()
+        commands = profile.commands()
+
+        response.headers["Server-Timing"] = _server_timing(
+            phase_seconds=phase_seconds,
+            commands=commands,
+        )
+
+        app.logger.info(
+            json.dumps(
+                {
+                    "profile": {
+                        "blueprint": flask.request.blueprint,
+                        "endpoint": flask.request.endpoint,
+                        "method": flask.request.method,
+                        "path": flask.request.path,
+                        "status": response.status_code,
+                        "phases": {
+                            name_current: round(seconds_current * 1000, 1)
+                            for name_current, seconds_current in phase_seconds.items()
+                        },
+                        "commands": commands,
+                    }
+                }
+            )
+        )
+
+        return response
+
+    @app.teardown_request
+    def end_profile(exception: Optional[BaseException]) -> None:
+        token = flask.g.pop("request_profile_token", None)
+        if token is not None:
+            _current_profile.reset(token)
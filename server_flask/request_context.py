@@ -5,6 +5,7 @@ from typing import cast
 
 import authorization_utils
 import request_utils
+import scope.database.identity_directory
 import scope.database.patients
 
 
@@ -19,19 +20,17 @@ class RequestContext:
 
     def patient_collection(self, *, patient_id: str) -> pymongo.collection.Collection:
         # Use patient ID to confirm validity and obtain collection
-        # TODO: As part of authentication, determine if we can cache this.
-        #       Otherwise, maybe an annotation or enhance context to reduce code repetition.
-        patient_identity_document = scope.database.patients.get_patient_identity(
-            database=self.database,
-            patient_id=patient_id,
+        patient_collection_name = (
+            scope.database.identity_directory.get_patient_collection_name(
+                database=self.database,
+                patient_id=patient_id,
+            )
         )
-        if patient_identity_document is None:
+        if patient_collection_name is None:
             request_utils.abort_patient_not_found()
 
         # Obtain patient collection
-        patient_collection = self.database.get_collection(
-            patient_identity_document["collection"]
-        )
+        patient_collection = self.database.get_collection(patient_collection_name)
 
         return patient_collection
 
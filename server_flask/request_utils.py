@@ -1,9 +1,27 @@
+import dataclasses
+import datetime
 import flask
 import functools
+import hashlib
 import http
 import jschon
 from typing import List, NoReturn, Optional
 
+import profiling
+import scope.database.date_utils as date_utils
+
+
+@dataclasses.dataclass(frozen=True)
+class SetGetRangeRequest:
+    """
+    Range, limit, and order obtained from query parameters of a set get.
+    """
+
+    since: Optional[datetime.datetime]
+    until: Optional[datetime.datetime]
+    limit: Optional[int]
+    descending: bool
+
 
 def _flask_abort(response: dict, status: int) -> NoReturn:
     flask.abort(
@@ -14,6 +32,15 @@ def _flask_abort(response: dict, status: int) -> NoReturn:
     )
 
 
+def abort_deadline_exceeded() -> NoReturn:
+    _flask_abort(
+        {
+            "message": "Deadline exceeded.",
+        },
+        http.HTTPStatus.SERVICE_UNAVAILABLE,
+    )
+
+
 def abort_document_not_found() -> NoReturn:
     _flask_abort(
         {
@@ -23,6 +50,33 @@ def abort_document_not_found() -> NoReturn:
     )
 
 
+def abort_invalid_query_parameter(*, parameter: str) -> NoReturn:
+    _flask_abort(
+        {
+            "message": 'Invalid query parameter "{}".'.format(parameter),
+        },
+        http.HTTPStatus.BAD_REQUEST,
+    )
+
+
+def abort_invalid_batch_request(*, reason: str) -> NoReturn:
+    _flask_abort(
+        {
+            "message": "Invalid batch request.",
+            "reason": reason,
+        },
+        http.HTTPStatus.BAD_REQUEST,
+    )
+
+
+def abort_not_modified(*, etag: str) -> NoReturn:
+    # A "304 Not Modified" response has no body
+    response = flask.make_response("", http.HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag)
+
+    flask.abort(response)
+
+
 def abort_not_authorized(reason: str = None) -> NoReturn:
     response = {
         "message": "Not authorized.",
@@ -131,6 +185,88 @@ def abort_revision_conflict(*, document: dict) -> NoReturn:
     )
 
 
+def conditional_get_validate(*, head_ids: List[str]) -> None:
+    """
+    Support a conditional GET of documents whose head revisions have "_id" of head_ids.
+
+    The strong ETag is derived from head_ids, so it changes with any document.
+    """
+
+    etag_validate(
+        etag=hashlib.sha256("\n".join(head_ids).encode("utf-8")).hexdigest(),
+    )
+
+
+def etag_validate(*, etag: str) -> None:
+    """
+    Support a conditional GET of a representation with a strong ETag.
+
+    - If "If-None-Match" includes the ETag, respond "304 Not Modified".
+    - Otherwise a successful response includes the ETag.
+    """
+
+    # A compressed response has a weak ETag, and "If-None-Match" uses weak comparison
+    if flask.request.if_none_match.contains_weak(etag):
+        abort_not_modified(etag=etag)
+
+    @flask.after_this_request
+    def _set_etag(response: flask.Response) -> flask.Response:
+        if response.status_code == http.HTTPStatus.OK:
+            response.set_etag(etag)
+
+        return response
+
+
+def set_get_range_request_validate() -> Optional[SetGetRangeRequest]:
+    """
+    Obtain range query parameters of a set get.
+
+    - "since" and "until" are datetimes, "since" is inclusive and "until" is exclusive.
+    - "limit" is a positive integer.
+    - "order" is "asc" or "desc", default "asc".
+
+    Returns None if no range query parameter is present.
+    """
+
+    args = flask.request.args
+    if not any(key in args for key in ["since", "until", "limit", "order"]):
+        return None
+
+    since = None
+    if "since" in args:
+        try:
+            since = date_utils.parse_datetime(args["since"])
+        except ValueError:
+            abort_invalid_query_parameter(parameter="since")
+
+    until = None
+    if "until" in args:
+        try:
+            until = date_utils.parse_datetime(args["until"])
+        except ValueError:
+            abort_invalid_query_parameter(parameter="until")
+
+    limit = None
+    if "limit" in args:
+        try:
+            limit = int(args["limit"])
+        except ValueError:
+            abort_invalid_query_parameter(parameter="limit")
+        if limit < 1:
+            abort_invalid_query_parameter(parameter="limit")
+
+    order = args.get("order", "asc")
+    if order not in ["asc", "desc"]:
+        abort_invalid_query_parameter(parameter="order")
+
+    return SetGetRangeRequest(
+        since=since,
+        until=until,
+        limit=limit,
+        descending=order == "desc",
+    )
+
+
 def set_get_response_validate(*, documents: List[dict]) -> List[dict]:
     # If database get found None, return an empty list
     if documents is None:
@@ -263,7 +399,8 @@ def validate_schema(
                 document = document[key]
 
             # Argument needs to be of type jschon.json.JSON
-            result = schema.evaluate(jschon.JSON(document))
+            with profiling.phase("validate"):
+                result = schema.evaluate(jschon.JSON(document))
 
             if not result.output("flag")["valid"]:
                 flask.abort(
@@ -0,0 +1,453 @@
+import collections
+import flask
+import functools
+import gzip
+import hashlib
+import http
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serializes data to encoded JSON
+Serializer = Callable[[object], bytes]
+
+# Headers of a response, as accepted by flask.Response
+Headers = Union[Dict[str, str], Iterable[Tuple[str, str]]]
+
+JSON_MIMETYPE = "application/json"
+
+# Field ending a streamed response whose items could not all be obtained
+STREAMED_ERROR_FIELD_NAME = "error"
+
+# Compression levels of responses, and of static content whose compression is cached
+GZIP_COMPRESSLEVEL = 6
+GZIP_COMPRESSLEVEL_STATIC = 9
+BROTLI_QUALITY = 5
+BROTLI_QUALITY_STATIC = 11
+
+# Number of compressed variants of static content retained
+COMPRESSED_STATIC_CACHE_SIZE = 32
+
+
+def _json_serializer(*, app: flask.Flask) -> Serializer:
+    # Equivalent to flask.jsonify, using the encoder installed by flask_json
+    encoder_class = app.json_encoder
+    sort_keys = app.config.get("JSON_SORT_KEYS", True)
+
+    def serialize(data: object) -> bytes:
+        return json.dumps(
+            data,
+            cls=encoder_class,
+            separators=(",", ":"),
+            sort_keys=sort_keys,
+        ).encode("utf-8")
+
+    return serialize
+
+
+def _orjson_serializer(*, app: flask.Flask) -> Serializer:
+    # Types orjson does not natively serialize fall back to the flask_json encoder.
+    # Datetimes and dataclasses are passed through to that encoder,
+    # which formats them differently than orjson would.
+    encoder = app.json_encoder()
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    if app.config.get("JSON_SORT_KEYS", True):
+        option |= orjson.OPT_SORT_KEYS
+
+    def serialize(data: object) -> bytes:
+        return orjson.dumps(data, default=encoder.default, option=option)
+
+    return serialize
+
+
+def _serialize(data: object) -> bytes:
+    """
+    Serialize data with the serializer of the current app, timing the serialization.
+    """
+
+    serializer: Serializer = flask.current_app.extensions["json_serializer"]
+
+    time_start = time.perf_counter()
+    encoded = serializer(data)
+    time_elapsed = time.perf_counter() - time_start
+
+    flask.g.serialization_seconds = (
+        flask.g.get("serialization_seconds", 0.0) + time_elapsed
+    )
+
+    return encoded
+
+
+def encode_json(
+    *,
+    data: object,
+    status: int = http.HTTPStatus.OK,
+) -> bytes:
+    """
+    Encode the body of a JSON response, using the serializer of the current app.
+
+    Like flask_json, a dict includes its status if JSON_ADD_STATUS is configured.
+    """
+
+    if isinstance(data, dict) and flask.current_app.config.get(
+        "JSON_ADD_STATUS", False
+    ):
+        data = dict(data)
+        data.setdefault(flask.current_app.config["JSON_STATUS_FIELD_NAME"], status)
+
+    return _serialize(data)
+
+
+def json_response(
+    *,
+    data: object,
+    status: int = http.HTTPStatus.OK,
+    headers: Optional[Headers] = None,
+) -> flask.Response:
+    """
+    Create a JSON response, serializing data with the serializer of the current app.
+    """
+
+    return encoded_json_response(
+        encoded=encode_json(data=data, status=status),
+        status=status,
+        headers=headers,
+    )
+
+
+def encoded_json_response(
+    *,
+    encoded: bytes,
+    status: int = http.HTTPStatus.OK,
+    headers: Optional[Headers] = None,
+) -> flask.Response:
+    """
+    Create a JSON response from already encoded JSON, which is not serialized again.
+    """
+
+    return flask.current_app.response_class(
+        encoded,
+        status=status,
+        headers=headers,
+        mimetype=JSON_MIMETYPE,
+    )
+
+
+def _iter_json_array_object(
+    *,
+    key: str,
+    items: Iterable[object],
+    status: int,
+) -> Iterator[bytes]:
+    yield b"{" + _serialize(key) + b":["
+
+    try:
+        for index_current, item_current in enumerate(items):
+            # Serialized before anything is sent, so a failure never leaves a dangling separator
+            encoded = _serialize(item_current)
+            yield encoded if index_current == 0 else b"," + encoded
+    except Exception:
+        # Headers were already sent, so the error is instead reported in the body
+        flask.current_app.logger.exception("Error while streaming a JSON array")
+
+        status = http.HTTPStatus.INTERNAL_SERVER_ERROR
+        yield b"]," + _serialize(STREAMED_ERROR_FIELD_NAME) + b":" + _serialize(
+            {"message": "Response incomplete."}
+        )
+    else:
+        yield b"]"
+
+    # Like flask_json, include the status if JSON_ADD_STATUS is configured
+    if flask.current_app.config.get("JSON_ADD_STATUS", False):
+        status_field = flask.current_app.config["JSON_STATUS_FIELD_NAME"]
+        yield b"," + _serialize(status_field) + b":" + _serialize(int(status))
+
+    yield b"}"
+
+
+def streamed_json_array_response(
+    *,
+    key: str,
+    items: Iterable[object],
+    status: int = http.HTTPStatus.OK,
+) -> flask.Response:
+    """
+    Create a JSON response of an object with a single array, streamed with chunked transfer.
+
+    Each item is serialized and sent as it is obtained from items,
+    so the complete array is never held in memory.
+
+    An error while obtaining items cannot change the status, which was already sent.
+    The array instead ends with the items sent so far, followed by an "error" field,
+    and any status field included by JSON_ADD_STATUS is 500.
+    The response is always complete JSON, but a client must check for "error"
+    before treating the array as complete.
+    """
+
+    return flask.current_app.response_class(
+        flask.stream_with_context(
+            _iter_json_array_object(key=key, items=items, status=status)
+        ),
+        status=status,
+        mimetype=JSON_MIMETYPE,
+        headers={
+            # Ingress must not buffer the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _normalize_view_tuple(result: tuple) -> Tuple[object, int, Optional[Headers]]:
+    """
+    Obtain the data, status, and headers of a tuple returned by a view.
+
+    Like flask_json, accepts (data, status), (data, headers),
+    (data, status, headers), and (data, headers, status).
+    """
+
+    if len(result) not in [2, 3]:
+        raise ValueError(
+            "View must return a tuple of data followed by a status, headers, or both."
+        )
+
+    status = None
+    headers = None
+    for value_current in result[1:]:
+        if isinstance(value_current, int) and status is None:
+            status = value_current
+        elif not isinstance(value_current, int) and headers is None:
+            headers = value_current
+        else:
+            raise ValueError(
+                "View must return a tuple with at most one status and one headers."
+            )
+
+    return result[0], status or http.HTTPStatus.OK, headers
+
+
+def as_json(f):
+    """
+    Convert the return value of a view to a JSON response.
+
+    - A dict is serialized with the serializer of the current app.
+      None is serialized as an empty dict.
+    - Bytes are already encoded JSON, which is not serialized again.
+    - A tuple of either, with a status, headers, or both, is returned with those.
+      Tuples are ordered as accepted by flask_json.
+    - A flask.Response is returned as is.
+    """
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        result = f(*args, **kwargs)
+
+        if isinstance(result, flask.Response):
+            return result
+
+        status = http.HTTPStatus.OK
+        headers = None
+        if isinstance(result, tuple):
+            result, status, headers = _normalize_view_tuple(result)
+
+        if result is None:
+            result = {}
+
+        if isinstance(result, bytes):
+            return encoded_json_response(
+                encoded=result,
+                status=status,
+                headers=headers,
+            )
+
+        return json_response(data=result, status=status, headers=headers)
+
+    return wrapper
+
+
+class _CompressedStaticCache:
+    """
+    Compressed variants of static content, keyed by path, encoding, and content digest.
+
+    Keying by digest means a change in content is never served from a stale variant.
+    """
+
+    def __init__(self, *, max_size: int = COMPRESSED_STATIC_CACHE_SIZE):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+
+    def get_or_compress(
+        self,
+        *,
+        path: str,
+        encoding: str,
+        data: bytes,
+    ) -> bytes:
+        key = (path, encoding, hashlib.sha256(data).digest())
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        compressed = _compress(data=data, encoding=encoding, static=True)
+
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return compressed
+
+
+_compressed_static_cache = _CompressedStaticCache()
+
+
+def _compress(*, data: bytes, encoding: str, static: bool) -> bytes:
+    if encoding == "br":
+        return brotli.compress(
+            data,
+            quality=BROTLI_QUALITY_STATIC if static else BROTLI_QUALITY,
+        )
+
+    return gzip.compress(
+        data,
+        compresslevel=GZIP_COMPRESSLEVEL_STATIC if static else GZIP_COMPRESSLEVEL,
+    )
+
+
+def _negotiate_encoding() -> Optional[str]:
+    """
+    Choose a content encoding from "Accept-Encoding", preferring brotli.
+    """
+
+    accept_encodings = flask.request.accept_encodings
+
+    encodings = ["gzip"]
+    if brotli is not None:
+        encodings.insert(0, "br")
+
+    encoding_best: Tuple[float, Optional[str]] = (0, None)
+    for encoding_current in encodings:
+        quality = accept_encodings.quality(encoding_current)
+        if quality > encoding_best[0]:
+            encoding_best = (quality, encoding_current)
+
+    return encoding_best[1]
+
+
+def static_content(f):
+    """
+    Mark a view as obtaining static content, so its compressed variants are cached.
+    """
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        flask.g.static_content = True
+
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def _compress_response(
+    *,
+    response: flask.Response,
+    min_size: int,
+) -> flask.Response:
+    """
+    Compress a response, if the client accepts it and compression is worthwhile.
+    """
+
+    if (
+        response.status_code != http.HTTPStatus.OK
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in [JSON_MIMETYPE, "text/plain", "text/html"]
+    ):
+        return response
+
+    # Any response that could be compressed varies by the encoding a client accepts
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    encoding = _negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if flask.g.get("static_content", False):
+        compressed = _compressed_static_cache.get_or_compress(
+            path=flask.request.path,
+            encoding=encoding,
+            data=data,
+        )
+    else:
+        compressed = _compress(data=data, encoding=encoding, static=False)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+
+    # A strong ETag identifies exact bytes, so a compressed variant has a weak ETag
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def init_app(*, app: flask.Flask) -> None:
+    """
+    Configure the serializer of JSON responses, and any compression of responses.
+
+    Requires flask_json was already applied, as its encoder is used for any type
+    the serializer does not natively support.
+    """
+
+    serializer_name = app.config.get("JSON_SERIALIZER", "auto")
+    if serializer_name == "auto":
+        serializer_name = "orjson" if orjson is not None else "json"
+
+    if serializer_name == "orjson":
+        if orjson is None:
+            raise ValueError('JSON_SERIALIZER "orjson" is not installed')
+        app.extensions["json_serializer"] = _orjson_serializer(app=app)
+    elif serializer_name == "json":
+        app.extensions["json_serializer"] = _json_serializer(app=app)
+    else:
+        raise ValueError('Unknown JSON_SERIALIZER "{}"'.format(serializer_name))
+
+    if app.config.get("RESPONSE_COMPRESSION", False):
+        min_size = app.config.get("RESPONSE_COMPRESSION_MIN_SIZE", 0)
+
+        @app.after_request
+        def compress_response(response: flask.Response) -> flask.Response:
+            return _compress_response(response=response, min_size=min_size)
+
+    @app.after_request
+    def log_serialization(response: flask.Response) -> flask.Response:
+        serialization_seconds = flask.g.get("serialization_seconds", None)
+        if serialization_seconds is not None:
+            app.logger.debug(
+                "JSON serialization: {:.1f} ms.".format(serialization_seconds * 1000)
+            )
+
+        return response
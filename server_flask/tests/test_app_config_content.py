@@ -0,0 +1,155 @@
+import flask
+import flask_json
+import json
+import os
+from pathlib import Path
+import pytest
+import signal
+
+import blueprints.app.config
+import response_utils
+
+
+@pytest.fixture(name="app")
+def fixture_app():
+    """
+    Provide an app context, in which content is encoded.
+    """
+
+    app = flask.Flask(__name__)
+    flask_json.FlaskJSON().init_app(app=app)
+    response_utils.init_app(app=app)
+    with app.app_context():
+        yield app
+
+
+def _write(*, path: Path, content: dict) -> None:
+    # Advance the mtime explicitly, as filesystem mtime resolution may be coarse
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(content))
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def test_file_backed_content_mtime_reload(app: flask.Flask, tmp_path: Path):
+    """
+    Test content is reloaded when its file is modified, checked at most every APP_CONFIG_CHECK_SECONDS.
+    """
+
+    path = tmp_path / "content.json"
+    _write(path=path, content={"value": 1})
+
+    now = [0.0]
+    loads = []
+
+    def _load():
+        loads.append(path)
+        return [json.loads(path.read_text())]
+
+    content = blueprints.app.config.FileBackedContent(
+        paths=[str(path)],
+        load=_load,
+        clock=lambda: now[0],
+    )
+
+    assert json.loads(content.current().encoded[0])["value"] == 1
+    assert len(loads) == 1
+
+    # Within the check interval, a modification is not yet observed
+    _write(path=path, content={"value": 2})
+    now[0] += blueprints.app.config.APP_CONFIG_CHECK_SECONDS / 2
+    assert json.loads(content.current().encoded[0])["value"] == 1
+    assert len(loads) == 1
+
+    # After the check interval, the modification is loaded
+    now[0] += blueprints.app.config.APP_CONFIG_CHECK_SECONDS
+    loaded = content.current()
+    assert json.loads(loaded.encoded[0])["value"] == 2
+    assert len(loads) == 2
+
+    # Checking an unmodified file does not reload it
+    now[0] += blueprints.app.config.APP_CONFIG_CHECK_SECONDS
+    assert content.current() is loaded
+    assert len(loads) == 2
+
+
+def test_file_backed_content_reload(app: flask.Flask, tmp_path: Path):
+    """
+    Test an explicit reload applies at the next use, even within the check interval.
+    """
+
+    path = tmp_path / "content.json"
+    _write(path=path, content={"value": 1})
+
+    now = [0.0]
+    loads = []
+    reload_during_load = []
+
+    def _load():
+        loads.append(path)
+        if reload_during_load:
+            reload_during_load.pop()()
+        return [json.loads(path.read_text())]
+
+    content = app.extensions.setdefault(
+        "app_quotes_content",
+        blueprints.app.config.FileBackedContent(
+            paths=[str(path)],
+            load=_load,
+            clock=lambda: now[0],
+        ),
+    )
+
+    content.current()
+    blueprints.app.config.reload(app=app)
+    content.current()
+    assert len(loads) == 2
+
+    # A reload during a load is not lost
+    reload_during_load.append(lambda: blueprints.app.config.reload(app=app))
+    blueprints.app.config.reload(app=app)
+    content.current()
+    assert len(loads) == 3
+    content.current()
+    assert len(loads) == 4
+    content.current()
+    assert len(loads) == 4
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="Requires SIGHUP")
+def test_file_backed_content_reload_signal(app: flask.Flask, tmp_path: Path):
+    """
+    Test a signal handler that reloads during a load neither blocks nor is lost.
+    """
+
+    path = tmp_path / "content.json"
+    _write(path=path, content={"value": 1})
+
+    loads = []
+
+    def _load():
+        loads.append(path)
+        if len(loads) == 1:
+            # The handler runs on this thread, while the load holds the lock
+            os.kill(os.getpid(), signal.SIGHUP)
+        return [json.loads(path.read_text())]
+
+    content = app.extensions.setdefault(
+        "app_config_content",
+        blueprints.app.config.FileBackedContent(
+            paths=[str(path)],
+            load=_load,
+            clock=lambda: 0.0,
+        ),
+    )
+
+    handler_previous = signal.signal(
+        signal.SIGHUP,
+        lambda signum, frame: blueprints.app.config.reload(app=app),
+    )
+    try:
+        content.current()
+    finally:
+        signal.signal(signal.SIGHUP, handler_previous)
+
+    content.current()
+    assert len(loads) == 2
@@ -0,0 +1,190 @@
+from cryptography.hazmat.primitives.asymmetric import rsa
+import json
+import jwt
+import jwt.algorithms
+import pytest
+import time
+from typing import List
+
+import authorization_utils
+
+TEST_ISSUER = "https://issuer.example.com/pool"
+TEST_AUDIENCE = "audience"
+
+
+class _StubJWKS:
+    """
+    Stub of a JWKS endpoint, counting each fetch.
+    """
+
+    def __init__(self):
+        self.keys: List[dict] = []
+        self.fetch_count = 0
+
+    def add_key(self, *, kid: str) -> rsa.RSAPrivateKey:
+        private_key = rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=2048,
+        )
+
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update(
+            {
+                "kid": kid,
+                "alg": "RS256",
+                "use": "sig",
+            }
+        )
+        self.keys.append(jwk)
+
+        return private_key
+
+    def fetch(self, jwks_url: str) -> dict:
+        self.fetch_count += 1
+
+        return {"keys": list(self.keys)}
+
+
+class _StubClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _token(*, private_key, kid: str, exp_seconds: float = 3600) -> str:
+    return jwt.encode(
+        payload={
+            "sub": "subject",
+            "iss": TEST_ISSUER,
+            "aud": TEST_AUDIENCE,
+            "token_use": "id",
+            "exp": int(time.time() + exp_seconds),
+        },
+        key=private_key,
+        algorithm="RS256",
+        headers={"kid": kid},
+    )
+
+
+def test_jwks_cache_ttl():
+    """
+    Test signing keys are fetched once, then again only after the TTL.
+    """
+
+    stub_jwks = _StubJWKS()
+    stub_jwks.add_key(kid="key1")
+    clock = _StubClock()
+
+    jwks_cache = authorization_utils.JWKSCache(
+        jwks_url="https://issuer.example.com/jwks.json",
+        ttl_seconds=100,
+        fetch_jwks=stub_jwks.fetch,
+        clock=clock,
+    )
+
+    jwks_cache.signing_key(kid="key1")
+    jwks_cache.signing_key(kid="key1")
+    assert stub_jwks.fetch_count == 1
+
+    clock.now = 100
+    jwks_cache.signing_key(kid="key1")
+    assert stub_jwks.fetch_count == 2
+
+
+def test_jwks_cache_unknown_kid():
+    """
+    Test an unknown kid refreshes signing keys, but not more than the minimum interval.
+    """
+
+    stub_jwks = _StubJWKS()
+    stub_jwks.add_key(kid="key1")
+    clock = _StubClock()
+
+    jwks_cache = authorization_utils.JWKSCache(
+        jwks_url="https://issuer.example.com/jwks.json",
+        ttl_seconds=1000,
+        min_refresh_seconds=10,
+        fetch_jwks=stub_jwks.fetch,
+        clock=clock,
+    )
+
+    jwks_cache.signing_key(kid="key1")
+    assert stub_jwks.fetch_count == 1
+
+    # A rotated key is obtained by refresh
+    stub_jwks.add_key(kid="key2")
+    clock.now = 10
+    jwks_cache.signing_key(kid="key2")
+    assert stub_jwks.fetch_count == 2
+
+    # A key that does not exist does not refresh again within the minimum interval
+    with pytest.raises(jwt.exceptions.InvalidTokenError):
+        jwks_cache.signing_key(kid="key3")
+    assert stub_jwks.fetch_count == 2
+
+
+def test_verified_token_cache():
+    """
+    Test verified tokens are retained until their exp, within a bounded size.
+    """
+
+    clock = _StubClock()
+    verified_token_cache = authorization_utils.VerifiedTokenCache(
+        max_size=2,
+        clock=clock,
+    )
+
+    verified_token_cache.put(token="token1", claims={"exp": 100})
+    verified_token_cache.put(token="token2", claims={"exp": 200})
+    assert verified_token_cache.get(token="token1") == {"exp": 100}
+
+    # Least recently used is evicted
+    verified_token_cache.put(token="token3", claims={"exp": 300})
+    assert verified_token_cache.get(token="token2") is None
+    assert verified_token_cache.get(token="token1") == {"exp": 100}
+
+    # Expired tokens are not obtained
+    clock.now = 100
+    assert verified_token_cache.get(token="token1") is None
+    assert verified_token_cache.get(token="token3") == {"exp": 300}
+
+
+def test_token_verifier():
+    """
+    Test a token is verified once, then obtained from the cache.
+    """
+
+    stub_jwks = _StubJWKS()
+    private_key = stub_jwks.add_key(kid="key1")
+
+    token_verifier = authorization_utils.TokenVerifier(
+        issuer=TEST_ISSUER,
+        audience=TEST_AUDIENCE,
+        jwks_cache=authorization_utils.JWKSCache(
+            jwks_url="https://issuer.example.com/jwks.json",
+            fetch_jwks=stub_jwks.fetch,
+        ),
+        verified_token_cache=authorization_utils.VerifiedTokenCache(),
+    )
+
+    token = _token(private_key=private_key, kid="key1")
+    claims = token_verifier.verify(token=token)
+    assert claims["sub"] == "subject"
+    assert token_verifier.verify(token=token) == claims
+    assert stub_jwks.fetch_count == 1
+
+    # A token signed by an unknown key is not verified
+    other_private_key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048,
+    )
+    with pytest.raises(jwt.exceptions.InvalidTokenError):
+        token_verifier.verify(token=_token(private_key=other_private_key, kid="key1"))
+
+    # An expired token is not verified
+    with pytest.raises(jwt.exceptions.InvalidTokenError):
+        token_verifier.verify(
+            token=_token(private_key=private_key, kid="key1", exp_seconds=-10)
+        )
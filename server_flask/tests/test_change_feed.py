@@ -0,0 +1,135 @@
+import flask
+import gc
+import pymongo
+import threading
+import weakref
+
+import change_feed
+import scope.database.collection_utils
+
+
+def test_change_feed_publish():
+    """
+    Test events are published to matching subscriptions, and streamed as events.
+    """
+
+    feed = change_feed.ChangeFeed(database=None, poll_seconds=None)
+
+    subscription_all = feed.subscribe(patient_ids=None)
+    subscription_other = feed.subscribe(patient_ids={"other"})
+
+    feed.publish(
+        event=change_feed.ChangeEvent(
+            patient_id="patient",
+            document_types=["moodLog"],
+        )
+    )
+    assert subscription_all.events.qsize() == 1
+    assert subscription_other.events.qsize() == 0
+
+    stream = feed.stream(subscription=subscription_all)
+    assert next(stream).startswith("retry: ")
+    assert next(stream) == (
+        'event: change\ndata: {"patientId": "patient", "types": ["moodLog"]}\n\n'
+    )
+
+    # Closing the stream unsubscribes
+    stream.close()
+    feed.publish(
+        event=change_feed.ChangeEvent(
+            patient_id="patient",
+            document_types=[],
+        )
+    )
+    assert subscription_all.events.qsize() == 0
+
+
+def test_change_feed_overflow():
+    """
+    Test a subscription that does not consume events is asked to resynchronize.
+    """
+
+    feed = change_feed.ChangeFeed(database=None, poll_seconds=None)
+    subscription = feed.subscribe(patient_ids=None)
+
+    for _ in range(change_feed.CHANGE_FEED_QUEUE_SIZE + 1):
+        feed.publish(
+            event=change_feed.ChangeEvent(
+                patient_id="patient",
+                document_types=[],
+            )
+        )
+    assert subscription.overflowed
+
+    stream = feed.stream(subscription=subscription)
+    next(stream)
+    assert next(stream) == "event: resync\ndata: {}\n\n"
+    assert not subscription.overflowed
+
+
+def test_change_feed_init_app():
+    """
+    Test apps share a single write listener, which does not retain a discarded app.
+    """
+
+    database = pymongo.MongoClient("mongodb://localhost", connect=False).get_database(
+        "test"
+    )
+
+    def _create_app() -> flask.Flask:
+        app = flask.Flask(__name__)
+        app.database_must_not_be_directly_accessed = database
+        change_feed.init_app(app=app)
+        return app
+
+    app = _create_app()
+    app_discarded = _create_app()
+
+    assert (
+        scope.database.collection_utils._write_listeners.count(
+            change_feed._write_listener
+        )
+        == 1
+    )
+
+    # A write is published to the feed of each app
+    subscription = app.extensions["change_feed"].subscribe(patient_ids=None)
+    subscription_discarded = app_discarded.extensions["change_feed"].subscribe(
+        patient_ids=None
+    )
+    change_feed._write_listener(
+        database.get_collection("patient_1234"),
+        [{"_id": "1", "_type": "moodLog"}],
+    )
+    assert subscription.events.qsize() == 1
+    assert subscription_discarded.events.qsize() == 1
+
+    # A discarded app is no longer notified
+    feed_discarded = weakref.ref(app_discarded.extensions["change_feed"])
+    del app_discarded, subscription_discarded
+    gc.collect()
+    assert feed_discarded() is None
+
+
+def test_change_feed_poll_error():
+    """
+    Test polling continues after a poll fails.
+    """
+
+    class FailingChangeFeed(change_feed.ChangeFeed):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.polls = 0
+            self.polled = threading.Event()
+
+        def _poll(self) -> None:
+            self.polls += 1
+            if self.polls == 1:
+                raise RuntimeError("poll failed")
+            self.polled.set()
+
+    feed = FailingChangeFeed(database=None, poll_seconds=0.01)
+    feed.subscribe(patient_ids=None)
+
+    assert feed.polled.wait(timeout=5)
+    assert feed.polls >= 2
@@ -0,0 +1,84 @@
+import flask
+import pytest
+import threading
+import time
+
+import executors
+
+
+def test_executor_map():
+    """
+    Test results are in order of items, and tasks are recorded in metrics.
+    """
+
+    executor = executors.InstrumentedExecutor(name="test", max_workers=2)
+
+    assert executor.map(lambda item: item * 2, range(5), deadline=None) == [
+        0,
+        2,
+        4,
+        6,
+        8,
+    ]
+    assert list(
+        executor.imap_bounded(lambda item: item * 2, range(5), window=2, deadline=None)
+    ) == [0, 2, 4, 6, 8]
+
+    metrics = executor.metrics()
+    assert metrics.submitted == 10
+    assert metrics.completed == 10
+    assert metrics.queue_depth == 0
+    assert metrics.active == 0
+
+    executor.shutdown()
+
+
+def test_executor_deadline():
+    """
+    Test a deadline abandons waiting and cancels tasks not yet started.
+    """
+
+    executor = executors.InstrumentedExecutor(name="test", max_workers=1)
+    release = threading.Event()
+
+    with pytest.raises(executors.DeadlineExceeded):
+        executor.map(
+            lambda item: release.wait(),
+            range(3),
+            deadline=time.monotonic() + 0.1,
+        )
+    release.set()
+
+    executor.shutdown()
+
+    metrics = executor.metrics()
+    assert metrics.queue_depth == 0
+
+
+def test_request_deadline(monkeypatch):
+    """
+    Test the deadline of a request is measured from the start of the request.
+    """
+
+    now = [100.0]
+    monkeypatch.setattr(executors.time, "monotonic", lambda: now[0])
+
+    app = flask.Flask(__name__)
+    app.config["EXECUTOR_DEADLINE_SECONDS"] = 10
+    executors.init_app(app=app)
+
+    @app.route("/deadline")
+    def deadline():
+        # Time spent before the deadline is first obtained counts against it
+        now[0] += 4
+        deadline_first = executors.request_deadline()
+        now[0] += 1
+        assert executors.request_deadline() == deadline_first
+
+        return {"deadline": deadline_first}
+
+    response = app.test_client().get("/deadline")
+    assert response.get_json() == {"deadline": 110.0}
+
+    for executor_current in app.extensions["executors"].values():
+        executor_current.shutdown()
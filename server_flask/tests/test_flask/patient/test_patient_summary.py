@@ -1,7 +1,10 @@
 import copy
 import datetime
+import flask
+import gc
 import operator
 import pprint
+import pymongo
 
 import pytz
 import requests
@@ -19,6 +22,8 @@ import scope.testing.fixtures_database_temp_patient
 import scope.utils.compute_patient_summary
 
 
+import blueprints.patient.summary
+import scope.database.collection_utils
 import tests.testing_config
 
 TESTING_CONFIGS = tests.testing_config.ALL_CONFIGS
@@ -45,6 +50,50 @@ def _patient_summary_assertions(summary: dict) -> None:
         )
 
 
+def test_patient_summary_cache_init_app():
+    """
+    Test apps share a single write listener, which invalidates the cache of each app.
+    """
+
+    database = pymongo.MongoClient("mongodb://localhost", connect=False).get_database(
+        "test"
+    )
+    collection = database.get_collection("patient_1234")
+
+    apps = []
+    for _ in range(2):
+        app = flask.Flask(__name__)
+        app.config["PATIENT_SUMMARY_CACHE"] = True
+        blueprints.patient.summary.init_app(app=app)
+        apps.append(app)
+
+    assert (
+        scope.database.collection_utils._write_listeners.count(
+            blueprints.patient.summary._write_listener
+        )
+        == 1
+    )
+
+    summary_caches = [
+        app_current.extensions["patient_summary_cache"] for app_current in apps
+    ]
+    for summary_cache_current in summary_caches:
+        summary_cache_current._entries[(database.name, collection.name)] = None
+
+    # A write of a summary type invalidates the cache of each app
+    blueprints.patient.summary._write_listener(
+        collection,
+        [{"_type": scope.database.patient.safety_plan.DOCUMENT_TYPE}],
+    )
+    for summary_cache_current in summary_caches:
+        assert (database.name, collection.name) not in summary_cache_current._entries
+
+    # A discarded app is no longer notified
+    del apps, app, summary_caches, summary_cache_current
+    gc.collect()
+    assert len(blueprints.patient.summary._summary_caches) == 0
+
+
 def test_patient_summary_get(
     database_temp_patient_factory: Callable[
         [],
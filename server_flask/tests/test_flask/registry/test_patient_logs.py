@@ -0,0 +1,233 @@
+import http
+import requests
+from typing import Callable
+from urllib.parse import urljoin
+
+import scope.config
+import scope.database.patient.activity_logs
+import scope.database.patient.mood_logs
+import scope.database.patient.scheduled_activities
+import scope.database.patient.scheduled_assessments
+import scope.testing.fixtures_database_temp_patient
+
+QUERY_ACTIVITY_LOGS = "patient/{patient_id}/activitylogs"
+QUERY_LOGS = "patient/{patient_id}/logs"
+QUERY_MOOD_LOGS = "patient/{patient_id}/moodlogs"
+
+
+def test_patient_logs_post(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_mood_log_factory: Callable[[], dict],
+    flask_client_config: scope.config.FlaskClientConfig,
+    flask_session_unauthenticated_factory: Callable[[], requests.Session],
+):
+    """
+    Test posting a batch of logs, with a result for each.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    session = flask_session_unauthenticated_factory()
+
+    mood_log_valid = data_fake_mood_log_factory()
+    mood_log_with_id = data_fake_mood_log_factory()
+    mood_log_with_id["_id"] = "invalid"
+
+    response = session.post(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+        json={
+            "logs": [
+                mood_log_valid,
+                mood_log_with_id,
+                {"_type": "invalid"},
+            ],
+        },
+    )
+    assert response.ok
+    results = response.json()["results"]
+    assert len(results) == 3
+
+    # Only the valid log is stored
+    assert results[0]["status"] == http.HTTPStatus.OK
+    assert results[1]["status"] == http.HTTPStatus.BAD_REQUEST
+    assert results[2]["status"] == http.HTTPStatus.BAD_REQUEST
+
+    document_stored = results[0]["moodlog"]
+    assert scope.database.patient.mood_logs.SEMANTIC_SET_ID in document_stored
+
+    response = session.get(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_MOOD_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+    )
+    assert response.ok
+    assert response.json()["moodlogs"] == [document_stored]
+
+
+def test_patient_logs_post_invalid(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    flask_client_config: scope.config.FlaskClientConfig,
+    flask_session_unauthenticated_factory: Callable[[], requests.Session],
+):
+    """
+    Test a batch that is not a list of logs is rejected.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    session = flask_session_unauthenticated_factory()
+
+    response = session.post(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+        json={
+            "logs": {},
+        },
+    )
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    # A body that is not an object is also rejected
+    response = session.post(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+        json=[],
+    )
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+def test_patient_logs_post_scheduled_items(
+    database_temp_patient_factory: Callable[
+        [],
+        scope.testing.fixtures_database_temp_patient.DatabaseTempPatient,
+    ],
+    data_fake_activity_log_factory: Callable[[], dict],
+    data_fake_assessment_log_factory: Callable[[], dict],
+    data_fake_scheduled_activity_factory: Callable[[], dict],
+    data_fake_scheduled_assessment_factory: Callable[[], dict],
+    flask_client_config: scope.config.FlaskClientConfig,
+    flask_session_unauthenticated_factory: Callable[[], requests.Session],
+):
+    """
+    Test posting a batch of logs completes their scheduled items, as does posting each log.
+    """
+
+    temp_patient = database_temp_patient_factory()
+    session = flask_session_unauthenticated_factory()
+
+    # Scheduled items that are not yet completed
+    scheduled_activity_ids = []
+    for _ in range(2):
+        fake_scheduled_activity = data_fake_scheduled_activity_factory()
+        fake_scheduled_activity.update({"completed": False})
+        scheduled_activity_ids.append(
+            scope.database.patient.scheduled_activities.post_scheduled_activity(
+                collection=temp_patient.collection,
+                scheduled_activity=fake_scheduled_activity,
+            ).inserted_set_id
+        )
+
+    fake_scheduled_assessment = data_fake_scheduled_assessment_factory()
+    fake_scheduled_assessment.update({"completed": False})
+    scheduled_assessment_id = (
+        scope.database.patient.scheduled_assessments.post_scheduled_assessment(
+            collection=temp_patient.collection,
+            scheduled_assessment=fake_scheduled_assessment,
+        ).inserted_set_id
+    )
+
+    def _fake_activity_log(scheduled_activity_id: str) -> dict:
+        fake_activity_log = data_fake_activity_log_factory()
+        fake_activity_log.update(
+            {
+                scope.database.patient.scheduled_activities.SEMANTIC_SET_ID: scheduled_activity_id,
+            }
+        )
+        return fake_activity_log
+
+    fake_assessment_log = data_fake_assessment_log_factory()
+    fake_assessment_log.update(
+        {
+            scope.database.patient.scheduled_assessments.SEMANTIC_SET_ID: scheduled_assessment_id,
+        }
+    )
+
+    # Post a single activity log, for comparison
+    response = session.post(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_ACTIVITY_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+        json={
+            "activitylog": _fake_activity_log(scheduled_activity_ids[0]),
+        },
+    )
+    assert response.ok
+    activity_log_single = response.json()["activitylog"]
+
+    # Post a batch of an activity log and an assessment log
+    response = session.post(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_LOGS.format(patient_id=temp_patient.patient_id),
+        ),
+        json={
+            "logs": [
+                _fake_activity_log(scheduled_activity_ids[1]),
+                fake_assessment_log,
+            ],
+        },
+    )
+    assert response.ok
+    results = response.json()["results"]
+    assert [result_current["status"] for result_current in results] == [
+        http.HTTPStatus.OK,
+        http.HTTPStatus.OK,
+    ]
+    activity_log_batch = results[0]["activitylog"]
+
+    # Each scheduled activity is completed, and is the snapshot of its log
+    for activity_log_current, scheduled_activity_id_current in [
+        (activity_log_single, scheduled_activity_ids[0]),
+        (activity_log_batch, scheduled_activity_ids[1]),
+    ]:
+        scheduled_activity = (
+            scope.database.patient.scheduled_activities.get_scheduled_activity(
+                collection=temp_patient.collection,
+                set_id=scheduled_activity_id_current,
+            )
+        )
+        assert scheduled_activity["completed"]
+        assert (
+            activity_log_current[
+                scope.database.patient.activity_logs.DATA_SNAPSHOT_PROPERTY
+            ][scope.database.patient.scheduled_activities.DOCUMENT_TYPE]
+            == scheduled_activity
+        )
+
+    # A batch log has the same snapshot as a single log
+    assert (
+        activity_log_batch[
+            scope.database.patient.activity_logs.DATA_SNAPSHOT_PROPERTY
+        ].keys()
+        == activity_log_single[
+            scope.database.patient.activity_logs.DATA_SNAPSHOT_PROPERTY
+        ].keys()
+    )
+
+    # The scheduled assessment is completed
+    assert scope.database.patient.scheduled_assessments.get_scheduled_assessment(
+        collection=temp_patient.collection,
+        set_id=scheduled_assessment_id,
+    )["completed"]
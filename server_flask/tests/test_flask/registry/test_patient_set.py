@@ -1467,6 +1467,34 @@ def test_patient_set_element_delete(
     )
     assert response.status_code == http.HTTPStatus.BAD_REQUEST
 
+    # With "If-Match" header of a document that does not exist
+    response = session.delete(
+        url=urljoin(
+            flask_client_config.baseurl,
+            QUERY_SET_ELEMENT.format(
+                patient_id=temp_patient.patient_id,
+                query_type=config.flask_query_set_element_type,
+                set_id="invalid",
+            ),
+        ),
+        headers={
+            "If-Match": "1",
+        },
+    )
+    assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    # With "If-Match" header of a "_rev" that does not yet exist
+    response = session.delete(
+        url=urljoin(
+            flask_client_config.baseurl,
+            query,
+        ),
+        headers={
+            "If-Match": str(document_stored["_rev"] + 1),
+        },
+    )
+    assert response.status_code == http.HTTPStatus.CONFLICT
+
     # With "If-Match" header
     response = session.delete(
         url=urljoin(
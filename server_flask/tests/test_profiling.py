@@ -0,0 +1,61 @@
+import flask
+import flask_json
+import pytest
+
+import executors
+import profiling
+import response_utils
+
+
+@pytest.fixture(name="profiling_app")
+def fixture_profiling_app() -> flask.Flask:
+    app = flask.Flask(__name__)
+    app.config["JSON_SERIALIZER"] = "json"
+    app.config["REQUEST_PROFILING"] = True
+    flask_json.FlaskJSON().init_app(app=app)
+    response_utils.init_app(app=app)
+    profiling.init_app(app=app)
+
+    @app.route("/phases")
+    @response_utils.as_json
+    def phases():
+        with profiling.phase("validate"):
+            pass
+
+        # Tasks of an executor record phases in the profile of the request
+        executor = executors.InstrumentedExecutor(name="test", max_workers=1)
+        executor.submit(_executor_phase).result()
+        executor.shutdown()
+
+        return {"phases": True}
+
+    return app
+
+
+def _executor_phase() -> None:
+    with profiling.phase("executor"):
+        pass
+
+
+def test_profiling_server_timing(profiling_app: flask.Flask):
+    """
+    Test phases of a request are reported in a Server-Timing header.
+    """
+
+    response = profiling_app.test_client().get("/phases")
+    assert response.status_code == 200
+
+    metrics = [
+        metric_current.strip().split(";")[0]
+        for metric_current in response.headers["Server-Timing"].split(",")
+    ]
+    assert metrics == ["validate", "serialize", "executor", "total"]
+
+
+def test_profiling_phase_without_request():
+    """
+    Test a phase outside a profiled request records nothing and does not fail.
+    """
+
+    with profiling.phase("validate"):
+        pass
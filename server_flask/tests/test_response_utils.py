@@ -0,0 +1,233 @@
+import dataclasses
+import datetime
+import flask
+import flask_json
+import gzip
+import pytest
+import uuid
+
+import response_utils
+
+
+@pytest.fixture(name="response_utils_app")
+def fixture_response_utils_app() -> flask.Flask:
+    app = flask.Flask(__name__)
+    app.config["JSON_SERIALIZER"] = "json"
+    flask_json.FlaskJSON().init_app(app=app)
+    response_utils.init_app(app=app)
+
+    @app.route("/document")
+    @response_utils.as_json
+    def document():
+        return {"document": {"b": 2, "a": 1}}
+
+    @app.route("/encoded")
+    @response_utils.as_json
+    def encoded():
+        return b'{"encoded":true}'
+
+    @app.route("/created")
+    @response_utils.as_json
+    def created():
+        return {"created": True}, 201
+
+    @app.route("/headers")
+    @response_utils.as_json
+    def headers():
+        return {"headers": True}, {"X-Test": "headers"}
+
+    @app.route("/status_headers")
+    @response_utils.as_json
+    def status_headers():
+        return {"status_headers": True}, 202, {"X-Test": "status_headers"}
+
+    @app.route("/headers_status")
+    @response_utils.as_json
+    def headers_status():
+        return b'{"headers_status":true}', [("X-Test", "headers_status")], 202
+
+    @app.route("/invalid")
+    @response_utils.as_json
+    def invalid():
+        return {"invalid": True}, 201, 202
+
+    @app.route("/streamed")
+    @response_utils.as_json
+    def streamed():
+        return response_utils.streamed_json_array_response(
+            key="items",
+            items=({"item": index} for index in range(3)),
+        )
+
+    @app.route("/streamed_error")
+    @response_utils.as_json
+    def streamed_error():
+        def _items():
+            yield {"item": 0}
+            yield {"item": 1}
+            raise RuntimeError("Failed to obtain item")
+
+        return response_utils.streamed_json_array_response(
+            key="items",
+            items=_items(),
+        )
+
+    return app
+
+
+def test_as_json(response_utils_app: flask.Flask):
+    """
+    Test views are serialized like flask_json, including the status.
+    """
+
+    client = response_utils_app.test_client()
+
+    response = client.get("/document")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.data == b'{"document":{"a":1,"b":2},"status":200}'
+
+    response = client.get("/created")
+    assert response.status_code == 201
+    assert response.get_json() == {"created": True, "status": 201}
+
+
+def test_as_json_tuples(response_utils_app: flask.Flask):
+    """
+    Test views may return a status, headers, or both, in the orders flask_json accepts.
+    """
+
+    client = response_utils_app.test_client()
+
+    response = client.get("/headers")
+    assert response.status_code == 200
+    assert response.headers["X-Test"] == "headers"
+    assert response.get_json() == {"headers": True, "status": 200}
+
+    response = client.get("/status_headers")
+    assert response.status_code == 202
+    assert response.headers["X-Test"] == "status_headers"
+    assert response.get_json() == {"status_headers": True, "status": 202}
+
+    response = client.get("/headers_status")
+    assert response.status_code == 202
+    assert response.headers["X-Test"] == "headers_status"
+    assert response.data == b'{"headers_status":true}'
+
+    # A tuple that is not understood is an error, not a misinterpreted response
+    response = client.get("/invalid")
+    assert response.status_code == 500
+
+
+def test_as_json_encoded(response_utils_app: flask.Flask):
+    """
+    Test pre-encoded JSON is not serialized again.
+    """
+
+    client = response_utils_app.test_client()
+
+    response = client.get("/encoded")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.data == b'{"encoded":true}'
+
+
+def test_streamed_json_array(response_utils_app: flask.Flask):
+    """
+    Test a streamed array is equivalent to the serialized object.
+    """
+
+    client = response_utils_app.test_client()
+
+    response = client.get("/streamed")
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.get_json() == {
+        "items": [{"item": 0}, {"item": 1}, {"item": 2}],
+        "status": 200,
+    }
+
+    # An error after the status was sent ends the response with an error field
+    response = client.get("/streamed_error")
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "items": [{"item": 0}, {"item": 1}],
+        "error": {"message": "Response incomplete."},
+        "status": 500,
+    }
+
+
+def test_compression():
+    """
+    Test responses are compressed if accepted and above the size threshold.
+    """
+
+    app = flask.Flask(__name__)
+    app.config["JSON_SERIALIZER"] = "json"
+    app.config["RESPONSE_COMPRESSION"] = True
+    app.config["RESPONSE_COMPRESSION_MIN_SIZE"] = 100
+    flask_json.FlaskJSON().init_app(app=app)
+    response_utils.init_app(app=app)
+
+    @app.route("/large")
+    @response_utils.as_json
+    def large():
+        return {"large": "x" * 1000}
+
+    @app.route("/small")
+    @response_utils.as_json
+    def small():
+        return {"small": "x"}
+
+    client = app.test_client()
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert gzip.decompress(response.data) == (
+        b'{"large":"' + b"x" * 1000 + b'","status":200}'
+    )
+
+    response = client.get("/large")
+    assert "Content-Encoding" not in response.headers
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_orjson_serializer():
+    """
+    Test orjson serializes like the flask_json encoder, including datetimes and dataclasses.
+
+    Formats are configured, so datetimes formatted natively by orjson would differ.
+    """
+
+    pytest.importorskip("orjson")
+
+    @dataclasses.dataclass
+    class Item:
+        name: str
+        created: datetime.datetime
+
+    created = datetime.datetime(2022, 3, 4, 5, 6, 7, 890, tzinfo=datetime.timezone.utc)
+    document = {
+        "created": created,
+        "createdNaive": created.replace(tzinfo=None),
+        "date": created.date(),
+        "item": Item(name="item", created=created),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    }
+
+    encoded = {}
+    for serializer_current in ["json", "orjson"]:
+        app = flask.Flask(__name__)
+        app.config["JSON_SERIALIZER"] = serializer_current
+        app.config["JSON_DATETIME_FORMAT"] = "%d/%m/%Y %H:%M:%S"
+        app.config["JSON_DATE_FORMAT"] = "%d/%m/%Y"
+        flask_json.FlaskJSON().init_app(app=app)
+        response_utils.init_app(app=app)
+
+        with app.app_context():
+            encoded[serializer_current] = response_utils.encode_json(data=document)
+
+    assert encoded["orjson"] == encoded["json"]